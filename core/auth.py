@@ -9,16 +9,25 @@ class AuthManager:
         self.platform = platform.upper()
         self.session_store = SessionStore('MAC') # Defaulting to MAC for now
 
-    def load_cookies(self, bot):
-        """Load cookies from database into the bot."""
+    def current_account(self):
+        """Username of the most recently saved session for the platform, or None."""
+        return self.session_store.fetch_username_crawler_session(self.platform)
+
+    def load_cookies(self, bot, account=None):
+        """Load cookies from database into the bot: the account's session if given, else the latest one."""
         print("  Loading cookies from database...")
-        cookie_result = self.session_store.latest_cookies(self.platform)
+        if account:
+            cookies = self.session_store.fetch_crawler_session(account, self.platform)
+            cookie_result = (cookies, account) if cookies else None
+        else:
+            cookie_result = self.session_store.latest_cookies(self.platform)
         
         if cookie_result:
             bot.cookies = cookie_result[0]
             # Set other attributes if available
             if len(cookie_result) > 1 and cookie_result[1]:
                 bot.username = cookie_result[1]
+                bot.session_account = cookie_result[1]
             if len(cookie_result) > 2 and cookie_result[2]:
                 bot.profile_pic = cookie_result[2]
             print(f"  ✓ Cookies loaded (username: {bot.username or 'N/A'})")
@@ -91,6 +100,7 @@ class AuthManager:
                 cookies=cookies,
                 expiry=expiry
             )
+            bot.session_account = username
             print("  ✓ Cookies saved to database.")
         except Exception as e:
             print(f"  ⚠ Failed to save cookies: {e}")
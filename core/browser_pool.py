@@ -0,0 +1,210 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+from newAgent.core.auth import AuthManager
+from newAgent.core.bot import get_bot_class
+
+PROFILE_ROOT = os.path.join(os.path.expanduser('~'), '.monoes', 'profiles')
+
+
+def start_bot(platform, profile_dir=None, headless=False, account=None, on_created=None):
+    """Start a logged-in bot for the platform, using profile_dir as its persistent Chrome profile.
+
+    account picks the saved session to load (default: the latest one). on_created(bot) is called
+    before Chrome starts, so a caller can quit a bot whose startup it wants to cancel.
+    """
+    bot_class, login_url = get_bot_class(platform)
+    bot = bot_class(login_url, 'MAC')
+    if on_created:
+        on_created(bot)
+    bot._has_challenge = lambda: False
+    bot.headless = headless
+    bot.profile_path = profile_dir or ''
+    auth = AuthManager(platform)
+    auth.load_cookies(bot, account)
+    result = bot.web_driver(login_required=False)
+    if not bot.driver:
+        message = result.get('message') if isinstance(result, dict) else result
+        raise RuntimeError(f"{platform} browser did not start: {message}")
+    auth.check_and_save_login(bot)
+    return bot
+
+
+class PooledBot:
+    """A pool-owned bot and its bookkeeping; hand `bot` to the code that runs the action."""
+
+    def __init__(self, key, bot, slot, profile_dir):
+        self.key = key
+        self.bot = bot
+        self.slot = slot
+        self.profile_dir = profile_dir
+        self.uses = 0
+        self.created = time.monotonic()
+        self.heap_baseline = None
+
+
+class BrowserPool:
+    """
+    Keeps up to `size` warm, logged-in bots per (platform, account) for back-to-back actions.
+
+    Each bot gets its own persistent profile directory (Chrome locks a profile to one
+    instance), so a recycled browser comes back logged in. A bot is checked for liveness
+    on lease and on return and is recycled after max_uses leases or once its JS heap has
+    grown by more than max_heap_growth_mb since it was started.
+    """
+
+    def __init__(self, size=1, max_uses=50, max_heap_growth_mb=512, profile_root=PROFILE_ROOT, starter=start_bot):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_heap_growth_mb = max_heap_growth_mb
+        self.profile_root = profile_root
+        self.starter = starter
+        self._idle = {}  # key -> [PooledBot], most recently returned last
+        self._slots = {}  # key -> set of slot numbers in use
+        self._cond = threading.Condition()
+        self._closed = False
+
+    @staticmethod
+    def _key(platform, account=None):
+        return platform.upper(), account or 'default'
+
+    def _profile_dir(self, key, slot):
+        platform, account = key
+        return os.path.join(self.profile_root, f"{platform.lower()}-{account}-{slot}")
+
+    @staticmethod
+    def _alive(pooled):
+        try:
+            return bool(pooled.bot.driver and pooled.bot.driver.current_url is not None)
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def _heap_mb(pooled):
+        try:
+            used = pooled.bot.driver.execute_script(
+                "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : null")
+        except WebDriverException:
+            return None
+        return used / (1024 * 1024) if used else None
+
+    def _worn_out(self, pooled):
+        if pooled.uses >= self.max_uses:
+            return True
+        heap = self._heap_mb(pooled)
+        if heap is None or pooled.heap_baseline is None:
+            return False
+        return heap - pooled.heap_baseline > self.max_heap_growth_mb
+
+    def _discard(self, pooled):
+        try:
+            pooled.bot.quit()
+        finally:
+            with self._cond:
+                self._slots.get(pooled.key, set()).discard(pooled.slot)
+                self._cond.notify_all()
+
+    def _start(self, key, slot, account):
+        profile_dir = self._profile_dir(key, slot)
+        os.makedirs(profile_dir, exist_ok=True)
+        try:
+            bot = self.starter(key[0].lower(), profile_dir, account)
+        except BaseException:
+            with self._cond:
+                self._slots[key].discard(slot)
+                self._cond.notify_all()
+            raise
+        pooled = PooledBot(key, bot, slot, profile_dir)
+        pooled.heap_baseline = self._heap_mb(pooled)
+        return pooled
+
+    def acquire(self, platform, account=None, timeout=None):
+        """Lease a warm bot, starting one if the pool has room; blocks while all are leased."""
+        key = self._key(platform, account)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("browser pool is closed")
+                idle = self._idle.get(key)
+                slots = self._slots.setdefault(key, set())
+                if idle:
+                    pooled = idle.pop()
+                    slot = None
+                elif len(slots) < self.size:
+                    pooled = None
+                    slot = min(set(range(self.size)) - slots)
+                    slots.add(slot)
+                else:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"no {key[0]} browser free within {timeout}s")
+                    self._cond.wait(remaining)
+                    continue
+            if pooled is None:
+                return self._start(key, slot, account)
+            if self._alive(pooled):
+                return pooled
+            # Closed by the user or crashed while idle
+            self._discard(pooled)
+
+    def release(self, pooled):
+        """Return a leased bot; dead or worn-out bots are closed instead of kept."""
+        pooled.uses += 1
+        if self._closed or not self._alive(pooled) or self._worn_out(pooled):
+            self._discard(pooled)
+            return
+        try:
+            # Leave a single tab for the next action
+            handles = pooled.bot.driver.window_handles
+            for handle in handles[1:]:
+                pooled.bot.driver.switch_to.window(handle)
+                pooled.bot.driver.close()
+            pooled.bot.driver.switch_to.window(handles[0])
+        except WebDriverException:
+            self._discard(pooled)
+            return
+        with self._cond:
+            self._idle.setdefault(pooled.key, []).append(pooled)
+            self._cond.notify_all()
+
+    @contextmanager
+    def lease(self, platform, account=None, timeout=None):
+        pooled = self.acquire(platform, account, timeout)
+        try:
+            yield pooled.bot
+        finally:
+            self.release(pooled)
+
+    def warm(self, platform, account=None, count=None):
+        """Start bots up to count (default: pool size) so the first actions do not wait for Chrome."""
+        leased = []
+        try:
+            for _ in range(min(count or self.size, self.size)):
+                leased.append(self.acquire(platform, account, timeout=0))
+        except TimeoutError:
+            pass
+        finally:
+            for pooled in leased:
+                # Not a use: warming should not count towards recycling
+                pooled.uses -= 1
+                self.release(pooled)
+        return len(leased)
+
+    def stats(self):
+        with self._cond:
+            return {f"{p}/{a}": {'live': len(self._slots.get((p, a), ())), 'idle': len(self._idle.get((p, a), ()))}
+                    for p, a in set(self._slots) | set(self._idle)}
+
+    def close(self):
+        """Quit idle browsers; leased ones are quit when they are returned."""
+        with self._cond:
+            self._closed = True
+            idle = [pooled for bots in self._idle.values() for pooled in bots]
+            self._idle.clear()
+        for pooled in idle:
+            self._discard(pooled)
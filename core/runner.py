@@ -1,16 +1,27 @@
+from newAgent.core.auth import AuthManager
 from newAgent.src.services.action_executor import ActionExecutor
 import traceback
 
 class ActionRunner:
-    def __init__(self, bot, action, api_client=None):
+    def __init__(self, bot, action, api_client=None, pool=None):
+        """Run with the given bot, or pass bot=None and a BrowserPool to lease a warm one for the action's platform."""
         self.bot = bot
         self.action = action
         self.api_client = api_client
+        self.pool = pool
 
     def run(self):
+        if self.bot is None and self.pool is not None:
+            # Browsers are pooled per account, so two accounts never share a profile or cookies
+            account = AuthManager(self.action.source).current_account()
+            with self.pool.lease(self.action.source, account=account) as bot:
+                return self._run(bot)
+        return self._run(self.bot)
+
+    def _run(self, bot):
         print("\n[2/3] Executing action...")
         try:
-            executor = ActionExecutor(self.bot, self.action, api_client=self.api_client)
+            executor = ActionExecutor(bot, self.action, api_client=self.api_client)
             result = executor.execute()
             
             print("\n[3/3] Execution complete!")
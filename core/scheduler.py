@@ -0,0 +1,226 @@
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+from newAgent.src.data.attributes import Attrs, GUI_Attrs
+from newAgent.src.data.data_parser import next_period
+
+# Placeholder for heap entries that were replaced or removed; they are skipped when popped.
+_REMOVED = object()
+
+
+def due_time(action, now):
+    """
+    Epoch seconds at which the action should next run, or None when it should not be scheduled.
+
+    Recurring actions (pollInterval with a start/end window) run on the next interval boundary
+    inside the window. Actions with a scheduledDate launch as early as their platform allows
+    (GUI_Attrs.socials_scheduled days ahead). Actions the user queued by hand run right away.
+    """
+    if getattr(action, 'disabled', False) or getattr(action, 'state', None) in ('DONE', 'PAUSE'):
+        return None
+    start = getattr(action, 'startDateCurrentZone', None)
+    end = getattr(action, 'endDateCurrentZone', None)
+    poll_interval = getattr(action, 'pollInterval', None)
+    if poll_interval and start and end:
+        nxt = next_period(start=start, end=end, pollInterval=poll_interval, now=datetime.fromtimestamp(now))
+        return nxt.timestamp() if nxt else None
+    scheduled = getattr(action, 'scheduledDateCurrentZone', None)
+    if scheduled:
+        ahead = GUI_Attrs.socials_scheduled.get((action.source or '').lower(), 0) or 0
+        return (scheduled - timedelta(days=ahead)).timestamp()
+    if action.createdAt in Attrs.user_selected_queue:
+        return now
+    return None
+
+
+def is_recurring(action):
+    return bool(getattr(action, 'pollInterval', None) and getattr(action, 'startDateCurrentZone', None)
+                and getattr(action, 'endDateCurrentZone', None))
+
+
+class ActionScheduler:
+    """
+    Runs actions when they fall due, keeping them in a heap keyed by next-run time.
+
+    Each platform has its own number of worker slots (one by default, since a platform's
+    actions share a logged-in account), so Instagram, LinkedIn and X actions run side by side
+    while two actions on the same platform run one after the other. Nothing is dispatched
+    while Attrs.not_allowed_run_action is set. Recurring actions are rescheduled when their
+    run finishes; one-shot actions are dropped.
+
+    run_action(action) does the actual work (start a bot, run ActionRunner) on a worker thread.
+    """
+
+    def __init__(self, run_action, slots=None, default_slots=1, clock=time.time, can_dispatch=None):
+        self.run_action = run_action
+        self.slots = {k.upper(): v for k, v in (slots or {}).items()}
+        self.default_slots = default_slots
+        self.clock = clock
+        self.can_dispatch = can_dispatch or (lambda: not Attrs.not_allowed_run_action)
+        self._heap = []
+        self._entries = {}
+        self._running = {}  # createdAt -> (platform, due)
+        self._finished = {}  # createdAt -> due time of a one-shot run that already happened
+        self._busy = {}  # platform -> running count
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+    @staticmethod
+    def _platform(action):
+        return (action.source or 'UNKNOWN').upper()
+
+    def _push(self, action, due):
+        key = action.createdAt
+        self._discard(key)
+        entry = [due, next(self._counter), action]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry[-1] = _REMOVED
+
+    def schedule(self, action, due=None):
+        """Add or reschedule an action; returns its due time, or None if it is not runnable."""
+        with self._cond:
+            if action.createdAt in self._running:
+                # Rescheduled from its own result once the current run finishes.
+                return None
+            due = due_time(action, self.clock()) if due is None else due
+            if due is not None and self._finished.get(action.createdAt) == due:
+                # Already ran; a refresh can list it before the server marks it done.
+                due = None
+            if due is None:
+                self._discard(action.createdAt)
+            else:
+                self._push(action, due)
+            self._cond.notify()
+            return due
+
+    def remove(self, key):
+        with self._cond:
+            self._discard(key)
+
+    def refresh(self, actions):
+        """Sync with a freshly fetched action list: new and changed actions are (re)scheduled, vanished ones dropped."""
+        with self._cond:
+            keys = {action.createdAt for action in actions}
+            for key in [k for k in self._entries if k not in keys]:
+                self._discard(key)
+            for action in actions:
+                self.schedule(action)
+
+    def pending(self):
+        """Scheduled (not running) actions with their due times, soonest first."""
+        with self._cond:
+            return sorted(((e[0], e[-1]) for e in self._heap if e[-1] is not _REMOVED), key=lambda x: x[0])
+
+    def running(self):
+        with self._cond:
+            return {p: n for p, n in self._busy.items() if n}
+
+    def next_wakeup(self):
+        with self._cond:
+            self._drop_removed()
+            return self._heap[0][0] if self._heap else None
+
+    def _drop_removed(self):
+        while self._heap and self._heap[0][-1] is _REMOVED:
+            heapq.heappop(self._heap)
+
+    def _has_slot(self, platform):
+        return self._busy.get(platform, 0) < self.slots.get(platform, self.default_slots)
+
+    def run_pending(self):
+        """Dispatch every due action whose platform has a free slot; returns the dispatched actions."""
+        dispatched = []
+        with self._cond:
+            if not self.can_dispatch():
+                return dispatched
+            now = self.clock()
+            blocked = []
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                action = entry[-1]
+                if action is _REMOVED:
+                    continue
+                platform = self._platform(action)
+                if not self._has_slot(platform):
+                    # Keeps its place: it is first in line when the platform frees up.
+                    blocked.append(entry)
+                    continue
+                del self._entries[action.createdAt]
+                self._busy[platform] = self._busy.get(platform, 0) + 1
+                self._running[action.createdAt] = (platform, entry[0])
+                dispatched.append(action)
+            for entry in blocked:
+                heapq.heappush(self._heap, entry)
+        for action in dispatched:
+            threading.Thread(target=self._execute, args=(action,), daemon=True,
+                             name=f"scheduler-{self._platform(action).lower()}").start()
+        return dispatched
+
+    def _execute(self, action):
+        try:
+            self.run_action(action)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            with self._cond:
+                platform, ran_at = self._running.pop(action.createdAt)
+                self._busy[platform] -= 1
+                if is_recurring(action):
+                    due = due_time(action, self.clock())
+                    if due is not None:
+                        self._push(action, due)
+                else:
+                    self._finished[action.createdAt] = ran_at
+                    Attrs.user_selected_queue.discard(action.createdAt)
+                self._cond.notify()
+
+    def _loop(self, idle_wait):
+        while True:
+            self.run_pending()
+            with self._cond:
+                if self._stopping:
+                    return
+                wakeup = self.next_wakeup()
+                timeout = idle_wait if wakeup is None else min(idle_wait, max(0.0, wakeup - self.clock()))
+                # Woken early by schedule/refresh/finished runs; idle_wait also re-checks can_dispatch.
+                self._cond.wait(timeout)
+                if self._stopping:
+                    return
+
+    def start(self, idle_wait=5.0):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._loop, args=(idle_wait,), daemon=True, name="scheduler")
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop dispatching; actions already running finish on their own threads."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait_idle(self, timeout=None):
+        """Block until no action is running."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
@@ -0,0 +1,263 @@
+import socket
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timezone
+
+import requests
+
+from newAgent.src.services.action_executor import ActionExecutor
+from newAgent.src.data.data_parser import SavedItem
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+
+
+class LeaseClient:
+    """Client for the target lease endpoints of the webapp server."""
+
+    def __init__(self, base_url="http://127.0.0.1:8000", worker_id=None, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.worker_id = worker_id or default_worker_id()
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def _request(self, method, path, body):
+        res = self._session.request(method, f"{self.base_url}/api{path}", json=body, timeout=self.timeout)
+        res.raise_for_status()
+        return res.json()
+
+    def _post(self, path, body):
+        return self._request("POST", path, body)
+
+    def claim(self, action_id, limit=5, lease_seconds=None):
+        body = {"workerId": self.worker_id, "limit": limit, "leaseSeconds": lease_seconds}
+        return self._post(f"/actions/{action_id}/targets:claim", body)["data"]["actionTargets"]
+
+    def heartbeat(self, ids, lease_seconds=None):
+        body = {"workerId": self.worker_id, "ids": list(ids), "leaseSeconds": lease_seconds}
+        return self._post("/action-targets:heartbeat", body)["data"]
+
+    def complete(self, target_id, metadata=None):
+        return self._post(f"/action-targets/{target_id}:complete", {"workerId": self.worker_id, "metadata": metadata})
+
+    def fail(self, target_id, error=None, retry=True):
+        return self._post(f"/action-targets/{target_id}:fail", {"workerId": self.worker_id, "error": error, "retry": retry})
+
+    def batch_update(self, updates):
+        """Apply many target updates in one request; returns per-row results."""
+        return self._request("PATCH", "/action-targets:batch", {"updates": updates})["data"]["results"]
+
+
+class TargetUpdateBuffer:
+    """
+    Coalesces per-target status updates and sends them through one batch request.
+
+    Updates are flushed once max_size are pending or the oldest has waited max_age
+    seconds; callers flush explicitly before anything that depends on them being stored.
+    """
+
+    def __init__(self, client: LeaseClient, max_size=50, max_age=5.0):
+        self.client = client
+        self.max_size = max_size
+        self.max_age = max_age
+        self._pending = []
+        self._oldest = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _due(self):
+        return len(self._pending) >= self.max_size or (
+            bool(self._pending) and time.monotonic() - self._oldest >= self.max_age)
+
+    def due(self):
+        with self._lock:
+            return self._due()
+
+    def add(self, update):
+        """Queue an update dict ({id, status, ...}); returns flush results if this triggered a flush."""
+        with self._lock:
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append(update)
+            due = self._due()
+        return self.flush() if due else []
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return []
+        try:
+            return self.client.batch_update(pending)
+        except requests.RequestException:
+            # Keep the updates for the next flush rather than dropping outcomes.
+            with self._lock:
+                self._pending = pending + self._pending
+                self._oldest = time.monotonic()
+            raise
+
+
+def target_to_saved_item(target):
+    """Map a claimed action target (with its joined person) to a SavedItem for ActionExecutor."""
+    person = target.get('person') or {}
+    return SavedItem({
+        'id': target.get('personId'),
+        'platform': (target.get('platform') or '').lower(),
+        'url': target.get('link'),
+        'platform_username': person.get('platform_username') or '',
+        'full_name': person.get('full_name') or ' ',
+        'image_url': person.get('image_url'),
+        'introduction': person.get('introduction') or '-',
+        'category': person.get('category'),
+        'follower_count': person.get('follower_count'),
+        'is_verified': person.get('is_verified'),
+    })
+
+
+class TargetWorker:
+    """
+    Claims batches of targets for one action and runs each through ActionExecutor.
+
+    Leases are renewed from a background thread while targets are being worked, so a
+    slow browser step does not let another node take the same target. A crashed node
+    simply stops heartbeating and its targets become claimable again once the lease expires.
+    Completions are coalesced into batch updates; a completed target stays leased (and
+    heartbeated) until its update is flushed.
+    """
+
+    def __init__(self, bot, action, action_id, client: LeaseClient, batch_size=5, lease_seconds=300,
+                 campaign=None, api_client=None, flush_size=50, flush_interval=5.0):
+        self.bot = bot
+        self.action = action
+        self.action_id = action_id
+        self.client = client
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.campaign = campaign
+        self.api_client = api_client
+        self.updates = TargetUpdateBuffer(client, max_size=flush_size, max_age=flush_interval)
+        self.stats = {'completed': 0, 'failed': 0, 'lost': 0}
+        self._held = set()
+        self._lost = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def _heartbeat_loop(self, done):
+        renew_every = max(1.0, self.lease_seconds / 3.0)
+        last_renewal = time.monotonic()
+        while not done.wait(min(renew_every, self.updates.max_age)):
+            if self.updates.due():
+                try:
+                    self.flush()
+                except requests.RequestException as e:
+                    print(f"Flushing target updates failed: {e}")
+            if time.monotonic() - last_renewal < renew_every:
+                continue
+            last_renewal = time.monotonic()
+            with self._lock:
+                ids = list(self._held)
+            if not ids:
+                continue
+            try:
+                lost = self.client.heartbeat(ids, self.lease_seconds)['lost']
+            except requests.RequestException as e:
+                print(f"Lease heartbeat failed: {e}")
+                continue
+            if lost:
+                with self._lock:
+                    self._lost.update(lost)
+
+    def _run_target(self, target):
+        executor = ActionExecutor(self.bot, self.action, target_to_saved_item(target), self.campaign, self.api_client)
+        return executor.execute()
+
+    def _record(self, results):
+        with self._lock:
+            for r in results:
+                # Completed targets stay held (and heartbeated) until their update is stored.
+                self._held.discard(r['id'])
+                self.stats['completed' if r['result'] == 'updated' else 'lost'] += 1
+
+    def _complete(self, tid):
+        update = {'id': tid, 'status': 'DONE', 'workerId': self.client.worker_id,
+                  'lastInteractedAt': datetime.now(timezone.utc).isoformat()}
+        try:
+            self._record(self.updates.add(update))
+        except requests.RequestException as e:
+            # The update stays queued and goes out with the next flush.
+            print(f"Flushing target updates failed: {e}")
+
+    def flush(self):
+        self._record(self.updates.flush())
+
+    def _process(self, target):
+        tid = target['id']
+        with self._lock:
+            if tid in self._lost:
+                # Lease expired and was taken over; leave the target to its new owner.
+                self._lost.discard(tid)
+                self._held.discard(tid)
+                self.stats['lost'] += 1
+                return
+        try:
+            result = self._run_target(target) or {}
+        except Exception as e:
+            traceback.print_exc()
+            result = {'success': False, 'error': str(e)}
+        if result.get('success'):
+            self._complete(tid)
+            return
+        try:
+            self.client.fail(tid, error=str(result.get('error') or 'execution failed'))
+            self.stats['failed'] += 1
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 409:
+                self.stats['lost'] += 1
+            else:
+                print(f"Reporting failure of target {tid} failed: {e}")
+        except requests.RequestException as e:
+            # The lease expires and the target is claimed again.
+            print(f"Reporting failure of target {tid} failed: {e}")
+        finally:
+            with self._lock:
+                self._held.discard(tid)
+
+    def run_batch(self):
+        """Claim and work one batch. Returns the number of targets claimed."""
+        targets = self.client.claim(self.action_id, self.batch_size, self.lease_seconds)
+        with self._lock:
+            self._held.update(t['id'] for t in targets)
+        for target in targets:
+            if self._stop.is_set():
+                break
+            self._process(target)
+        return len(targets)
+
+    def run(self):
+        """Work batches until no claimable targets remain or stop() is called."""
+        print(f"Worker {self.client.worker_id} claiming targets of action {self.action_id}")
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat_loop, args=(done,), daemon=True)
+        heartbeat.start()
+        try:
+            while not self._stop.is_set():
+                if self.run_batch() == 0:
+                    break
+        finally:
+            done.set()
+            heartbeat.join()
+            try:
+                self.flush()
+            except requests.RequestException as e:
+                # Unsent completions stay leased; the targets are retried once their leases expire.
+                print(f"Flushing target updates failed, {len(self.updates)} not stored: {e}")
+        print(f"Worker {self.client.worker_id} finished: {self.stats}")
+        return self.stats
@@ -279,7 +279,7 @@ Page {
                         Button {
                             text: "Clear Logs"
                             flat: true
-                            onClicked: logArea.text = ""
+                            onClicked: backend.logModel.clear()
                             contentItem: Text {
                                 text: parent.text
                                 color: parent.hovered ? "#FF3B30" : "#86868B"
@@ -292,28 +292,34 @@ Page {
                         }
                     }
                     
-                    ScrollView {
+                    Rectangle {
                         Layout.fillWidth: true
                         Layout.fillHeight: true
-                        clip: true
-                        
-                        TextArea {
-                            id: logArea
-                            readOnly: true
-                            text: backend.logOutput
-                            font.family: "Menlo" // Monospace font for logs
-                            font.pixelSize: 12
-                            color: "#333333"
-                            background: Rectangle {
-                                color: "#F5F5F7"
-                                radius: 8
-                                border.color: "#E5E5E5"
-                            }
-                            padding: 12
-                            
-                            // Auto-scroll to bottom
-                            onTextChanged: {
-                                if (length > 0) cursorPosition = length - 1
+                        color: "#F5F5F7"
+                        radius: 8
+                        border.color: "#E5E5E5"
+
+                        // One delegate per visible line; appends insert rows instead of re-rendering all text
+                        ListView {
+                            id: logView
+                            anchors.fill: parent
+                            anchors.margins: 12
+                            clip: true
+                            model: backend.logModel
+                            reuseItems: true
+                            ScrollBar.vertical: ScrollBar {}
+
+                            property bool followTail: true
+                            onMovementEnded: followTail = atYEnd
+                            onCountChanged: if (followTail) positionViewAtEnd()
+
+                            delegate: Text {
+                                width: logView.width
+                                text: model.display
+                                font.family: "Menlo" // Monospace font for logs
+                                font.pixelSize: 12
+                                color: "#333333"
+                                wrapMode: Text.WrapAnywhere
                             }
                         }
                     }
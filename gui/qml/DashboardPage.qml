@@ -41,6 +41,19 @@ Page {
                     mipmap: true
                 }
                 
+                Switch {
+                    id: autoRunSwitch
+                    text: "Auto-run"
+                    checked: backend.schedulerRunning
+                    anchors.right: refreshBtn.left
+                    anchors.rightMargin: 8
+                    anchors.verticalCenter: parent.verticalCenter
+                    onToggled: backend.setSchedulerRunning(checked)
+
+                    ToolTip.visible: hovered
+                    ToolTip.text: "Run scheduled actions when due, platforms in parallel"
+                }
+
                 Button {
                     id: refreshBtn
                     icon.source: "../assets/Refresh.svg"
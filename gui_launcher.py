@@ -3,6 +3,7 @@ import os
 import threading
 import logging
 import time
+from collections import deque
 from pathlib import Path
 
 # Add project root to sys.path
@@ -10,26 +11,88 @@ current_dir = Path(__file__).resolve().parent
 project_root = current_dir.parent
 sys.path.append(str(project_root))
 
-from PyQt5.QtCore import QObject, pyqtSignal, pyqtProperty, QUrl, pyqtSlot
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtProperty, QUrl, pyqtSlot, QAbstractListModel, QModelIndex, Qt, QTimer
 from PyQt5.QtGui import QGuiApplication
 from PyQt5.QtQml import QQmlApplicationEngine
 
 from newAgent.core.bot import get_bot_class
 from newAgent.core.auth import AuthManager
+from newAgent.core.browser_pool import BrowserPool, start_bot
 from newAgent.core.runner import ActionRunner
+from newAgent.core.scheduler import ActionScheduler
 from newAgent.src.data.data_parser import Actions
+from newAgent.src.data.attributes import Attrs
 from newAgent.src.api.APIs import RestAPI
 from newAgent.src.database.database import DataBase
 
-# Custom Log Handler to send logs to QML
+LOG_CAPACITY = 5000
+LOG_FLUSH_MS = 100
+
+# Custom Log Handler that queues formatted records for the QML log view
 class SignalHandler(logging.Handler):
-    def __init__(self, signal):
+    """Queues formatted records from any thread; the GUI thread drains them on a timer."""
+
+    def __init__(self, capacity=LOG_CAPACITY):
         super().__init__()
-        self.signal = signal
+        # Bounded so a stalled UI cannot grow memory; deque appends are thread-safe.
+        self.pending = deque(maxlen=capacity)
 
     def emit(self, record):
-        msg = self.format(record)
-        self.signal.emit(msg + "\n")
+        self.pending.append(self.format(record))
+
+    def drain(self):
+        lines = []
+        while self.pending:
+            lines.append(self.pending.popleft())
+        return lines
+
+class LogModel(QAbstractListModel):
+    """Ring buffer of log lines exposed to QML as a list model, one row per line."""
+
+    MessageRole = Qt.UserRole + 1
+
+    def __init__(self, capacity=LOG_CAPACITY, parent=None):
+        super().__init__(parent)
+        self.capacity = capacity
+        self._lines = deque()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._lines)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._lines):
+            return None
+        if role in (Qt.DisplayRole, self.MessageRole):
+            return self._lines[index.row()]
+        return None
+
+    def roleNames(self):
+        return {Qt.DisplayRole: b"display", self.MessageRole: b"msg"}
+
+    def append_lines(self, lines):
+        """Insert a batch of lines as one row insertion, dropping the oldest beyond capacity."""
+        lines = lines[-self.capacity:]
+        if not lines:
+            return
+        overflow = len(self._lines) + len(lines) - self.capacity
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._lines.popleft()
+            self.endRemoveRows()
+        start = len(self._lines)
+        self.beginInsertRows(QModelIndex(), start, start + len(lines) - 1)
+        self._lines.extend(lines)
+        self.endInsertRows()
+
+    def text(self):
+        return "".join(line + "\n" for line in self._lines)
+
+    @pyqtSlot()
+    def clear(self):
+        self.beginResetModel()
+        self._lines.clear()
+        self.endResetModel()
 
 class Backend(QObject):
     logEmitted = pyqtSignal(str, arguments=['msg'])
@@ -40,12 +103,13 @@ class Backend(QObject):
     socialStatusesChanged = pyqtSignal()
 
     savedTokenChanged = pyqtSignal()
+    schedulerRunningChanged = pyqtSignal(bool, arguments=['running'])
     storageTypeChanged = pyqtSignal(str, arguments=['type'])
 
     def __init__(self):
         super().__init__()
         self.db = DataBase('MAC')
-        self._logs = ""
+        self._logModel = LogModel(parent=self)
         self._isRunning = False
         self._headless = False
         self._actions = []
@@ -61,6 +125,13 @@ class Backend(QObject):
             "Email": False
         }
         self.bot_instance = None
+        self._manualThread = None
+        self._stopRequested = threading.Event()
+        # Warm, logged-in browsers shared by manual and scheduled runs
+        self.browsers = BrowserPool(starter=self._start_pooled_bot)
+        # Runs due actions automatically, one per platform at a time, while auto-run is on
+        self.scheduler = ActionScheduler(self._run_scheduled_action)
+        self._schedulerRunning = False
         
         # Setup logging
         self.logger = logging.getLogger("gui")
@@ -69,18 +140,27 @@ class Backend(QObject):
         for h in self.logger.handlers[:]:
             self.logger.removeHandler(h)
                 
-        handler = SignalHandler(self.logEmitted)
-        handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
-        self.logger.addHandler(handler)
-        
-        self.logEmitted.connect(self.append_log)
+        self._logHandler = SignalHandler()
+        self._logHandler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+        self.logger.addHandler(self._logHandler)
+
+        # Coalesce records into one model update (and one logEmitted) per tick
+        # instead of a signal and a full re-render per line.
+        self._logTimer = QTimer(self)
+        self._logTimer.setInterval(LOG_FLUSH_MS)
+        self._logTimer.timeout.connect(self.flush_logs)
+        self._logTimer.start()
         
         # Initial check
         self.checkSocialStatus()
 
     @pyqtProperty(str, notify=logEmitted)
     def logs(self):
-        return self._logs
+        return self._logModel.text()
+
+    @pyqtProperty(QObject, constant=True)
+    def logModel(self):
+        return self._logModel
 
     @pyqtProperty(bool, notify=isRunningChanged)
     def isRunning(self):
@@ -111,6 +191,22 @@ class Backend(QObject):
             return 3
         return sorted(self._actions, key=sort_key)
 
+    @pyqtProperty(bool, notify=schedulerRunningChanged)
+    def schedulerRunning(self):
+        return self._schedulerRunning
+
+    @pyqtSlot(bool)
+    def setSchedulerRunning(self, running):
+        if running == self._schedulerRunning:
+            return
+        if running:
+            self.scheduler.start()
+        else:
+            self.scheduler.stop()
+        self._schedulerRunning = running
+        self.schedulerRunningChanged.emit(running)
+        self.logger.info("Auto-run {}".format("on" if running else "off"))
+
     @pyqtProperty(str, notify=savedTokenChanged)
     def savedToken(self):
         return self._savedToken
@@ -127,8 +223,11 @@ class Backend(QObject):
             self.storageTypeChanged.emit(value)
             self.logger.info(f"Storage type changed to: {value}")
 
-    def append_log(self, msg):
-        self._logs += msg
+    def flush_logs(self):
+        lines = self._logHandler.drain()
+        if lines:
+            self._logModel.append_lines(lines)
+            self.logEmitted.emit("\n".join(lines) + "\n")
 
     @pyqtSlot(str)
     def login(self, token):
@@ -222,13 +321,17 @@ class Backend(QObject):
                 res = RestAPI.get_actions()
                 if res and 'actions' in res:
                     new_actions = []
+                    parsed_actions = []
                     for a in res['actions']:
-                        parsed = Actions(a).action
+                        action = Actions(a)
+                        parsed_actions.append(action)
+                        parsed = action.action
                         # Preserve local INPROGRESS state
                         if self._runningId and parsed.get('id') == self._runningId:
                             parsed['state'] = 'INPROGRESS'
                         new_actions.append(parsed)
                     
+                    self.scheduler.refresh(parsed_actions)
                     self._actions = new_actions
                     self.actionsChanged.emit()
                     self.logger.info("Refreshed: {} actions".format(len(self._actions)))
@@ -251,54 +354,84 @@ class Backend(QObject):
         
         # Update local actions list to show 'INPROGRESS' immediately
         if action_id:
-            for action in self._actions:
-                if action.get('id') == action_id:
-                    action['state'] = 'INPROGRESS'
-                    self.actionsChanged.emit()
-                    break
+            self._set_action_state(action_id, 'INPROGRESS')
 
         self.logger.info("Run: {} {} '{}' (max {})".format(platform, action_type, keyword, max_results))
 
+        self._stopRequested.clear()
         thread = threading.Thread(target=self._run_action_thread, args=(platform, action_type, keyword, max_results, action_id))
         thread.daemon = True
+        self._manualThread = thread
         thread.start()
 
     @pyqtSlot()
     def stop_action(self):
-        if self.bot_instance:
+        if self._isRunning:
             self.logger.info("Stopping action...")
+            # Also cancels a run that is still waiting for a browser or starting Chrome
+            self._stopRequested.set()
             # This is a bit forceful but fits current architecture
-            try:
-                self.bot_instance.quit()
-            except Exception:
-                pass
+            if self.bot_instance:
+                try:
+                    self.bot_instance.quit()
+                except Exception:
+                    pass
             self._isRunning = False
             self.isRunningChanged.emit(False)
             
             if self._runningId:
-                for action in self._actions:
-                    if action.get('id') == self._runningId:
-                        action['state'] = 'PENDING'
-                        self.actionsChanged.emit()
-                        break
+                self._set_action_state(self._runningId, 'PENDING')
                 self._runningId = ""
 
+    def _set_action_state(self, action_id, state):
+        for action in self._actions:
+            if action.get('id') == action_id:
+                action['state'] = state
+                self.actionsChanged.emit()
+                break
+
+    def _run_scheduled_action(self, action):
+        self.logger.info("Auto-run: {} '{}'".format(action.source, action.title))
+        self._set_action_state(action.id, 'INPROGRESS')
+        try:
+            ActionRunner(None, action, api_client=RestAPI, pool=self.browsers).run()
+            self.logger.info("Auto-run done: '{}'".format(action.title))
+        except Exception as e:
+            self.logger.error("Auto-run of '{}' failed: {}".format(action.title, e))
+        finally:
+            self.refreshActions()
+
+    def _start_pooled_bot(self, platform, profile_dir, account=None):
+        def track(bot):
+            # A manual run's browser can be stopped from the UI while Chrome is still starting
+            if threading.current_thread() is self._manualThread:
+                self.bot_instance = bot
+
+        return start_bot(platform, profile_dir, headless=self._headless, account=account, on_created=track)
+
+    def _acquire_browser(self, platform):
+        """Lease a browser for the manual run; returns None if Stop was pressed while waiting."""
+        account = AuthManager(platform).current_account()
+        while not self._stopRequested.is_set():
+            try:
+                # Short waits, so Stop works while a scheduled run holds the platform's browser
+                return self.browsers.acquire(platform, account=account, timeout=1)
+            except TimeoutError:
+                continue
+        return None
+
     def _run_action_thread(self, platform, action_type, keyword, max_results, action_id=""):
+        # Hold the scheduler back while a manual run is in progress
+        Attrs.not_allowed_run_action = True
+        pooled = None
         try:
             self.logger.info("Initializing...")
             
-            bot_class, login_url = get_bot_class(platform)
-            bot = bot_class(login_url, 'MAC')
-            self.bot_instance = bot
-            
-            bot._has_challenge = lambda: False
-            bot.headless = self._headless
-            
-            auth = AuthManager(platform)
-            auth.load_cookies(bot)
-            
-            bot.web_driver(login_required=False)
-            auth.check_and_save_login(bot)
+            pooled = self._acquire_browser(platform)
+            if pooled is None or self._stopRequested.is_set():
+                self.logger.info("Stopped before the action started")
+                return
+            bot = self.bot_instance = pooled.bot
             
             action_data = {
                 "type": action_type,
@@ -323,15 +456,14 @@ class Backend(QObject):
         except Exception as e:
             self.logger.error("Error: {}".format(str(e)))
         finally:
+            Attrs.not_allowed_run_action = False
             self._isRunning = False
             self._runningId = ""
             self.isRunningChanged.emit(False)
             self.bot_instance = None
-            if 'bot' in locals() and bot:
-                try:
-                    bot.quit()
-                except Exception:
-                    pass
+            if pooled:
+                # A bot quit through Stop fails the pool's health check and is discarded
+                self.browsers.release(pooled)
 
 if __name__ == "__main__":
     app = QGuiApplication(sys.argv)
@@ -352,4 +484,6 @@ if __name__ == "__main__":
     if not engine.rootObjects():
         sys.exit(-1)
 
+    app.aboutToQuit.connect(backend.scheduler.stop)
+    app.aboutToQuit.connect(backend.browsers.close)
     sys.exit(app.exec_())
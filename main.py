@@ -5,6 +5,7 @@ Unified interface for running actions, managing sessions, and testing bots.
 """
 
 import sys
+import time
 import argparse
 import logging
 from pathlib import Path
@@ -15,8 +16,13 @@ sys.path.insert(0, str(project_root))
 
 from newAgent.core.bot import get_bot_class
 from newAgent.core.auth import AuthManager
+from newAgent.core.browser_pool import BrowserPool
 from newAgent.core.runner import ActionRunner
+from newAgent.core.scheduler import ActionScheduler
+from newAgent.core.worker import LeaseClient, TargetWorker
+from newAgent.src.data.data_parser import Actions
 from newAgent.src.database.database import DataBase
+from newAgent.src.services.selector_stats import SelectorStats
 from newAgent.src.api.APIs import RestAPI
 from newAgent.src.robot.flatlay import FlatLay
 from newAgent.utils.logger import setup_enhanced_logging
@@ -55,7 +61,7 @@ class MockAction:
 
 def main():
     # Pre-process args to handle implicit 'run' command
-    if len(sys.argv) > 1 and sys.argv[1] not in ['run', 'list', '-h', '--help']:
+    if len(sys.argv) > 1 and sys.argv[1] not in ['run', 'list', 'work', 'schedule', 'selectors', '-h', '--help']:
         # If the first arg is not a command, assume it's 'run' and insert it
         sys.argv.insert(1, 'run')
 
@@ -68,6 +74,26 @@ def main():
     run_parser.add_argument('action_type', help='Action type (KEYWORD_SEARCH, BULK_MESSAGING, etc.)')
     run_parser.add_argument('args', nargs='*', help='Arguments in key=value format (e.g. keyword="python")')
     
+    # Work command: claim an action's targets from the webapp server under a lease
+    work_parser = subparsers.add_parser('work', help='Claim and execute targets of a server-side action')
+    work_parser.add_argument('platform', help='Platform name (instagram, linkedin, x, tiktok)')
+    work_parser.add_argument('action_type', help='Action type (BULK_MESSAGING, etc.)')
+    work_parser.add_argument('action_id', help='ID of the action whose targets to claim')
+    work_parser.add_argument('args', nargs='*', help='Arguments in key=value format (e.g. messageText="hi")')
+    work_parser.add_argument('--server', default='http://127.0.0.1:8000', help='Webapp server base URL')
+    work_parser.add_argument('--worker-id', default=None, help='Worker ID (defaults to hostname plus a random suffix)')
+    work_parser.add_argument('--batch-size', type=int, default=5, help='Targets claimed per lease request')
+    work_parser.add_argument('--lease-seconds', type=int, default=300, help='Lease length; renewed while working')
+
+    # Schedule command: run the account's actions as they fall due, platforms in parallel
+    schedule_parser = subparsers.add_parser('schedule', help='Run scheduled and recurring actions as they fall due')
+    schedule_parser.add_argument('--refresh-interval', type=int, default=300, help='Seconds between action list refreshes')
+    schedule_parser.add_argument('--slots', nargs='*', default=[], help='Concurrent runs per platform, e.g. instagram=2 (default 1)')
+
+    # Selectors command: how each alternative XPath has been doing
+    selectors_parser = subparsers.add_parser('selectors', help='Show hit statistics of alternative XPaths')
+    selectors_parser.add_argument('--config', default=None, help='Only this config, e.g. INSTAGRAM_POST_PAGE')
+
     # List command (placeholder for future feature)
     list_parser = subparsers.add_parser('list', help='List available actions')
     list_parser.add_argument('platform', help='Platform name')
@@ -79,7 +105,19 @@ def main():
         print(f"Listing actions for {args.platform} (Not implemented yet)")
         sys.exit(0)
         
-    if args.command == 'run':
+    if args.command == 'selectors':
+        show_selector_stats(args.config)
+        sys.exit(0)
+
+    if args.command == 'schedule':
+        slots = {}
+        for arg in args.slots:
+            platform, _, count = arg.partition('=')
+            slots[platform] = int(count or 1)
+        schedule_actions(args.refresh_interval, slots)
+        sys.exit(0)
+
+    if args.command in ('run', 'work'):
         # Parse generic args
         kwargs = {}
         for arg in args.args:
@@ -96,29 +134,18 @@ def main():
                 except ValueError:
                     pass
                 kwargs[key] = value
-                
-        run_action(args.platform, args.action_type, kwargs)
-    else:
-        parser.print_help()
 
-def run_action(platform, action_type, kwargs):
-    print("=" * 60)
-    print(f"{platform.upper()} {action_type.upper()} Execution")
-    print("=" * 60)
-    print(f"Arguments: {kwargs}")
-    print("=" * 60)
-    
-    # Initialize API and Database
-    db = DataBase('MAC')
-    api_token = db.fetch_setting("api_token", "")
-    if api_token:
-        print(f"  ✓ Loaded CRM API token from database")
-        RestAPI.set_authorization(api_token)
-        FlatLay.auth_with_bearer_token(api_token)
+        if args.command == 'work':
+            client = LeaseClient(args.server, args.worker_id)
+            work_action(args.platform, args.action_type, args.action_id, kwargs, client,
+                        batch_size=args.batch_size, lease_seconds=args.lease_seconds)
+        else:
+            run_action(args.platform, args.action_type, kwargs)
     else:
-        print(f"  ⚠ No CRM API token found in database. Saving might fail.")
+        parser.print_help()
 
-    # Initialize Bot
+def init_bot(platform):
+    """Start a logged-in bot for the platform, exiting the process on failure."""
     print("\n[1/3] Initializing bot...")
     try:
         BotClass, login_url = get_bot_class(platform)
@@ -160,6 +187,96 @@ def run_action(platform, action_type, kwargs):
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    return bot
+
+def load_api_token():
+    db = DataBase('MAC')
+    api_token = db.fetch_setting("api_token", "")
+    if api_token:
+        print(f"  ✓ Loaded CRM API token from database")
+        RestAPI.set_authorization(api_token)
+        FlatLay.auth_with_bearer_token(api_token)
+    else:
+        print(f"  ⚠ No CRM API token found in database. Saving might fail.")
+
+def show_selector_stats(config=None):
+    """Print per-XPath hit statistics, best candidate of each field first."""
+    rows = SelectorStats(DataBase('MAC')).report(config)
+    if not rows:
+        print("No selector statistics recorded yet.")
+        return
+    current = None
+    for row in rows:
+        if (row['config'], row['field']) != current:
+            current = (row['config'], row['field'])
+            print(f"\n{row['config']} / {row['field']}")
+        latency = '-' if row['latencyMs'] is None else f"{row['latencyMs']:.0f} ms"
+        print(f"  {row['successRate']:>5.0%}  {row['hits']:>5} hit {row['misses']:>5} miss  {latency:>8}  {row['xpath']}")
+
+def work_action(platform, action_type, action_id, kwargs, client, batch_size=5, lease_seconds=300):
+    print("=" * 60)
+    print(f"{platform.upper()} {action_type.upper()} Worker {client.worker_id} -> {client.base_url}")
+    print("=" * 60)
+    load_api_token()
+    bot = init_bot(platform)
+    action = MockAction(platform, action_type, **kwargs)
+    setup_enhanced_logging()
+    worker = TargetWorker(bot, action, action_id, client, batch_size=batch_size, lease_seconds=lease_seconds)
+    try:
+        return worker.run()
+    except KeyboardInterrupt:
+        # Unfinished targets are released when their leases expire.
+        worker.stop()
+        return worker.stats
+
+def fetch_actions():
+    res = RestAPI.get_actions() or {}
+    actions = []
+    for data in res.get('actions', []):
+        try:
+            actions.append(Actions(data))
+        except Exception as e:
+            print(f"  ⚠ Skipping unparsable action: {e}")
+    return actions
+
+def schedule_actions(refresh_interval=300, slots=None):
+    print("=" * 60)
+    print(f"Scheduler (refresh every {refresh_interval}s, slots {slots or 'default'})")
+    print("=" * 60)
+    load_api_token()
+    setup_enhanced_logging()
+    # Browsers stay open between runs: back-to-back actions lease a warm, logged-in bot
+    browsers = BrowserPool(size=max(slots.values(), default=1) if slots else 1)
+
+    def run_scheduled_action(action):
+        return ActionRunner(None, action, api_client=RestAPI, pool=browsers).run()
+
+    scheduler = ActionScheduler(run_scheduled_action, slots=slots)
+    scheduler.start()
+    try:
+        while True:
+            scheduler.refresh(fetch_actions())
+            for due, action in scheduler.pending()[:5]:
+                print(f"  next: {time.strftime('%Y-%m-%d %H:%M', time.localtime(due))} {action.source} '{action.title}'")
+            time.sleep(refresh_interval)
+    except KeyboardInterrupt:
+        print("Stopping scheduler; running actions finish first...")
+        scheduler.stop()
+        scheduler.wait_idle()
+        browsers.close()
+
+def run_action(platform, action_type, kwargs):
+    print("=" * 60)
+    print(f"{platform.upper()} {action_type.upper()} Execution")
+    print("=" * 60)
+    print(f"Arguments: {kwargs}")
+    print("=" * 60)
+    
+    # Initialize API and Database
+    load_api_token()
+
+    # Initialize Bot
+    bot = init_bot(platform)
         
     # Create action
     action = MockAction(platform, action_type, **kwargs)
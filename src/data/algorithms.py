@@ -1,3 +1,6 @@
+from collections import deque
+
+
 class Node:
     def __init__(self, data):
         self.data = data
@@ -176,32 +179,40 @@ class Queue:
             return scheduled_actions
         if not scheduled_actions:
             return prev_queue_actions
-        head_nodes = []
-        tail_nodes = []
-        # Appending until the head value is added by user
-        while prev_queue_actions and condition(prev_queue_actions[0]):
-            head_nodes.append(prev_queue_actions.pop(0))
-        if not prev_queue_actions:
+        # Leading and trailing actions added by user keep their places at the ends
+        start, end = 0, len(prev_queue_actions)
+        while start < end and condition(prev_queue_actions[start]):
+            start += 1
+        head_nodes = prev_queue_actions[:start]
+        if start == end:
             return head_nodes + scheduled_actions
-        # Inserting until the tail value is added by user
-        while prev_queue_actions and condition(prev_queue_actions[-1]):
-            tail_nodes.insert(0, prev_queue_actions.pop())
-        if len(prev_queue_actions) < 3:
+        while condition(prev_queue_actions[end - 1]):
+            end -= 1
+        tail_nodes = prev_queue_actions[end:]
+        middle = prev_queue_actions[start:end]
+        if len(middle) < 3:
             return head_nodes + scheduled_actions + tail_nodes
-        # A copy of the createdAt from the current actions
-        scheduled_actions_ids = [val.createdAt for val in scheduled_actions]
-        for i in range(1, len(prev_queue_actions) - 1):
-            if not condition(prev_queue_actions[i]):
-                continue
-            for j in range(i + 1, len(prev_queue_actions)):
-                if prev_queue_actions[j].createdAt in scheduled_actions_ids:
-                    index = scheduled_actions_ids.index(prev_queue_actions[j].createdAt)
-                    scheduled_actions_ids.insert(index, prev_queue_actions[i].createdAt)
-                    scheduled_actions.insert(index, prev_queue_actions[i])
-                    break
-            else:
-                tail_nodes.insert(0, prev_queue_actions[i])
-        return head_nodes + scheduled_actions + tail_nodes
+        scheduled_ids = {val.createdAt for val in scheduled_actions}
+        # Every action added by user in between goes right before the next queued action that is still
+        # scheduled (anchor); without one it moves to the tail. Walking backwards finds each anchor in O(1).
+        inserted_before = {}
+        orphan_nodes = []
+        anchor = middle[-1].createdAt if middle[-1].createdAt in scheduled_ids else None
+        for i in range(len(middle) - 2, 0, -1):
+            action = middle[i]
+            if condition(action):
+                if anchor is None:
+                    orphan_nodes.append(action)
+                else:
+                    inserted_before.setdefault(anchor, deque()).appendleft(action)
+            if action.createdAt in scheduled_ids:
+                anchor = action.createdAt
+        merged = []
+        for action in scheduled_actions:
+            if action.createdAt in inserted_before:
+                merged.extend(inserted_before.pop(action.createdAt))
+            merged.append(action)
+        return head_nodes + merged + orphan_nodes + tail_nodes
 
 
 if __name__ == "__main__":
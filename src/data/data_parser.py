@@ -29,7 +29,7 @@ def convert_iso_to_current_timezone(iso_datetime: str):
         print("Exception at convert_iso_to_current_timezone", err)
 
 
-def next_period(start: datetime, end: datetime, pollInterval: int):
+def next_period(start: datetime, end: datetime, pollInterval: int, now: datetime = None):
     """
     Generate Next Period depends on startDate, endDate, pollInterval
 
@@ -37,6 +37,7 @@ def next_period(start: datetime, end: datetime, pollInterval: int):
         start: datetime: StartDate value
         end: datetime: EndDate value
         pollInterval: int: unit by minute
+        now: datetime: naive local time to compute from (defaults to the current time)
 
     Returns:
         datetime The datetime of the nextInterval
@@ -44,7 +45,7 @@ def next_period(start: datetime, end: datetime, pollInterval: int):
     """
     start = datetime.strptime(start.strftime("%B %d, %Y, %H:%M"), "%B %d, %Y, %H:%M")
     end = datetime.strptime(end.strftime("%B %d, %Y, %H:%M"), "%B %d, %Y, %H:%M")
-    current = datetime.now().replace(microsecond=0)
+    current = (now or datetime.now()).replace(microsecond=0)
 
     if current < start:
         return start
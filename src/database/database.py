@@ -12,16 +12,17 @@ class DataBase:
     DEFAULT_RATE_COUNT_VALUE: int = 48
     MAXIMUM_RATE_COUNT_VALUE: int = 50
 
-    def __init__(self, platform: str):
+    def __init__(self, platform: str, path: str = None):
         # Thread lock for database operations
         self._db_lock = threading.Lock()
         try:
-            path = os.path.join(os.path.expanduser('~'), 'Documents/flatlay_database.db')
+            default_path = os.path.join(os.path.expanduser('~'), 'Documents/flatlay_database.db')
             if platform == 'WINDOWS':
                 # path = 'flatlay_database.db'
                 pass
             elif platform == 'MAC':
-                path = os.path.join(os.path.expanduser('~'), 'flatly_database.db')
+                default_path = os.path.join(os.path.expanduser('~'), 'flatly_database.db')
+            path = path or default_path
             if not os.path.exists(path):
                 try:
                     file = open(path, 'w')
@@ -58,6 +59,14 @@ class DataBase:
         table_configs = 'CREATE TABLE IF NOT EXISTS configs (config_name VARCHAR(255) PRIMARY KEY, config_data TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)'
         self.cursor.execute(table_configs)
 
+        # crawlCursor table: where a paginated crawl stopped, so it can resume after a crash
+        table_crawl_cursor = 'CREATE TABLE IF NOT EXISTS crawlCursor (crawl_key VARCHAR(255) PRIMARY KEY, end_cursor TEXT, fetched INTEGER DEFAULT 0, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)'
+        self.cursor.execute(table_crawl_cursor)
+
+        # selectorStats table: decayed hit/miss scores and latency per candidate XPath of a config field
+        table_selector_stats = 'CREATE TABLE IF NOT EXISTS selectorStats (config VARCHAR(255), field VARCHAR(255), xpath TEXT, hits INTEGER DEFAULT 0, misses INTEGER DEFAULT 0, score REAL DEFAULT 0, weight REAL DEFAULT 0, latency_ms REAL, updated REAL, PRIMARY KEY (config, field, xpath))'
+        self.cursor.execute(table_selector_stats)
+
         pragma_check_sessions = 'PRAGMA TABLE_INFO(crawlerSession);'
         self.cursor.execute(pragma_check_sessions)
         if len(self.cursor.fetchall()) != 7:
@@ -488,3 +497,75 @@ class DataBase:
                 print("Exception on list_configs", ex)
                 traceback.print_exc()
                 return []
+
+    def fetch_crawl_cursor(self, crawl_key: str):
+        """Fetch (end_cursor, fetched) saved for a crawl, or None if it has no checkpoint"""
+        with self._db_lock:
+            try:
+                query = "SELECT end_cursor, fetched FROM crawlCursor WHERE crawl_key=?"
+                self.cursor.execute(query, (crawl_key,))
+                return self.cursor.fetchone()
+            except Exception as ex:
+                print(f"Exception on fetch_crawl_cursor({crawl_key})", ex)
+                traceback.print_exc()
+                return None
+
+    def save_crawl_cursor(self, crawl_key: str, end_cursor: str, fetched: int):
+        """Checkpoint the cursor of the next page to fetch"""
+        with self._db_lock:
+            try:
+                query = """INSERT OR REPLACE INTO crawlCursor (crawl_key, end_cursor, fetched, updated_at) VALUES (?, ?, ?, CURRENT_TIMESTAMP)"""
+                self.cursor.execute(query, (crawl_key, end_cursor, fetched))
+                self._sql.commit()
+                return True
+            except Exception as ex:
+                print(f"Exception on save_crawl_cursor({crawl_key})", ex)
+                traceback.print_exc()
+                return False
+
+    def delete_crawl_cursor(self, crawl_key: str):
+        """Forget a crawl's checkpoint once it has finished"""
+        with self._db_lock:
+            try:
+                query = "DELETE FROM crawlCursor WHERE crawl_key=?"
+                self.cursor.execute(query, (crawl_key,))
+                self._sql.commit()
+                return True
+            except Exception as ex:
+                print(f"Exception on delete_crawl_cursor({crawl_key})", ex)
+                traceback.print_exc()
+                return False
+
+    def fetch_selector_stats(self, config: str = None, field: str = None):
+        """Fetch selectorStats rows (config, field, xpath, hits, misses, score, weight, latency_ms, updated), optionally for one config/field"""
+        with self._db_lock:
+            try:
+                query = "SELECT config, field, xpath, hits, misses, score, weight, latency_ms, updated FROM selectorStats"
+                conditions, params = [], []
+                if config:
+                    conditions.append("config=?")
+                    params.append(config)
+                if field:
+                    conditions.append("field=?")
+                    params.append(field)
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+                self.cursor.execute(query + " ORDER BY config, field", params)
+                return self.cursor.fetchall()
+            except Exception as ex:
+                print(f"Exception on fetch_selector_stats({config}, {field})", ex)
+                traceback.print_exc()
+                return []
+
+    def save_selector_stats(self, rows: list):
+        """Upsert selectorStats rows in one transaction"""
+        with self._db_lock:
+            try:
+                query = """INSERT OR REPLACE INTO selectorStats (config, field, xpath, hits, misses, score, weight, latency_ms, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+                self.cursor.executemany(query, rows)
+                self._sql.commit()
+                return True
+            except Exception as ex:
+                print("Exception on save_selector_stats", ex)
+                traceback.print_exc()
+                return False
@@ -7,6 +7,7 @@ from newAgent.src.exceptions.errors import WebDriverCustomError
 from newAgent.src.robot.scraper import Bot
 from newAgent.src.services.config_helper import ConfigHelper
 from newAgent.src.services.schemas import INSTAGRAM_PROFILE_INFO_SCHEMA
+from newAgent.src.services.browser_session import BrowserSession
 from newAgent.src.robot.flatlay import traceback_email_flatlay
 from newAgent.src.data.attributes import Attrs
 from selenium.webdriver.common.by import By
@@ -81,6 +82,19 @@ def get_image_blob(url):
 # Legacy wait_for_full_load removed
 
 
+class _UnsavedCursors:
+    """Crawl-cursor store that keeps nothing, for crawls whose results are not persisted either."""
+
+    def fetch_crawl_cursor(self, crawl_key: str):
+        return None
+
+    def save_crawl_cursor(self, crawl_key: str, end_cursor: str, fetched: int):
+        return True
+
+    def delete_crawl_cursor(self, crawl_key: str):
+        return True
+
+
 class Instagram(Bot):
     base_url = ''
     login_url = ''
@@ -101,6 +115,10 @@ class Instagram(Bot):
     result = None
     collected_user_data = []
     failed_usernames: int = 0
+    # JSON endpoints are called over HTTP with the browser's cookies; False renders them in the browser
+    http_fetch = True
+    api_user_agent = 'Instagram 155.0.0.37.107'
+    _http: Optional[BrowserSession] = None
     
     def execute_action(self, action, saved_item=None, campaign=None, api_client=None):
         """
@@ -262,257 +280,185 @@ class Instagram(Bot):
     # Legacy like_recent_posts and comment_on_recent_posts removed
 
 
-    def get_user_followers(self, username: str) -> list[dict]:
-        per_page: int = 50
-        min_delay: float = Attrs.sleep_config['scroll_min']
-        max_delay: float = Attrs.sleep_config['scroll_max']
-        max_page_errors: int = 5
-
+    def _fetch_json(self, url: str) -> dict:
+        """GET a JSON endpoint as the logged-in user."""
+        self.throttle('api_page')
+        if self.http_fetch:
+            if self._http is None or self._http.driver is not self.driver:
+                if self._http is not None:
+                    self._http.close()
+                self._http = BrowserSession(self.driver, user_agent=self.api_user_agent, proxies=proxies)
+            return self._http.get_json(url)
         base_userAgent = self.driver.execute_script("return navigator.userAgent;")
-
-        self.logger.info(f"Starting get_user_followers for '{username}'")
-
-        try:
-            self.driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": 'Instagram 155.0.0.37.107'})
-            profile_api = f'https://i.instagram.com/api/v1/users/web_profile_info/?username={username}'
-            self.driver.get(profile_api)
-            data = json.loads(self.driver.find_element(By.TAG_NAME, 'pre').text)
-            time.sleep(random.uniform(min_delay, max_delay))
-        except Exception as e:
-            self.logger.error(f"Error parsing profile data for {username}: {e}")
-            return []
-
+        self.driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": self.api_user_agent})
         try:
-            user = data['data']['user']
-        except ValueError:
-            self.logger.error(f"Invalid JSON on profile:\n{data}")
-            raise
-        try:
-            user_id = user['id']
-            self.logger.info(f"Resolved user '{username}' → ID {user_id}")
-
-            followers = []
-            has_next = True
-            end_cursor = None
-            page = 0
-            query_hash = 'c76146de99bb02f6415203be841dd25a'
-
-            while has_next:
-                page += 1
-                vars_payload = {
-                    'id': user_id,
-                    'include_reel': True,
-                    'fetch_mutual': False,
-                    'first': per_page,
-                }
-                if end_cursor:
-                    vars_payload['after'] = end_cursor
-
-                params = {
-                    'query_hash': query_hash,
-                    'variables': json.dumps(vars_payload)
-                }
-
-                attempt = 0
-                while True:
-                    attempt += 1
-                    self.logger.debug(f"Page {page} request attempt #{attempt}")
-                    try:
-                        self.driver.get(f'https://www.instagram.com/graphql/query/?{urllib.parse.urlencode(params)}')
-                        time.sleep(random.uniform(min_delay, max_delay))
-
-                        data = json.loads(self.driver.find_element(By.TAG_NAME, 'pre').text)
-                        if 'data' in data and 'user' in data['data']:
-                            break
-                        elif 'message' in data and data['message'] == 'Rate limit exceeded':
-                            backoff = min_delay * (2 ** attempt) + random.uniform(0, 1)
-                            self.logger.warning(f"Rate limit hit (HTTP 429). Backing off for {backoff:.1f}s")
-                            time.sleep(backoff)
-                        else:
-                            self.logger.error(f"Unexpected error on page {page}: {data}")
-                            if attempt >= max_page_errors:
-                                self.logger.error(f"Giving up on page {page} after {attempt} attempts")
-                                has_next = False
-                                break
-                            backoff = min_delay * attempt + random.uniform(0, 1)
-                            self.logger.warning(f"Retrying page {page} in {backoff:.1f}s")
-                            time.sleep(backoff)
-                    except Exception as e:
-                        self.logger.error(f"Error on request attempt {attempt} for page {page}: {e}")
-                        break
-
-                if 'data' not in data or 'user' not in data['data']:
-                    break
-
-                data = data['data']['user']['edge_followed_by']
-                edges = data.get('edges', [])
-                self.logger.info(f"Page {page} → {len(edges)} followers")
-
-                for edge in edges:
-                    node = edge['node']
-                    now_ms = int(datetime.utcnow().timestamp() * 1000)
-                    followers.append({
-                        "updated_at": now_ms,
-                        "platform": "INSTAGRAM",
-                        "platform_username": node['username'],
-                        "image_url": node['profile_pic_url'],
-                        "url": f"https://www.instagram.com/{node['username']}/",
-                        "full_name": node['full_name'],
-                        "is_verified": node.get('is_verified', False),
-                    })
-
-                page_info = data.get('page_info', {})
-                has_next = page_info.get('has_next_page', False)
-                end_cursor = page_info.get('end_cursor')
-                self.logger.info(
-                    f"After page {page}: total_followers={len(followers)}, "
-                    f"has_next={has_next}, next_cursor={end_cursor}"
-                )
-
-                delay = random.uniform(min_delay, max_delay)
-                self.logger.debug(f"Sleeping {delay:.2f}s before next page")
-                time.sleep(delay)
-                self.logger.info(f"Done: retrieved {len(followers)} followers in {page} pages")
-                return followers
-        except Exception as e:
-            self.logger.error(f"Error on request attempt {attempt} for page {page}: {e}")
-            traceback_email_flatlay(
-                body=f'Instagram.get_user_followers error in getring user followers: {username}\n',
-                image_content=self.driver.get_screenshot_as_png())
-
+            self.driver.get(url)
+            return json.loads(self.driver.find_element(By.TAG_NAME, 'pre').text)
         finally:
             self.driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": base_userAgent})
 
-    def get_user_followings(self, username: str) -> list[dict]:
-        per_page: int = 50
+    # GraphQL query hash and response edge per connection list
+    CONNECTION_QUERIES = {
+        'followers': ('c76146de99bb02f6415203be841dd25a', 'edge_followed_by'),
+        'following': ('d04b0a864b4b54837c0d870b0e77e076', 'edge_follow'),
+    }
+
+    @staticmethod
+    def _connection_profile(node: dict) -> dict:
+        return {
+            "updated_at": int(datetime.utcnow().timestamp() * 1000),
+            "platform": "INSTAGRAM",
+            "platform_username": node['username'],
+            "image_url": node['profile_pic_url'],
+            "url": f"https://www.instagram.com/{node['username']}/",
+            "full_name": node['full_name'],
+            "is_verified": node.get('is_verified', False),
+        }
+
+    def _fetch_connections_page(self, user_id, edge: str, end_cursor: Optional[str], per_page: int,
+                                max_page_errors: int = 5) -> Optional[dict]:
+        """One page of a connection list ({'edges': [...], 'page_info': {...}}), or None after max_page_errors failures."""
+        query_hash, edge_key = self.CONNECTION_QUERIES[edge]
         min_delay: float = Attrs.sleep_config['scroll_min']
         max_delay: float = Attrs.sleep_config['scroll_max']
-        max_page_errors: int = 5
+        vars_payload = {
+            'id': user_id,
+            'include_reel': True,
+            'fetch_mutual': False,
+            'first': per_page,
+        }
+        if end_cursor:
+            vars_payload['after'] = end_cursor
+        params = {
+            'query_hash': query_hash,
+            'variables': json.dumps(vars_payload)
+        }
 
-        base_userAgent = self.driver.execute_script("return navigator.userAgent;")
+        for attempt in range(1, max_page_errors + 1):
+            try:
+                data = self._fetch_json(f'https://www.instagram.com/graphql/query/?{urllib.parse.urlencode(params)}')
+            except Exception as e:
+                self.logger.error(f"Error on request attempt {attempt} for {edge} page after {end_cursor}: {e}")
+                data = {}
+            if 'data' in data and 'user' in data['data']:
+                return data['data']['user'][edge_key]
+            if data.get('message') == 'Rate limit exceeded':
+                backoff = min_delay * (2 ** attempt) + random.uniform(0, 1)
+                self.logger.warning(f"Rate limit hit (HTTP 429). Backing off for {backoff:.1f}s")
+                # Slows every worker on this account; the next request waits in throttle()
+                self.rate_limited('api_page', retry_after=backoff)
+                continue
+            if data:
+                self.logger.error(f"Unexpected response for {edge} page after {end_cursor}: {data}")
+            backoff = min_delay * attempt + random.uniform(min_delay, max_delay)
+            self.logger.warning(f"Retrying in {backoff:.1f}s")
+            time.sleep(backoff)
+        self.logger.error(f"Giving up on {edge} page after {end_cursor} after {max_page_errors} attempts")
+        return None
 
-        self.logger.info(f"Starting get_user_followings for '{username}'")
+    def iter_user_connections(self, username: str, edge: str = 'followers', per_page: int = 50,
+                              store: Optional[Any] = None):
+        """
+        Yield a user's followers or followings one page at a time, as normalized profiles.
+
+        The cursor of the next page is checkpointed in the local database once the caller
+        has finished with a page (i.e. asks for the next one), so a crawl that dies is
+        resumed from the last page it completed instead of from the start. The checkpoint
+        is removed when the list has been walked to the end.
+        """
+        min_delay: float = Attrs.sleep_config['scroll_min']
+        max_delay: float = Attrs.sleep_config['scroll_max']
+        if edge not in self.CONNECTION_QUERIES:
+            raise ValueError(f"Unknown connection list: {edge}")
 
+        self.logger.info(f"Starting {edge} crawl for '{username}'")
         try:
-            self.driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": 'Instagram 155.0.0.37.107'})
             profile_api = f'https://i.instagram.com/api/v1/users/web_profile_info/?username={username}'
-            self.driver.get(profile_api)
+            data = self._fetch_json(profile_api)
+            user_id = data['data']['user']['id']
             time.sleep(random.uniform(min_delay, max_delay))
-            data = json.loads(self.driver.find_element(By.TAG_NAME, 'pre').text)
         except Exception as e:
             self.logger.error(f"Error parsing profile data for {username}: {e}")
-            return []
+            return
+        self.logger.info(f"Resolved user '{username}' → ID {user_id}")
+
+        if store is None:
+            from newAgent.src.database.database import DataBase
+            store = DataBase(self.platform)
+        crawl_key = f"instagram:{edge}:{username}"
+        checkpoint = store.fetch_crawl_cursor(crawl_key)
+        end_cursor, fetched = checkpoint if checkpoint else (None, 0)
+        if end_cursor:
+            self.logger.info(f"Resuming {edge} of '{username}' after {fetched} profiles")
+
+        page = 0
+        while True:
+            page += 1
+            data = self._fetch_connections_page(user_id, edge, end_cursor, per_page)
+            if data is None and end_cursor and page == 1:
+                # Instagram cursors expire; start over rather than fail
+                self.logger.warning(f"Saved cursor for '{username}' {edge} no longer works, starting from the first page")
+                end_cursor, fetched = None, 0
+                data = self._fetch_connections_page(user_id, edge, end_cursor, per_page)
+            if data is None:
+                return
+
+            profiles = [self._connection_profile(e['node']) for e in data.get('edges', [])]
+            fetched += len(profiles)
+            page_info = data.get('page_info', {})
+            has_next = page_info.get('has_next_page', False)
+            next_cursor = page_info.get('end_cursor')
+            self.logger.info(f"Page {page} → {len(profiles)} {edge} (total {fetched}, has_next={has_next})")
+
+            if profiles:
+                yield profiles
+            if not has_next or not next_cursor:
+                store.delete_crawl_cursor(crawl_key)
+                self.logger.info(f"Done: retrieved {fetched} {edge} of '{username}'")
+                return
+            end_cursor = next_cursor
+            store.save_crawl_cursor(crawl_key, end_cursor, fetched)
 
-        try:
-            user = data['data']['user']
-        except ValueError:
-            self.logger.error(f"Invalid JSON on profile:\n{data}")
-            raise
+            delay = random.uniform(min_delay, max_delay)
+            self.logger.debug(f"Sleeping {delay:.2f}s before next page")
+            time.sleep(delay)
 
-        try:
-            user_id = user['id']
-            self.logger.info(f"Resolved user '{username}' → ID {user_id}")
-
-            followings = []
-            has_next = True
-            end_cursor = None
-            page = 0
-            query_hash = 'd04b0a864b4b54837c0d870b0e77e076'
-
-            while has_next:
-                page += 1
-                vars_payload = {
-                    'id': user_id,
-                    'include_reel': True,
-                    'fetch_mutual': False,
-                    'first': per_page,
-                }
-                if end_cursor:
-                    vars_payload['after'] = end_cursor
-
-                params = {
-                    'query_hash': query_hash,
-                    'variables': json.dumps(vars_payload)
-                }
-
-                attempt = 0
-                while attempt < max_page_errors:
-                    attempt += 1
-                    self.logger.debug(f"Page {page} request attempt #{attempt}")
-                    try:
-                        self.driver.get(f'https://www.instagram.com/graphql/query/?{urllib.parse.urlencode(params)}')
-                        time.sleep(random.uniform(min_delay, max_delay))
-
-                        data = json.loads(self.driver.find_element(By.TAG_NAME, 'pre').text)
-                        if 'data' in data and 'user' in data['data']:
-                            break
-                        elif 'message' in data and data['message'] == 'Rate limit exceeded':
-                            backoff = min_delay * (2 ** attempt) + random.uniform(0, 1)
-                            self.logger.warning(f"Rate limit hit (HTTP 429). Backing off for {backoff:.1f}s")
-                            time.sleep(backoff)
-                        else:
-                            self.logger.error(f"Unexpected error on page {page}: {data}")
-                            backoff = min_delay * attempt + random.uniform(0, 1)
-                            self.logger.warning(f"Retrying page {page} in {backoff:.1f}s")
-                            time.sleep(backoff)
-                    except Exception as e:
-                        self.logger.error(f"Error on request attempt {attempt} for page {page}: {e}")
-                        if attempt >= max_page_errors:
-                            self.logger.error(f"Giving up on page {page} after {attempt} attempts")
-                            has_next = False
-                            break
-                        continue
-
-                if 'data' not in data or 'user' not in data['data']:
-                    break
-
-                data = data['data']['user']['edge_follow']
-                edges = data.get('edges', [])
-                self.logger.info(f"Page {page} → {len(edges)} followings")
-
-                for edge in edges:
-                    node = edge['node']
-                    now_ms = int(datetime.utcnow().timestamp() * 1000)
-                    followings.append({
-                        "updated_at": now_ms,
-                        "platform": "INSTAGRAM",
-                        "platform_username": node['username'],
-                        "image_url": node['profile_pic_url'],
-                        "url": f"https://www.instagram.com/{node['username']}/",
-                        "full_name": node['full_name'],
-                        "is_verified": node.get('is_verified', False),
-                    })
-
-                page_info = data.get('page_info', {})
-                has_next = page_info.get('has_next_page', False)
-                end_cursor = page_info.get('end_cursor')
-                self.logger.info(
-                    f"After page {page}: total_followings={len(followings)}, "
-                    f"has_next={has_next}, next_cursor={end_cursor}"
-                )
-
-                delay = random.uniform(min_delay, max_delay)
-                self.logger.debug(f"Sleeping {delay:.2f}s before next page")
-                time.sleep(delay)
-
-            self.logger.info(f"Done: retrieved {len(followings)} followings in {page} pages")
-            return followings
-        except Exception as e:
-            self.logger.error(f"Error on request attempt {attempt} for page {page}: {e}")
-            traceback_email_flatlay(
-                body=f'Instagram.get_user_followers error in getring user followings: {username}\n',
-                image_content=self.driver.get_screenshot_as_png())
+    def save_user_connections(self, username: str, edge: str = 'followers', api_client: Optional[Any] = None,
+                              batch_size: int = 50, store: Optional[Any] = None) -> int:
+        """
+        Crawl a connection list straight into the people API, batch by batch; returns the number saved.
 
-        finally:
-            self.driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": base_userAgent})
+        Each page is saved before the next one is requested, so the checkpoint never moves past
+        profiles that were not saved. A failed save raises, leaving the crawl resumable.
+        """
+        if api_client is None:
+            from newAgent.src.api.APIs import RestAPI
+            api_client = RestAPI
+        saved = 0
+        for profiles in self.iter_user_connections(username, edge, store=store):
+            for i in range(0, len(profiles), batch_size):
+                batch = profiles[i:i + batch_size]
+                response = api_client.create_people(batch)
+                status_code = getattr(response, 'status_code', 200)
+                if status_code >= 400:
+                    raise RuntimeError(f"Saving {edge} of '{username}' failed with HTTP {status_code}")
+                saved += len(batch)
+        return saved
+
+    def get_user_followers(self, username: str) -> list[dict]:
+        # The list only lives in memory, so a rerun must start from the first page
+        return [profile for page in self.iter_user_connections(username, 'followers', store=_UnsavedCursors())
+                for profile in page]
+
+    def get_user_followings(self, username: str) -> list[dict]:
+        return [profile for page in self.iter_user_connections(username, 'following', store=_UnsavedCursors())
+                for profile in page]
 
     def get_user_info(self) -> dict:
         min_delay: float = Attrs.sleep_config['scroll_min']
         max_delay: float = Attrs.sleep_config['scroll_max']
         max_page_errors: int = 5
 
-        base_userAgent = self.driver.execute_script("return navigator.userAgent;")
-
         if not self.username:
              # Try to get username from current URL if it looks like a profile
              curr = self.driver.current_url
@@ -524,14 +470,11 @@ class Instagram(Bot):
 
         self.logger.info(f"Starting get_user_info for '{self.username}'")
 
-        self.driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": 'Instagram 155.0.0.37.107'})
-
         profile_api = f'https://i.instagram.com/api/v1/users/web_profile_info/?username={self.username}'
-        self.driver.get(profile_api)
-        time.sleep(random.uniform(min_delay, max_delay))
 
         try:
-            data = json.loads(self.driver.find_element(By.TAG_NAME, 'pre').text)
+            data = self._fetch_json(profile_api)
+            time.sleep(random.uniform(min_delay, max_delay))
         except Exception as e:
             self.logger.error(f"Error parsing profile data for {self.username}: {e}")
             return {}
@@ -580,9 +523,6 @@ class Instagram(Bot):
             self.full_name = ''
             self.profile_pic = b''
 
-        finally:
-            self.driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": base_userAgent})
-
     def text_snip(s, length=200):
         return (s[:length] + '…') if len(s) > length else s
 
@@ -14,8 +14,8 @@ import requests
 from urllib.request import getproxies
 from urllib.parse import urlparse
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, NoSuchWindowException, \
-    WebDriverException
-from time import sleep
+    WebDriverException, JavascriptException
+from time import sleep, monotonic
 from random import randint as rnd
 import traceback
 import os
@@ -27,6 +27,9 @@ from datetime import datetime
 import subprocess
 from newAgent.src.services.config_manager import ConfigManager
 from newAgent.src.data.attributes import Attrs
+from newAgent.src.services.log_buffer import LogBuffer
+from newAgent.src.services.rate_limiter import get_rate_limiter
+from newAgent.src.services.delay_policy import DelayPolicy
 import random
 
 # Logging setup
@@ -37,12 +40,37 @@ start_time = datetime.now()
 pyLogger.info(f"Script started at {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
 
 
+# Evaluates every candidate XPath in one round trip; the earliest-listed match wins
+RACE_XPATHS_JS = """
+var xpaths = arguments[0], visible = arguments[1], invalid = [];
+for (var i = 0; i < xpaths.length; i++) {
+    var node = null;
+    try {
+        node = document.evaluate(xpaths[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } catch (e) {
+        invalid.push(i);
+        continue;
+    }
+    if (node && node.nodeType === 2) {
+        node = node.ownerElement;  // an attribute XPath (.../@href) matches on its element
+    }
+    if (node && node.nodeType === 1 && (!visible || node.getClientRects().length > 0)) {
+        return {index: i, element: node, invalid: invalid};
+    }
+}
+return {index: -1, element: null, invalid: invalid};
+"""
+
+
 class LogWrapper:
-    """A wrapper class for logging.Logger that supports += operator for string concatenation"""
+    """A wrapper class for logging.Logger that supports += operator for accumulating log messages.
+
+    Accumulated messages live in a bounded LogBuffer, so long runs keep only the most recent lines.
+    """
     
-    def __init__(self, logger):
+    def __init__(self, logger, capacity=5000):
         self._logger = logger
-        self._buffer = ""
+        self._buffer = LogBuffer(capacity)
         self.callback = None
     
     def set_callback(self, callback):
@@ -51,7 +79,7 @@ class LogWrapper:
     def __iadd__(self, message):
         """Support for += operator to accumulate log messages"""
         if isinstance(message, str):
-            self._buffer += message
+            self._buffer.append(message)
             # Log the message immediately for real-time feedback
             if message.strip():  # Only log non-empty messages
                 self._logger.info(message.rstrip('\n'))
@@ -88,15 +116,15 @@ class LogWrapper:
     
     def __str__(self):
         """Return the accumulated buffer as string"""
-        return self._buffer
+        return self._buffer.text()
     
     def clear(self):
         """Clear the accumulated buffer"""
-        self._buffer = ""
+        self._buffer.clear()
     
     def get_buffer(self):
         """Get the current buffer content"""
-        return self._buffer
+        return self._buffer.text()
     
     # Delegate all other logger methods to the wrapped logger
     def __getattr__(self, name):
@@ -192,6 +220,8 @@ class Bot:
     status_results = ValueChangedEvent()  # value should be dict(row: int, text: str, color: str = None | 'green' | 'red')
     messages_limit: int = 0
     row: int = 0
+    _delays: DelayPolicy = None
+    session_account: str = ''  # crawlerSession username of the logged-in account, set by AuthManager
 
     def __init__(self, url, platform: str):
         self._base_url = url
@@ -200,6 +230,33 @@ class Bot:
         self.logger = LogWrapper(logging.getLogger(__name__))
         self.config_manager = ConfigManager(platform=platform)
 
+    @property
+    def delays(self) -> DelayPolicy:
+        """Humanization delays for the current run; ActionExecutor installs the action's profile"""
+        if self._delays is None:
+            self._delays = DelayPolicy()
+        return self._delays
+
+    @delays.setter
+    def delays(self, policy: DelayPolicy):
+        self._delays = policy
+
+    def _rate_key(self):
+        # The logged-in session, not self.username: scrapers overwrite that with the profile they read
+        return (self.name or type(self).__name__).upper(), self.session_account or None
+
+    def throttle(self, operation: str):
+        """Wait until this account may perform operation, per the shared per-account rate limiter"""
+        platform, account = self._rate_key()
+        waited = get_rate_limiter().acquire(platform, account, operation)
+        if waited:
+            self.logger.info(f"Rate limiter held {operation} for {waited:.1f}s")
+
+    def rate_limited(self, operation: str, retry_after: float = None):
+        """Report that the platform pushed back on operation, so every worker on this account slows down"""
+        platform, account = self._rate_key()
+        get_rate_limiter().penalize(platform, account, operation, retry_after=retry_after)
+
     @staticmethod
     def _delete_wdm_cache():
         try:
@@ -238,18 +295,19 @@ class Bot:
         try:
             if self.browser == 'chrome':
                 try:
-                    # Check if Chrome is installed and get version
+                    # Check if Chrome is installed and get version (once per process)
                     pyLogger.info("Checking Chrome installation...")
-                    chrome_version = None
+                    chrome_version = Bot.version_chrome or None
                     try:
-                        if self.platform == 'WINDOWS':
+                        if not chrome_version and self.platform == 'WINDOWS':
                             import winreg
                             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon")
                             chrome_version = winreg.QueryValueEx(key, "version")[0]
-                        elif self.platform == 'MAC':
+                        elif not chrome_version and self.platform == 'MAC':
                             import subprocess
                             result = subprocess.run(['/Applications/Google Chrome.app/Contents/MacOS/Google Chrome', '--version'], capture_output=True, text=True)
                             chrome_version = result.stdout.strip().split()[-1]
+                        Bot.version_chrome = chrome_version or ''
                     except Exception as chrome_err:
                         error_msg = f"Failed to detect Chrome version: {chrome_err}"
                         pyLogger.error(error_msg)
@@ -270,6 +328,9 @@ class Bot:
                         options.add_argument(f'--user-agent={self.user_agent}')
                     if self.headless and not login_required:
                         options.add_argument('--headless=new')
+                    if self.profile_path:
+                        # Persistent profile: cookies and cache survive browser restarts
+                        options.add_argument(f'--user-data-dir={self.profile_path}')
                     
                     # Performance optimizations for both headless and non-headless modes
                     # GPU and hardware acceleration (works in both modes)
@@ -472,32 +533,22 @@ class Bot:
 
     @again
     def find_element(self, element, timeout=20, rand_off=True, ret_locator=False, poll_frequency: float = 0.5):
-        if rand_off:
-            sleep(random.uniform(Attrs.sleep_config['typing_min'], Attrs.sleep_config['typing_max']))
-        else:
-            sleep(random.uniform(Attrs.sleep_config['action_min'], Attrs.sleep_config['action_max']))
-        ret = WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency).until(
-            EC.presence_of_element_located((By.XPATH, element)))
-        if rand_off:
-            sleep(random.uniform(Attrs.sleep_config['typing_min'], Attrs.sleep_config['typing_max']))
-        else:
-            sleep(random.uniform(Attrs.sleep_config['action_min'], Attrs.sleep_config['action_max']))
+        self.delays.delay('lookup' if rand_off else 'lookup_slow')
+        with self.delays.waiting('element'):
+            ret = WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency).until(
+                EC.presence_of_element_located((By.XPATH, element)))
+        self.delays.delay('lookup' if rand_off else 'lookup_slow')
         if ret_locator:
             return ret, element
         return ret
 
     @again
     def find_elements(self, element, timeout=20, rand_off=True, ret_locator=False, poll_frequency: float = 0.5):
-        if rand_off:
-            sleep(random.uniform(Attrs.sleep_config['typing_min'], Attrs.sleep_config['typing_max']))
-        else:
-            sleep(random.uniform(Attrs.sleep_config['action_min'], Attrs.sleep_config['action_max']))
-        ret = WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency).until(
-            EC.presence_of_all_elements_located((By.XPATH, element)))
-        if rand_off:
-            sleep(random.uniform(Attrs.sleep_config['typing_min'], Attrs.sleep_config['typing_max']))
-        else:
-            sleep(random.uniform(Attrs.sleep_config['action_min'], Attrs.sleep_config['action_max']))
+        self.delays.delay('lookup' if rand_off else 'lookup_slow')
+        with self.delays.waiting('element'):
+            ret = WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency).until(
+                EC.presence_of_all_elements_located((By.XPATH, element)))
+        self.delays.delay('lookup' if rand_off else 'lookup_slow')
         if ret_locator:
             return ret, element
         return ret
@@ -505,20 +556,41 @@ class Bot:
     @again
     def find_element_clickable(self, element, timeout=20, rand_off=True, ret_locator=False,
                                poll_frequency: float = 0.5):
-        if rand_off:
-            sleep(random.uniform(Attrs.sleep_config['typing_min'], Attrs.sleep_config['typing_max']))
-        else:
-            sleep(random.uniform(Attrs.sleep_config['action_min'], Attrs.sleep_config['action_max']))
-        ret = WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency).until(
-            EC.element_to_be_clickable((By.XPATH, element))).click()
-        if rand_off:
-            sleep(random.uniform(Attrs.sleep_config['typing_min'], Attrs.sleep_config['typing_max']))
-        else:
-            sleep(random.uniform(Attrs.sleep_config['action_min'], Attrs.sleep_config['action_max']))
+        self.delays.delay('lookup' if rand_off else 'lookup_slow')
+        with self.delays.waiting('element'):
+            ret = WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency).until(
+                EC.element_to_be_clickable((By.XPATH, element))).click()
+        self.delays.delay('lookup' if rand_off else 'lookup_slow')
         if ret_locator:
             return ret, element
         return ret
 
+    def race_xpaths(self, xpaths, timeout=20, poll_frequency: float = 0.25, visible=False):
+        """Wait for whichever candidate XPath matches first, polling all of them in a single execute_script per tick.
+
+        Returns (element, index of the winning XPath), or (None, None) once timeout runs out. When several
+        candidates match on the same tick the earliest in the list wins.
+        """
+        xpaths = [xpaths] if isinstance(xpaths, str) else list(xpaths)
+        if not xpaths:
+            return None, None
+        deadline = monotonic() + timeout
+        reported = set()
+        with self.delays.waiting('element'):
+            while True:
+                try:
+                    found = self.driver.execute_script(RACE_XPATHS_JS, xpaths, visible) or {}
+                except JavascriptException:
+                    found = {}  # the document was replaced mid-evaluation
+                for i in set(found.get('invalid') or []) - reported:
+                    reported.add(i)
+                    pyLogger.warning(f"Invalid XPath skipped: {xpaths[i]}")
+                if found.get('element') is not None:
+                    return found['element'], found['index']
+                if monotonic() >= deadline:
+                    return None, None
+                sleep(poll_frequency)
+
     def try_xpath_single(self, xpath_list, base_xpath=None, attribute=None, timeout=5, debug_on_failure=False):
         """
         Try to find an element using a list of XPath selectors.
@@ -528,7 +600,7 @@ class Bot:
             xpath_list: List of XPath selectors to try
             base_xpath: Base XPath to prepend to each selector (optional)
             attribute: Attribute to extract instead of text (optional)
-            timeout: Timeout for each XPath attempt
+            timeout: Overall timeout; all selectors are raced together (see race_xpaths)
             debug_on_failure: Whether to run debug analysis if all XPaths fail
             
         Returns:
@@ -537,21 +609,15 @@ class Bot:
         if isinstance(xpath_list, str):
             xpath_list = [xpath_list]
         
-        failed_xpaths = []
-        
-        for i, xpath in enumerate(xpath_list):
+        full_xpaths = [f"{base_xpath}{xpath}" if base_xpath else xpath for xpath in xpath_list]
+        element, index = self.race_xpaths(full_xpaths, timeout=timeout)
+
+        if element is not None:
+            # Log successful XPath if it wasn't the first one
+            if index > 0:
+                pyLogger.info(f"✅ XPath found on alternative {index+1}/{len(xpath_list)}: {full_xpaths[index]}")
+
             try:
-                # Combine base_xpath with current xpath if provided
-                full_xpath = f"{base_xpath}{xpath}" if base_xpath else xpath
-                
-                element = WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located((By.XPATH, full_xpath))
-                )
-                
-                # Log successful XPath if it wasn't the first one
-                if i > 0:
-                    pyLogger.info(f"✅ XPath found on attempt {i+1}/{len(xpath_list)}: {full_xpath}")
-                
                 if attribute:
                     result = element.get_attribute(attribute)
                     if result is None:
@@ -568,26 +634,13 @@ class Bot:
                     else:
                         pyLogger.debug(f"📄 Extracted text: {len(result)} chars")
                     return result
-                    
-            except (NoSuchElementException, TimeoutException) as e:
-                full_xpath = f"{base_xpath}{xpath}" if base_xpath else xpath
-                failed_xpaths.append({
-                    'xpath': full_xpath,
-                    'error': type(e).__name__,
-                    'attempt': i + 1
-                })
-                pyLogger.debug(f"❌ XPath attempt {i+1}/{len(xpath_list)} failed ({type(e).__name__}): {full_xpath}")
-                continue
             except Exception as e:
-                full_xpath = f"{base_xpath}{xpath}" if base_xpath else xpath
-                failed_xpaths.append({
-                    'xpath': full_xpath,
-                    'error': f"{type(e).__name__}: {str(e)}",
-                    'attempt': i + 1
-                })
-                pyLogger.warning(f"⚠️ XPath attempt {i+1}/{len(xpath_list)} failed with unexpected error: {full_xpath} - {type(e).__name__}: {str(e)}")
-                continue
-        
+                pyLogger.warning(f"⚠️ Reading {full_xpaths[index]} failed: {type(e).__name__}: {str(e)}")
+                return None
+
+        failed_xpaths = [{'xpath': xpath, 'error': 'TimeoutException', 'attempt': i + 1}
+                         for i, xpath in enumerate(full_xpaths)]
+
         # Log summary of all failed attempts
         if failed_xpaths:
             pyLogger.warning(f"🔍 All {len(failed_xpaths)} XPath attempts failed:")
@@ -765,26 +818,26 @@ class Bot:
         try:
             for char in text:
                 element.send_keys(char)
-                sleep(random.uniform(Attrs.sleep_config['typing_min'], Attrs.sleep_config['action_min']))
+                self.delays.delay('keystroke')
 
                 # Occasionally make a mistake
                 if random.random() < mistake_probability:
                     # Type a random wrong character
                     wrong_char = random.choice('abcdefghijklmnopqrstuvwxyz')
                     element.send_keys(wrong_char)
-                    sleep(random.uniform(Attrs.sleep_config['typing_min'] / 10, Attrs.sleep_config['typing_min']))
+                    self.delays.delay('typo')
 
                     # Backspace to correct it
                     backspaces = random.randint(1, 3)
                     for _ in range(backspaces):
                         element.send_keys(Keys.BACKSPACE)
-                        sleep(random.uniform(Attrs.sleep_config['typing_min'] / 10, Attrs.sleep_config['typing_min']))
+                        self.delays.delay('typo')
 
                     # Retype the correct character
                     element.send_keys(char)
-                    sleep(random.uniform(Attrs.sleep_config['typing_min'] / 10, Attrs.sleep_config['typing_min']))
+                    self.delays.delay('typo')
 
-            sleep(random.uniform(Attrs.sleep_config['action_max'], Attrs.sleep_config['page_load']))
+            self.delays.delay('after_typing')
         except Exception as ex:
             pyLogger.error(f"write_like_human failed: {type(ex).__name__}")
             self.logger += f'Write like human failed {ex}'
@@ -874,6 +927,17 @@ class Bot:
             raise OSError(f"The media size is too small")
         return temp_file_path
 
+    def quit(self):
+        """Close the browser, keeping the session state."""
+        try:
+            if self.driver:
+                self.driver.quit()
+        except Exception as ex:
+            print('Exception at Bot.quit()', ex)
+        finally:
+            self.driver = None
+            self.isLoggedIn = False
+
     def logout(self):
         try:
             self.isLoggedIn = False
@@ -9,6 +9,7 @@ from datetime import datetime, timezone
 from newAgent.src.data.attributes import Attrs
 from newAgent.src.robot.flatlay import traceback_email_flatlay
 from newAgent.src.robot.scraper import LogWrapper
+from newAgent.src.services.rate_limiter import get_rate_limiter
 
 from telethon import TelegramClient
 from telethon.errors import (
@@ -84,6 +85,10 @@ class Telegram:
         if log_callback:
             self.logger.set_callback(log_callback)
 
+    def _rate_key(self):
+        # The Telethon session is the logged-in account; self.username is unknown until get_me()
+        return self.name.upper(), self.session_name
+
     @retry
     def upload_image(self, blob):
         """uploading those profile images that will be expire"""
@@ -259,6 +264,7 @@ class Telegram:
 
         except FloodWaitError as e:
             self.logger.warning(f"Hit rate limit. Waiting for {e.seconds} seconds")
+            await get_rate_limiter().penalize_async(*self._rate_key(), 'api_page', retry_after=e.seconds)
             await asyncio.sleep(e.seconds)
 
         except Exception as e:
@@ -276,6 +282,7 @@ class Telegram:
             int: Telegram ID of the user, group, or channel, if available.
         """
         try:
+            await get_rate_limiter().acquire_async(*self._rate_key(), 'api_page')
             # Use Telethon's get_entity method to fetch the entity from identifier
             entity = await self.client.get_entity(identifier)
 
@@ -288,8 +295,9 @@ class Telegram:
 
         except FloodWaitError as e:
             self.logger.warning(f"Hit rate limit. Waiting for {e.seconds} seconds before retrying.")
-            await asyncio.sleep(e.seconds)
-            return await self.get_telegram_id(identifier)  # Retry after waiting
+            # The retry waits in the rate limiter, which also holds back other lookups on this account
+            await get_rate_limiter().penalize_async(*self._rate_key(), 'api_page', retry_after=e.seconds)
+            return await self.get_telegram_id(identifier)
 
         except Exception as e:
             self.logger.error(f"Error retrieving Telegram ID for '{identifier}': {str(e)}")
@@ -312,13 +320,15 @@ class Telegram:
                 self.logger.warning('telegram.send_message Influencer is None')
                 self.function_result = f"Can't send message to {influencer} because his/her username | phone is None"
                 return False
+            await get_rate_limiter().acquire_async(*self._rate_key(), 'message')
             await self.client.send_message(influencer, message)
             self.logger.info(f"Message sent to user ID {influencer}")
             self.function_result = f"Message has been sent to {influencer}"
             return True
         except FloodWaitError as e:
             self.logger.warning(f"Rate limit exceeded. Waiting for {e.seconds} seconds.")
-            await asyncio.sleep(e.seconds)
+            # The next send waits out the flood wait in the rate limiter
+            await get_rate_limiter().penalize_async(*self._rate_key(), 'message', retry_after=e.seconds)
         except Exception as e:
             if 'reply_to_msg_id' in str(e):
                 self.function_result = f"Message has been sent to {influencer}"
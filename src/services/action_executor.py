@@ -3,8 +3,8 @@ Action executor engine.
 Executes action definitions from JSON files.
 """
 import logging
-import time
 import json
+import time
 import traceback
 import re
 import os
@@ -14,7 +14,7 @@ from typing import Dict, Any, Optional, List, Callable
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 
 from newAgent.src.services.action_loader import ActionLoader, get_action_loader
 from newAgent.src.services.action_variables import ActionVariableResolver, create_resolver
@@ -22,7 +22,10 @@ from newAgent.src.services.config_manager import ConfigManager
 from newAgent.src.services.config_helper import ConfigHelper
 from newAgent.src.services.action_error_handler import ActionErrorHandler
 from newAgent.src.services.file_storage import FileStorage
-from newAgent.src.data.attributes import Attrs
+from newAgent.src.services.resource_policy import ResourcePolicy, ResourceStats
+from newAgent.src.services.delay_policy import DelayPolicy, profile_for
+from newAgent.src.services.selector_stats import SelectorStats
+from newAgent.src.services.element_cache import ElementCache
 from newAgent.src.robot.scraper import Bot
 
 logger = logging.getLogger(__name__)
@@ -60,7 +63,7 @@ class ActionExecutor:
         
         # Execution context
         self.context: Dict[str, Any] = {
-            'elements': {},  # Store found elements by step ID
+            'elements': ElementCache(lambda: self.bot.driver),  # Found elements by step ID, for the current page only
             'data': {},  # Store extracted data
             'variables': {
                 'configContext': None  # Initialize config context
@@ -86,6 +89,21 @@ class ActionExecutor:
             logger.error(f"Could not load action definition for {platform}/{action_type}")
             logger.error(f"Available actions: {self.action_loader.list_actions(platform)}")
             raise ValueError(f"Could not load action definition for {platform}/{action_type}")
+
+        # Resources the action's pages may skip (metadata.resourcePolicy) and what the pages cost
+        self.resource_policy = ResourcePolicy.from_metadata(self.action_def.get('metadata'))
+        self.resource_stats = ResourceStats()
+        # Which alternative XPaths match, used to try the currently working ones first
+        self.selector_stats = SelectorStats(self.config_manager.db)
+
+        # Humanization delays: the action's metadata.delayProfile, else the account's or platform's setting
+        spec = profile_for(self.action_def.get('metadata'), platform, getattr(bot, 'session_account', '') or None,
+                           self.config_manager.db)
+        try:
+            self.delays = DelayPolicy.from_spec(spec)
+        except ValueError as e:
+            logger.warning(f"{e}, using the normal delay profile")
+            self.delays = DelayPolicy()
     
     def execute(self) -> Dict[str, Any]:
         """
@@ -106,6 +124,9 @@ class ActionExecutor:
         logger.info(f"Steps count: {len(self.action_def.get('steps', []))}")
         logger.info(f"Loops count: {len(self.action_def.get('loops', []))}")
         
+        policy_applied = self.resource_policy.apply(self.bot.driver)
+        self.delays.reset()
+        self.bot.delays = self.delays
         try:
             # First, execute initial steps (those not referenced in loops)
             # Then execute loops if defined
@@ -159,6 +180,9 @@ class ActionExecutor:
                     'data': self.context.get('data', {}),
                     'variables': self.context.get('variables', {})
                 }
+                result['resourceStats'] = self.resource_stats.as_dict()
+                result['delayReport'] = self.delays.report()
+                result['elementCache'] = dict(self.context['elements'].stats)
                 
                 logger.info(f"Aggregated {len(extracted_items)} extracted items from context")
                 return result
@@ -183,6 +207,9 @@ class ActionExecutor:
                     'data': self.context.get('data', {}),
                     'variables': self.context.get('variables', {})
                 }
+                result['resourceStats'] = self.resource_stats.as_dict()
+                result['delayReport'] = self.delays.report()
+                result['elementCache'] = dict(self.context['elements'].stats)
                 
                 logger.info(f"Aggregated {len(extracted_items)} extracted items from context")
                 return result
@@ -195,6 +222,10 @@ class ActionExecutor:
             import traceback
             logger.error(f"Full traceback:\n{traceback.format_exc()}")
             return {'success': False, 'error': str(e)}
+        finally:
+            if policy_applied:
+                self.resource_policy.clear(self.bot.driver)
+            logger.info(self.delays.summary())
     
     def _execute_loops(self) -> Dict[str, Any]:
         """Execute action loops."""
@@ -469,6 +500,11 @@ class ActionExecutor:
             logger.error(f"Available handlers: {list(handlers.keys())}")
             return {'success': False, 'error': f'Unknown step type: {step_type}'}
         
+        # Draw from the account's shared budget (services/rate_limiter.py) before acting
+        operation = step_def.get('rateLimit') or ('navigate' if step_type in ('navigate', 'refresh') else None)
+        if operation:
+            self.bot.throttle(operation)
+        
         logger.debug(f"Calling handler for {step_type}...")
         result = handler(step_def)
         logger.debug(f"Handler returned: {result}")
@@ -572,7 +608,9 @@ class ActionExecutor:
         
         try:
             logger.info(f"Navigating to: {url}")
-            self.bot.driver.get(url)
+            self.context['elements'].invalidate()
+            with self.delays.waiting('navigate'):
+                self.bot.driver.get(url)
             self.bot.driver.implicitly_wait(4)
             
             # Update current_url in resolver and context
@@ -586,8 +624,11 @@ class ActionExecutor:
             
             if wait_for == 'page_load':
                 # Wait for page to load
-                time.sleep(Attrs.sleep_config.get('page_load', 3))
+                self.delays.delay('page_load')
             
+            page = self.resource_stats.record(self.bot.driver)
+            if page:
+                logger.info(f"Page loaded in {page.get('loadMs')} ms, {page.get('bytes', 0) // 1024} KB transferred")
             return {'success': True}
         except Exception as e:
             logger.error(f"Navigation error: {e}")
@@ -600,15 +641,16 @@ class ActionExecutor:
         
         try:
             if wait_for == 'time':
-                time.sleep(duration)
+                self.delays.pause('wait_step', duration)
             elif wait_for == 'element_visible':
                 element_ref = step_def.get('elementRef')
                 timeout = step_def.get('timeout', 10)
                 element = self._get_element(element_ref)
                 if element:
-                    WebDriverWait(self.bot.driver, timeout).until(
-                        EC.visibility_of(element)
-                    )
+                    with self.delays.waiting('element'):
+                        WebDriverWait(self.bot.driver, timeout).until(
+                            EC.visibility_of(element)
+                        )
             
             return {'success': True}
         except Exception as e:
@@ -617,6 +659,7 @@ class ActionExecutor:
     def _step_refresh(self, step_def: Dict[str, Any]) -> Dict[str, Any]:
         """Refresh page."""
         try:
+            self.context['elements'].invalidate()
             self.bot.driver.refresh()
             self.bot.driver.implicitly_wait(4)
             return {'success': True}
@@ -652,6 +695,8 @@ class ActionExecutor:
         
         # Try alternatives if main XPath fails
         xpaths_to_try = [xpath] if xpath else []
+        if config_key and config:
+            xpaths_to_try.extend(ConfigHelper.get_alternatives(config, config_key))
         if alternatives:
             # Resolve alternative config keys or use as raw XPaths
             for alt_key in alternatives:
@@ -665,24 +710,33 @@ class ActionExecutor:
                 # If no config or not a config key, use as raw XPath
                 xpaths_to_try.append(alt_key)
         
-        variable_name = step_def.get('variable_name')
-        
-        # Try each XPath
+        # Race every candidate (flattening legacy XPath lists) under one overall timeout
+        candidates = []
         for xpath_to_try in xpaths_to_try:
-            if not xpath_to_try:
-                continue
-            
+            if xpath_to_try:
+                candidates.extend([xpath_to_try] if isinstance(xpath_to_try, str) else xpath_to_try)
+
+        if candidates:
+            # Currently working selectors first, so they also win ties
+            scope, field = self._selector_scope(), config_key or step_def.get('id', 'find_element')
+            candidates = self.selector_stats.order(scope, field, list(dict.fromkeys(candidates)))
             try:
-                # Convert to list format for legacy compatibility
-                xpath_list = [xpath_to_try] if isinstance(xpath_to_try, str) else xpath_to_try
-                element = self.bot.find_element(xpath_list, timeout=timeout)
-                
-                if element:
-                    if variable_name:
-                        self.context['variables'][variable_name] = element
-                    return {'success': True, 'element': element}
-            except Exception:
-                continue
+                self.delays.delay('lookup')
+                started = time.monotonic()
+                element, index = self.bot.race_xpaths(candidates, timeout=timeout)
+                self.selector_stats.record_race(scope, field, candidates, index,
+                                                (time.monotonic() - started) * 1000)
+            except Exception as e:
+                logger.warning(f"Finding element failed: {e}")
+                element, index = None, None
+
+            if element is not None:
+                if index > 0:
+                    logger.info(f"Alternative {index + 1}/{len(candidates)} matched: {candidates[index]}")
+                self.delays.delay('lookup')
+                if variable_name:
+                    self.context['variables'][variable_name] = element
+                return {'success': True, 'element': element, 'xpath': candidates[index]}
         
         # If element not found, still initialize variable to None if it's a variable_name
         if variable_name:
@@ -700,16 +754,19 @@ class ActionExecutor:
         if not element:
             return {'success': False, 'error': f'Element not found: {element_ref}'}
         
+        def click(target):
+            self.delays.delay('lookup')
+            with self.delays.waiting('element'):
+                target = WebDriverWait(self.bot.driver, timeout).until(EC.element_to_be_clickable(target))
+            target.click()
+
         try:
-            # Use bot's click method if available, otherwise direct click
-            if hasattr(self.bot, 'find_element_clickable'):
-                self.bot.find_element_clickable(element_ref, timeout=timeout)
-            else:
-                element.click()
+            # Click the stored handle once clickable instead of finding the element again
+            self._use_element(element_ref, element, click)
             
             # Wait for condition if specified
             if wait_for:
-                time.sleep(Attrs.sleep_config['action_min'])
+                self.delays.delay('after_click')
             
             return {'success': True}
         except Exception as e:
@@ -737,11 +794,14 @@ class ActionExecutor:
             return {'success': False, 'error': f'Element not found: {element_ref}'}
         
         try:
-            if human_like and hasattr(self.bot, 'write_like_human'):
-                self.bot.write_like_human(element, text)
-            else:
-                element.clear()
-                element.send_keys(text)
+            def type_text(target):
+                if human_like and hasattr(self.bot, 'write_like_human'):
+                    self.bot.write_like_human(target, text)
+                else:
+                    target.clear()
+                    target.send_keys(text)
+
+            self._use_element(element_ref, element, type_text)
             
             return {'success': True}
         except Exception as e:
@@ -762,7 +822,7 @@ class ActionExecutor:
                     self.bot.driver.execute_script("window.scrollTo(0, 0);")
                 else:
                     self.bot.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(Attrs.sleep_config['action_min'])
+                self.delays.delay('after_scroll')
                 return {'success': True}
             else:
                 # Scroll to element (original behavior)
@@ -770,8 +830,9 @@ class ActionExecutor:
                 if not element:
                     return {'success': False, 'error': f'Element not found: {element_ref}'}
                 
-                self.bot.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                time.sleep(Attrs.sleep_config['action_min'])
+                self._use_element(element_ref, element,
+                                  lambda target: self.bot.driver.execute_script("arguments[0].scrollIntoView(true);", target))
+                self.delays.delay('after_scroll')
                 return {'success': True}
         except Exception as e:
             return {'success': False, 'error': str(e)}
@@ -786,8 +847,9 @@ class ActionExecutor:
         
         try:
             from selenium.webdriver.common.action_chains import ActionChains
-            ActionChains(self.bot.driver).move_to_element(element).perform()
-            time.sleep(Attrs.sleep_config['action_min'])
+            self._use_element(element_ref, element,
+                              lambda target: ActionChains(self.bot.driver).move_to_element(target).perform())
+            self.delays.delay('after_hover')
             return {'success': True}
         except Exception as e:
             return {'success': False, 'error': str(e)}
@@ -1083,18 +1145,26 @@ class ActionExecutor:
             # Try alternatives if config-based xpath didn't work
             if not xpath and alternatives:
                 logger.info(f"Trying {len(alternatives)} alternative XPaths")
-                for alt_xpath in alternatives:
+                scope, field = self._selector_scope(), config_key or step_id
+                tried = {}
+                latency_ms = None
+                for alt_xpath in self.selector_stats.order(scope, field, alternatives):
                     try:
                         print(f"🔍 Trying alternative XPath: {alt_xpath}")
+                        started = time.monotonic()
                         elements = self.bot.driver.find_elements(By.XPATH, alt_xpath)
+                        tried[alt_xpath] = bool(elements)
                         if elements:
+                            latency_ms = (time.monotonic() - started) * 1000
                             xpath = alt_xpath
                             logger.info(f"Alternative XPath worked: {alt_xpath}, found {len(elements)} elements")
                             print(f"✅ Alternative XPath successful! Found {len(elements)} elements")
                             break
                     except Exception as e:
+                        tried[alt_xpath] = False
                         logger.debug(f"Alternative XPath {alt_xpath} failed: {e}")
                         continue
+                self.selector_stats.record(scope, field, tried, latency_ms)
 
             if not xpath and not elements:
                 return {'success': False, 'error': 'No xpath or configKey provided or alternatives failed'}
@@ -1511,18 +1581,31 @@ class ActionExecutor:
     
     def _get_element(self, element_ref: str):
         """Get element from context or find it."""
-        # Check if element is in context
-        if element_ref in self.context['elements']:
-            return self.context['elements'][element_ref]
+        # Reuse the handle while it still belongs to the current page
+        element = self.context['elements'].get(element_ref)
+        if element is not None:
+            return element
         
         # Try to find step that created this element
         for step in self.action_def.get('steps', []):
             if step.get('id') == element_ref:
                 result = self._step_find_element(step)
                 if result.get('success'):
+                    self.context['elements'][element_ref] = result.get('element')
                     return result.get('element')
         
         return None
+
+    def _use_element(self, element_ref: str, element, action: Callable):
+        """Run action(element); if the handle went stale anyway, find the element again once and retry."""
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            self.context['elements'].discard(element_ref)
+            element = self._get_element(element_ref)
+            if element is None:
+                raise
+            return action(element)
     
     def _get_action_name_for_config(self) -> str:
         """Get action name for config manager (DEPRECATED - use _get_config_params)."""
@@ -1535,6 +1618,12 @@ class ActionExecutor:
         }
         return mapping.get(action_type, action_type)
 
+    def _selector_scope(self) -> str:
+        """Name selector statistics are kept under: the config's base name, e.g. INSTAGRAM_POST_PAGE."""
+        platform = getattr(self.action, 'source', '').upper()
+        config_context = self.context.get('variables', {}).get('configContext')
+        return f"{platform}_{(config_context or getattr(self.action, 'type', '')).upper()}"
+
     def _get_config_params(self) -> tuple[str, Optional[str], Dict]:
         """
         Get config parameters based on current execution context.
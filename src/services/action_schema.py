@@ -47,7 +47,50 @@ ACTION_SCHEMA = {
             "properties": {
                 "requiresAuth": {"type": "boolean"},
                 "supportsPagination": {"type": "boolean"},
-                "supportsRetry": {"type": "boolean"}
+                "supportsRetry": {"type": "boolean"},
+                "resourcePolicy": {
+                    "oneOf": [
+                        {"type": "string", "enum": ["none", "light", "extraction"]},
+                        {
+                            "type": "object",
+                            "properties": {
+                                "profile": {"type": "string", "enum": ["none", "light", "extraction"]},
+                                "block": {"type": "array", "items": {"type": "string", "enum": ["images", "media", "fonts", "analytics"]}},
+                                "allow": {"type": "array", "items": {"type": "string", "enum": ["images", "media", "fonts", "analytics"]}},
+                                "urls": {"type": "array", "items": {"type": "string"}}
+                            }
+                        }
+                    ]
+                },
+                "delayProfile": {
+                    "oneOf": [
+                        {"type": "string", "enum": ["stealth", "normal", "batch"]},
+                        {
+                            "type": "object",
+                            "properties": {
+                                "profile": {"type": "string", "enum": ["stealth", "normal", "batch"]},
+                                "overrides": {
+                                    "type": "object",
+                                    "propertyNames": {
+                                        "enum": ["lookup", "lookup_slow", "keystroke", "typo", "after_typing",
+                                                 "after_click", "after_scroll", "after_hover", "page_load"]
+                                    },
+                                    "additionalProperties": {
+                                        "oneOf": [
+                                            {"type": "number", "minimum": 0},
+                                            {
+                                                "type": "array",
+                                                "items": {"type": "number", "minimum": 0},
+                                                "minItems": 2,
+                                                "maxItems": 2
+                                            }
+                                        ]
+                                    }
+                                }
+                            }
+                        }
+                    ]
+                }
             }
         },
         "inputs": {
@@ -117,6 +160,7 @@ ACTION_SCHEMA = {
                 "waitFor": {"type": "string"},
                 "timeout": {"type": "number"},
                 "humanLike": {"type": "boolean"},
+                "rateLimit": {"type": "string", "enum": ["navigate", "api_page", "message", "engage"]},
                 "onError": {"$ref": "#/definitions/errorHandler"},
                 "onSuccess": {"$ref": "#/definitions/successHandler"},
                 "condition": {"type": "string"},
@@ -0,0 +1,100 @@
+"""
+HTTP client that rides on a logged-in browser session.
+
+JSON endpoints (Instagram's web_profile_info and GraphQL queries) do not need a page to be
+rendered. BrowserSession copies the driver's cookies into a pooled requests.Session and
+calls them directly, keeping both cookie jars in step: cookies the server rotates are
+written back to the browser, and on an auth failure the jar is reloaded from the browser,
+which may have been refreshed in the meantime.
+"""
+import logging
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Body returned for HTTP 429, in the shape the page loops already check for
+RATE_LIMITED = {'message': 'Rate limit exceeded', 'status': 'fail'}
+
+
+class BrowserSession:
+    """A requests.Session carrying the driver's cookies, for JSON endpoints of the site the driver is logged in to."""
+
+    def __init__(self, driver, user_agent: Optional[str] = None, headers: Optional[Dict[str, str]] = None,
+                 proxies: Optional[Dict[str, str]] = None, timeout: float = 20, pool_size: int = 4):
+        self.driver = driver
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': user_agent or driver.execute_script("return navigator.userAgent;"),
+            'Accept': 'application/json',
+        })
+        if headers:
+            self.session.headers.update(headers)
+        if proxies and any(proxies.values()):
+            self.session.proxies.update({k: v for k, v in proxies.items() if v})
+        self.refreshes = 0
+        self.sync_from_driver()
+
+    def _driver_cookies(self):
+        try:
+            # Every domain's cookies, not only those of the page the driver is on
+            return self.driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+        except Exception:
+            return self.driver.get_cookies()
+
+    def sync_from_driver(self):
+        """Replace the session's cookies with the browser's current ones."""
+        self.session.cookies.clear()
+        for cookie in self._driver_cookies():
+            self.session.cookies.set(cookie['name'], cookie['value'],
+                                     domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+        csrf = self.session.cookies.get('csrftoken')
+        if csrf:
+            self.session.headers['X-CSRFToken'] = csrf
+
+    def _sync_to_driver(self, response):
+        """Copy cookies the server set on this response into the browser so both stay logged in."""
+        for cookie in response.cookies:
+            try:
+                self.driver.execute_cdp_cmd('Network.setCookie', {
+                    'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain,
+                    'path': cookie.path or '/', 'secure': bool(cookie.secure),
+                })
+            except Exception as e:
+                logger.debug(f"Could not copy cookie {cookie.name} to the browser: {e}")
+        if response.cookies.get('csrftoken'):
+            self.session.headers['X-CSRFToken'] = response.cookies.get('csrftoken')
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        response = self.session.get(url, params=params, timeout=self.timeout, allow_redirects=False)
+        if response.status_code in (301, 302, 401, 403):
+            # Sent to the login page: the browser may hold newer cookies than we copied
+            logger.info(f"HTTP {response.status_code} from {url}, reloading cookies from the browser")
+            self.sync_from_driver()
+            self.refreshes += 1
+            response = self.session.get(url, params=params, timeout=self.timeout, allow_redirects=False)
+        if response.cookies:
+            self._sync_to_driver(response)
+        return response
+
+    def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET and decode JSON; HTTP 429 comes back as RATE_LIMITED so callers back off as before."""
+        response = self.get(url, params)
+        if response.status_code == 429:
+            return dict(RATE_LIMITED)
+        if response.status_code in (301, 302):
+            raise requests.HTTPError(f"Redirected to {response.headers.get('Location')}: not logged in", response=response)
+        try:
+            return response.json()
+        except ValueError:
+            response.raise_for_status()
+            raise
+
+    def close(self):
+        self.session.close()
@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 class ConfigHelper:
     @staticmethod
@@ -24,6 +24,32 @@ class ConfigHelper:
         print(f"DEBUG ConfigHelper: Found XPath for '{field_name}': {result}")
         return result
 
+    @staticmethod
+    def get_alternatives(config: Dict, field_name: str) -> List[str]:
+        """
+        Return the fallback XPaths listed under the field's 'alternatives', in file order.
+        """
+        if not config:
+            return []
+        if 'config' in config:
+            root = config['config'].get('fields', config['config'])
+        elif 'fields' in config:
+            root = config['fields']
+        else:
+            root = config
+        return ConfigHelper._find_alternatives_recursive(root, field_name)
+
+    @staticmethod
+    def _find_alternatives_recursive(node: Dict, target_name: str) -> List[str]:
+        if node.get('name') == target_name and node.get('alternatives'):
+            return list(node['alternatives'])
+        for child in node.get('data') or []:
+            if isinstance(child, dict):
+                result = ConfigHelper._find_alternatives_recursive(child, target_name)
+                if result:
+                    return result
+        return []
+
     @staticmethod
     def _find_xpath_recursive(node: Dict, target_name: str) -> Optional[str]:
         # Check if current node is the target
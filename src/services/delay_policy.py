@@ -0,0 +1,204 @@
+"""
+Humanization delays and where a run's time goes.
+
+Every deliberate pause a bot takes (before and after looking up an element, between
+keystrokes, after a click or scroll) is drawn from a named profile instead of the global
+Attrs.sleep_config ranges, and is added up per operation next to the time spent really
+waiting on the browser (element waits, page loads). DelayPolicy.report() shows both, so
+the cost of humanization can be measured and tuned.
+
+Profiles: 'stealth' (slow, long-tailed), 'normal' (the historical Attrs.sleep_config
+behaviour) and 'batch' (minimal pauses). An action picks one with metadata.delayProfile;
+otherwise the account's setting (settings key 'delay_profile.<PLATFORM>.<account>', then
+'delay_profile.<PLATFORM>') applies, else 'normal'.
+"""
+import math
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from newAgent.src.data.attributes import Attrs
+
+
+class Fixed:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def sample(self, rng: random.Random) -> float:
+        return self.seconds
+
+
+class Uniform:
+    def __init__(self, low: float, high: float):
+        self.low = low
+        self.high = high
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.uniform(self.low, self.high)
+
+
+class LogNormal:
+    """Mostly close to median with an occasional long pause, capped at `cap` seconds."""
+
+    def __init__(self, median: float, sigma: float, cap: float):
+        self.mu = math.log(median)
+        self.sigma = sigma
+        self.cap = cap
+
+    def sample(self, rng: random.Random) -> float:
+        return min(self.cap, rng.lognormvariate(self.mu, self.sigma))
+
+
+def _normal_profile() -> Dict[str, Any]:
+    c = Attrs.sleep_config
+    return {
+        'lookup': Uniform(c['typing_min'], c['typing_max']),
+        'lookup_slow': Uniform(c['action_min'], c['action_max']),
+        'keystroke': Uniform(c['typing_min'], c['action_min']),
+        'typo': Uniform(c['typing_min'] / 10, c['typing_min']),
+        'after_typing': Uniform(c['action_max'], c['page_load']),
+        'after_click': Fixed(c['action_min']),
+        'after_scroll': Fixed(c['action_min']),
+        'after_hover': Fixed(c['action_min']),
+        'page_load': Fixed(c['page_load']),
+    }
+
+
+def _stealth_profile() -> Dict[str, Any]:
+    return {
+        'lookup': LogNormal(0.3, 0.5, 1.5),
+        'lookup_slow': LogNormal(2.5, 0.4, 8.0),
+        'keystroke': LogNormal(0.18, 0.5, 1.2),
+        'typo': Uniform(0.1, 0.4),
+        'after_typing': Uniform(3.0, 7.0),
+        'after_click': LogNormal(1.5, 0.4, 5.0),
+        'after_scroll': LogNormal(2.0, 0.5, 6.0),
+        'after_hover': Uniform(0.8, 2.0),
+        'page_load': Uniform(5.0, 8.0),
+    }
+
+
+def _batch_profile() -> Dict[str, Any]:
+    return {
+        'lookup': Fixed(0.0),
+        'lookup_slow': Uniform(0.2, 0.5),
+        'keystroke': Uniform(0.01, 0.04),
+        'typo': Fixed(0.02),
+        'after_typing': Uniform(0.3, 0.8),
+        'after_click': Fixed(0.3),
+        'after_scroll': Fixed(0.5),
+        'after_hover': Fixed(0.2),
+        'page_load': Fixed(1.0),
+    }
+
+
+PROFILES = {
+    'stealth': _stealth_profile,
+    'normal': _normal_profile,
+    'batch': _batch_profile,
+}
+
+
+def _is_seconds(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+
+
+def _override(operation: str, spec):
+    """A delay override: fixed seconds, or a [low, high] range sampled uniformly."""
+    if _is_seconds(spec):
+        return Fixed(spec)
+    if isinstance(spec, (list, tuple)) and len(spec) == 2 and all(map(_is_seconds, spec)) and spec[0] <= spec[1]:
+        return Uniform(*spec)
+    raise ValueError(f"Invalid delay override for {operation}: {spec!r} (expected seconds or [low, high])")
+
+
+class DelayPolicy:
+    """Samples a profile's delays, sleeps them and accounts deliberate versus waiting time for one run."""
+
+    def __init__(self, profile: str = 'normal', overrides: Optional[Dict[str, Any]] = None,
+                 rng: Optional[random.Random] = None, sleep=time.sleep, clock=time.monotonic):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown delay profile: {profile}")
+        self.profile = profile
+        self.delays = PROFILES[profile]()
+        if not isinstance(overrides or {}, dict):
+            raise ValueError(f"Delay overrides must map operations to delays, not {overrides!r}")
+        for operation, spec in (overrides or {}).items():
+            if operation not in self.delays:
+                raise ValueError(f"Unknown delay operation: {operation}")
+            self.delays[operation] = _override(operation, spec)
+        self.rng = rng or random.Random()
+        self.sleep = sleep
+        self.clock = clock
+        self.reset()
+
+    @classmethod
+    def from_spec(cls, spec) -> 'DelayPolicy':
+        """Build from an action's metadata.delayProfile: a profile name or {"profile": ..., "overrides": {op: [low, high] | seconds}}."""
+        if isinstance(spec, dict):
+            return cls(spec.get('profile', 'normal'), spec.get('overrides'))
+        return cls(spec or 'normal')
+
+    def reset(self):
+        self.started = self.clock()
+        self.deliberate: Dict[str, list] = {}
+        self.waiting_time: Dict[str, list] = {}
+
+    def delay(self, operation: str) -> float:
+        """Take the profile's pause for operation; returns the seconds slept."""
+        return self.pause(operation, self.delays[operation].sample(self.rng))
+
+    def pause(self, operation: str, seconds: float) -> float:
+        """Sleep an explicit number of seconds, accounted as deliberate delay."""
+        if seconds > 0:
+            self.sleep(seconds)
+        entry = self.deliberate.setdefault(operation, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        return seconds
+
+    @contextmanager
+    def waiting(self, operation: str):
+        """Account the block's duration as real waiting on the page (element waits, loads)."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            entry = self.waiting_time.setdefault(operation, [0, 0.0])
+            entry[0] += 1
+            entry[1] += self.clock() - start
+
+    def report(self) -> Dict[str, Any]:
+        def table(entries):
+            return {op: {'count': n, 'seconds': round(s, 3)} for op, (n, s) in sorted(entries.items())}
+
+        deliberate = sum(s for _, s in self.deliberate.values())
+        waiting = sum(s for _, s in self.waiting_time.values())
+        return {
+            'profile': self.profile,
+            'elapsedSeconds': round(self.clock() - self.started, 3),
+            'deliberateSeconds': round(deliberate, 3),
+            'waitingSeconds': round(waiting, 3),
+            'deliberate': table(self.deliberate),
+            'waiting': table(self.waiting_time),
+        }
+
+    def summary(self) -> str:
+        r = self.report()
+        return (f"{r['profile']} delays: {r['deliberateSeconds']:.1f}s deliberate, {r['waitingSeconds']:.1f}s waiting "
+                f"of {r['elapsedSeconds']:.1f}s")
+
+
+def profile_for(metadata: Optional[Dict[str, Any]], platform: str, account: Optional[str] = None, db=None):
+    """Delay profile spec for a run: the action's own, else the account's or platform's setting, else 'normal'."""
+    spec = (metadata or {}).get('delayProfile')
+    if spec:
+        return spec
+    if db is not None:
+        keys = ([f"delay_profile.{platform.upper()}.{account}"] if account else []) + [f"delay_profile.{platform.upper()}"]
+        for key in keys:
+            value = db.fetch_setting(key)
+            if value:
+                return value
+    return 'normal'
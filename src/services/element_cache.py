@@ -0,0 +1,86 @@
+"""
+Element handles scoped to the document they were found in.
+
+ActionExecutor keeps the element each find step returned so later click/type/hover steps can
+reuse it. A handle from a previous page raises StaleElementReferenceException and costs a slow
+re-find, so handles are tagged with a navigation epoch: the document's
+performance.timeOrigin, which changes on every load, plus location.href, which also changes
+on single-page-app route changes. Navigate and refresh steps drop the cache outright. Every
+read revalidates the handle with one script call that returns the current epoch and whether
+the node is still attached.
+"""
+from typing import Any, Callable, Dict
+
+from selenium.common.exceptions import WebDriverException
+
+EPOCH_JS = "return [performance.timeOrigin, location.href];"
+VALIDATE_JS = "return [performance.timeOrigin, location.href, !!(arguments[0] && arguments[0].isConnected)];"
+
+
+class ElementCache:
+    """Mapping of step id -> element for the current document; stale entries read as missing."""
+
+    def __init__(self, driver: Callable[[], Any]):
+        self._driver = driver
+        self._elements: Dict[str, Any] = {}
+        self.epoch = None
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'invalidations': 0}
+
+    def _read_epoch(self, script, *args):
+        result = self._driver().execute_script(script, *args)
+        return tuple(result[:2]), result[2:]
+
+    def invalidate(self):
+        """Forget every handle, e.g. because the page is being navigated away from."""
+        if self._elements:
+            self.stats['invalidations'] += 1
+        self._elements.clear()
+        self.epoch = None
+
+    def discard(self, key: str):
+        self._elements.pop(key, None)
+
+    def __setitem__(self, key: str, element):
+        if element is None:
+            self._elements.pop(key, None)
+            return
+        try:
+            epoch, _ = self._read_epoch(EPOCH_JS)
+        except WebDriverException:
+            epoch = None
+        if epoch != self.epoch:
+            self.invalidate()
+            self.epoch = epoch
+        self._elements[key] = element
+
+    def get(self, key: str, default=None):
+        element = self._elements.get(key)
+        if element is None:
+            self.stats['misses'] += 1
+            return default
+        try:
+            epoch, (connected,) = self._read_epoch(VALIDATE_JS, element)
+        except WebDriverException:
+            epoch, connected = None, False  # StaleElementReferenceException and friends
+        if epoch != self.epoch:
+            self.stats['stale'] += 1
+            self.invalidate()
+            return default
+        if not connected:
+            self.stats['stale'] += 1
+            self._elements.pop(key, None)
+            return default
+        self.stats['hits'] += 1
+        return element
+
+    def __getitem__(self, key: str):
+        element = self.get(key)
+        if element is None:
+            raise KeyError(key)
+        return element
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._elements)
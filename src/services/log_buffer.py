@@ -0,0 +1,51 @@
+import threading
+from collections import deque
+
+
+class LogBuffer:
+    """
+    Fixed-capacity, line-oriented log store.
+
+    Appended text is split into lines and kept in a ring buffer, so the oldest lines are
+    dropped once `capacity` is reached and memory stays constant however long a run lasts.
+    Text without a trailing newline is held as a partial line until the rest arrives.
+    """
+
+    def __init__(self, capacity=5000, max_line=10000):
+        self.capacity = capacity
+        self.max_line = max_line
+        self.total = 0  # lines ever stored, including dropped ones
+        self._lines = deque(maxlen=capacity)
+        self._partial = ""
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._lines)
+
+    def append(self, text):
+        with self._lock:
+            parts = (self._partial + text).split("\n")
+            self._partial = parts.pop()
+            if len(self._partial) > self.max_line:
+                parts.append(self._partial)
+                self._partial = ""
+            self._lines.extend(parts)
+            self.total += len(parts)
+
+    def lines(self):
+        """Complete lines currently held, oldest first."""
+        with self._lock:
+            return list(self._lines)
+
+    @property
+    def dropped(self):
+        return self.total - len(self._lines)
+
+    def text(self):
+        with self._lock:
+            return "".join(line + "\n" for line in self._lines) + self._partial
+
+    def clear(self):
+        with self._lock:
+            self._lines.clear()
+            self._partial = ""
@@ -0,0 +1,182 @@
+"""
+Token-bucket rate limiter shared by every worker thread and process on this machine.
+
+There is one bucket per (platform, account, operation) where operation is one of the
+classes in DEFAULT_LIMITS. Bucket state lives in SQLite and is updated inside an
+IMMEDIATE transaction, so several agent processes driving the same account draw from
+one budget. When the platform pushes back (HTTP 429, Telegram FloodWait) the bucket is
+emptied, blocked for the retry-after time and its refill rate cut; the rate then
+recovers linearly to its configured value over `recovery` seconds.
+"""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.monoes', 'rate_limits.db')
+
+# operation -> (burst capacity, sustained operations per hour)
+DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+    'navigate': (20, 600),
+    # Connection paging already sleeps 2-5 s between pages; the bucket only binds when
+    # several workers share an account or after a 429 cut the rate
+    'api_page': (30, 1800),
+    'message': (3, 40),
+    'engage': (5, 60),  # likes, comments, posts
+}
+
+# Per-platform overrides of DEFAULT_LIMITS
+PLATFORM_LIMITS: Dict[str, Dict[str, Tuple[float, float]]] = {
+    'LINKEDIN': {'message': (2, 20), 'engage': (3, 30)},
+    'TELEGRAM': {'message': (5, 120)},
+}
+
+
+class RateLimiter:
+    def __init__(self, path: str = DEFAULT_PATH, limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 platform_limits: Optional[Dict[str, Dict[str, Tuple[float, float]]]] = None,
+                 min_rate_factor: float = 0.1, recovery: float = 1800, clock=time.time, sleep=time.sleep):
+        self.path = path
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.platform_limits = PLATFORM_LIMITS if platform_limits is None else platform_limits
+        self.min_rate_factor = min_rate_factor
+        self.recovery = recovery
+        self.clock = clock
+        self.sleep = sleep
+        self._local = threading.local()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connect().execute('CREATE TABLE IF NOT EXISTS buckets (bucket_key TEXT PRIMARY KEY, tokens REAL, rate REAL, '
+                                'updated REAL, blocked_until REAL DEFAULT 0, penalized_at REAL DEFAULT 0)')
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; the busy timeout queues writers from other processes
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def limit(self, platform: str, operation: str) -> Tuple[float, float]:
+        """(capacity, refill per second) configured for an operation on a platform."""
+        overrides = self.platform_limits.get(platform.upper(), {})
+        if operation not in overrides and operation not in self.limits:
+            raise ValueError(f"Unknown rate-limited operation: {operation}")
+        capacity, per_hour = overrides.get(operation) or self.limits[operation]
+        return capacity, per_hour / 3600
+
+    @staticmethod
+    def _key(platform: str, account: Optional[str], operation: str) -> str:
+        return f"{platform.upper()}:{account or 'default'}:{operation}"
+
+    def _load(self, conn, key, capacity, base_rate, now):
+        """Bucket state as of now: (tokens, effective rate, rate set by the last penalty, blocked_until, penalized_at)."""
+        row = conn.execute('SELECT tokens, rate, updated, blocked_until, penalized_at FROM buckets WHERE bucket_key=?',
+                           (key,)).fetchone()
+        if row is None:
+            return capacity, base_rate, base_rate, 0.0, 0.0
+        tokens, rate, updated, blocked_until, penalized_at = row
+        effective = base_rate
+        if penalized_at and rate < base_rate and self.recovery:
+            # Linear recovery from the penalized rate back to the configured one
+            progress = min(1.0, max(0.0, now - penalized_at) / self.recovery)
+            effective = rate + (base_rate - rate) * progress
+        tokens = min(capacity, tokens + max(0.0, now - updated) * effective)
+        return tokens, effective, rate, blocked_until, penalized_at
+
+    def _store(self, conn, key, tokens, rate, now, blocked_until, penalized_at):
+        conn.execute('INSERT OR REPLACE INTO buckets (bucket_key, tokens, rate, updated, blocked_until, penalized_at) '
+                     'VALUES (?, ?, ?, ?, ?, ?)', (key, tokens, rate, now, blocked_until, penalized_at))
+
+    def reserve(self, platform: str, account: Optional[str], operation: str, tokens: float = 1) -> float:
+        """Take tokens if available and return 0, else return the seconds to wait before asking again."""
+        capacity, base_rate = self.limit(platform, operation)
+        key = self._key(platform, account, operation)
+        conn = self._connect()
+        now = self.clock()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            available, effective, rate, blocked_until, penalized_at = self._load(conn, key, capacity, base_rate, now)
+            if now < blocked_until:
+                wait = blocked_until - now
+            elif available >= tokens:
+                available -= tokens
+                wait = 0.0
+            else:
+                wait = (tokens - available) / effective
+            self._store(conn, key, available, rate, now, blocked_until, penalized_at)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return wait
+
+    def acquire(self, platform: str, account: Optional[str], operation: str, tokens: float = 1,
+                timeout: Optional[float] = None) -> float:
+        """Block until the operation may run; returns the seconds spent waiting."""
+        deadline = None if timeout is None else self.clock() + timeout
+        waited = 0.0
+        while True:
+            wait = self.reserve(platform, account, operation, tokens)
+            if not wait:
+                return waited
+            if deadline is not None and self.clock() + wait > deadline:
+                raise TimeoutError(f"{operation} on {platform} is rate limited for another {wait:.0f}s")
+            self.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, platform: str, account: Optional[str], operation: str, tokens: float = 1) -> float:
+        """acquire() for asyncio code; the SQLite transaction runs in a worker thread so a busy
+        database (another process holding the lock) never stalls the event loop."""
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self.reserve, platform, account, operation, tokens)
+            if not wait:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def penalize(self, platform: str, account: Optional[str], operation: str, retry_after: Optional[float] = None,
+                 factor: float = 0.5):
+        """The platform pushed back: empty the bucket, block it for retry_after seconds and cut its rate by factor."""
+        capacity, base_rate = self.limit(platform, operation)
+        key = self._key(platform, account, operation)
+        conn = self._connect()
+        now = self.clock()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            _, effective, _, blocked_until, _ = self._load(conn, key, capacity, base_rate, now)
+            rate = max(base_rate * self.min_rate_factor, effective * factor)
+            if retry_after:
+                blocked_until = max(blocked_until, now + retry_after)
+            self._store(conn, key, 0.0, rate, now, blocked_until, now)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    async def penalize_async(self, platform: str, account: Optional[str], operation: str,
+                             retry_after: Optional[float] = None, factor: float = 0.5):
+        await asyncio.to_thread(self.penalize, platform, account, operation, retry_after, factor)
+
+    def state(self, platform: str, account: Optional[str], operation: str) -> Dict[str, float]:
+        capacity, base_rate = self.limit(platform, operation)
+        key = self._key(platform, account, operation)
+        tokens, effective, _, blocked_until, _ = self._load(self._connect(), key, capacity, base_rate, self.clock())
+        return {'tokens': tokens, 'capacity': capacity, 'perHour': effective * 3600,
+                'blockedFor': max(0.0, blocked_until - self.clock())}
+
+
+# Global instance
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create global rate limiter instance."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
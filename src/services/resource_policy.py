@@ -0,0 +1,151 @@
+"""
+Resource blocking for extraction actions.
+
+An action declares what the browser may skip in its JSON metadata:
+
+    "metadata": {"resourcePolicy": "extraction"}
+    "metadata": {"resourcePolicy": {"block": ["media", "fonts"], "urls": ["*.example.com/pixel*"]}}
+
+The blocked URL patterns are installed with CDP Network.setBlockedURLs for the duration of
+the action. Documents, scripts, stylesheets and XHR are never blocked, so the DOM the
+selectors work on is unchanged; a blocked image keeps its src attribute.
+"""
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _extensions(*extensions):
+    """Chrome URL patterns ('*' is the only wildcard) for paths ending in one of the extensions.
+
+    Each extension is matched right at the end of the URL or right before its query string, so
+    a script or XHR URL that merely contains '.png' or '.ico' elsewhere keeps loading.
+    """
+    return tuple(p for ext in extensions for p in (f'*.{ext}', f'*.{ext}?*'))
+
+
+# Chrome URL patterns per resource category
+CATEGORY_PATTERNS = {
+    # Photo formats only: icons and SVG glyphs are small, and SVG sprites are part of the UI
+    'images': _extensions('jpg', 'jpeg', 'png', 'gif', 'webp', 'avif', 'heic'),
+    'media': _extensions('mp4', 'webm', 'm4s', 'm4a', 'm3u8', 'mp3') + ('*mime_type=video*',),
+    'fonts': _extensions('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'analytics': (
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+        '*connect.facebook.net*', '*facebook.com/tr*', '*graph.instagram.com/logging*',
+        '*analytics.tiktok.com*', '*mon.tiktokv.com*', '*mcs.tiktokw.com*',
+        '*px.ads.linkedin.com*', '*snap.licdn.com*',
+        '*analytics.twitter.com*', '*static.ads-twitter.com*',
+    ),
+}
+
+PROFILES = {
+    'none': (),
+    'light': ('media', 'fonts', 'analytics'),
+    'extraction': ('images', 'media', 'fonts', 'analytics'),
+}
+
+# Page weight and load time of the current document, read from the Navigation and Resource Timing APIs
+_PAGE_STATS_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+let bytes = nav ? nav.transferSize : 0;
+const resources = performance.getEntriesByType('resource');
+for (const r of resources) bytes += r.transferSize || 0;
+const blocked = Array.from(document.images).filter(i => i.currentSrc && i.complete && !i.naturalWidth).length;
+return {
+    loadMs: nav ? Math.round((nav.loadEventEnd || nav.domContentLoadedEventEnd) - nav.startTime) : null,
+    bytes: bytes,
+    requests: resources.length,
+    blockedImages: blocked
+};
+"""
+
+
+class ResourcePolicy:
+    """The set of URL patterns an action lets the browser skip."""
+
+    def __init__(self, categories: Iterable[str] = (), urls: Iterable[str] = ()):
+        unknown = [c for c in categories if c not in CATEGORY_PATTERNS]
+        if unknown:
+            raise ValueError(f"Unknown resource categories: {unknown}")
+        self.categories = tuple(categories)
+        patterns = [p for c in self.categories for p in CATEGORY_PATTERNS[c]] + list(urls)
+        self.patterns = list(dict.fromkeys(patterns))
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+    @classmethod
+    def from_metadata(cls, metadata: Optional[Dict[str, Any]]) -> 'ResourcePolicy':
+        """Build the policy from an action definition's metadata; no resourcePolicy means nothing is blocked."""
+        spec = (metadata or {}).get('resourcePolicy')
+        if not spec:
+            return cls()
+        if isinstance(spec, str):
+            spec = {'profile': spec}
+        profile = spec.get('profile')
+        if profile is not None and profile not in PROFILES:
+            raise ValueError(f"Unknown resource policy profile: {profile}")
+        categories = list(PROFILES.get(profile, ()))
+        categories += [c for c in spec.get('block', []) if c not in categories]
+        categories = [c for c in categories if c not in spec.get('allow', [])]
+        return cls(categories, spec.get('urls', []))
+
+    def _send(self, driver, patterns) -> bool:
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            return True
+        except Exception as e:
+            # Not a Chromium driver, or the browser went away
+            logger.warning(f"Could not set blocked URLs: {e}")
+            return False
+
+    def apply(self, driver) -> bool:
+        if not self:
+            return False
+        logger.info(f"Blocking {', '.join(self.categories) or 'custom'} resources ({len(self.patterns)} patterns)")
+        return self._send(driver, self.patterns)
+
+    def clear(self, driver) -> bool:
+        """Lift the block so the next action on a reused browser loads pages in full."""
+        if not self:
+            return False
+        return self._send(driver, [])
+
+
+class ResourceStats:
+    """Per-action totals of page load time and transferred bytes, sampled after each navigation."""
+
+    def __init__(self):
+        self.pages = 0
+        self.load_ms = 0
+        self.bytes = 0
+        self.requests = 0
+        self.blocked_images = 0
+
+    def record(self, driver) -> Optional[Dict[str, Any]]:
+        try:
+            page = driver.execute_script(_PAGE_STATS_JS)
+        except Exception as e:
+            logger.debug(f"Could not read page stats: {e}")
+            return None
+        if not page:
+            return None
+        self.pages += 1
+        self.load_ms += page.get('loadMs') or 0
+        self.bytes += page.get('bytes') or 0
+        self.requests += page.get('requests') or 0
+        self.blocked_images += page.get('blockedImages') or 0
+        return page
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'pages': self.pages,
+            'loadMs': self.load_ms,
+            'avgLoadMs': round(self.load_ms / self.pages) if self.pages else None,
+            'bytes': self.bytes,
+            'requests': self.requests,
+            'blockedImages': self.blocked_images,
+        }
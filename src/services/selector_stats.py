@@ -0,0 +1,100 @@
+"""
+Adaptive ordering of alternative XPaths.
+
+Every lookup that has several candidate XPaths for one field records, per (config, field,
+xpath), whether the candidate matched and how long the winner took. Hits and tries decay
+exponentially with HALF_LIFE, so the ordering follows the site's current markup: when a
+platform ships new HTML the alternative that keeps matching moves ahead of a dead primary
+within a few runs, and the JSON can be cleaned up later. Candidates without history keep
+their file order behind proven ones.
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+HALF_LIFE = 3 * 24 * 3600
+LATENCY_SMOOTHING = 0.2
+
+
+class SelectorStats:
+    def __init__(self, db, half_life: float = HALF_LIFE, clock=time.time):
+        self.db = db
+        self.half_life = half_life
+        self.clock = clock
+
+    def _decayed(self, score: float, weight: float, updated: Optional[float], now: float):
+        factor = 0.5 ** (max(0.0, now - updated) / self.half_life) if updated else 1.0
+        return score * factor, weight * factor
+
+    @staticmethod
+    def success_rate(score: float, weight: float) -> float:
+        # Laplace smoothing: an unseen candidate rates 0.5, between proven and dead ones
+        return (score + 1) / (weight + 2)
+
+    def _rows(self, config: str, field: str) -> Dict[str, tuple]:
+        return {row[2]: row for row in self.db.fetch_selector_stats(config, field)}
+
+    def order(self, config: str, field: str, xpaths: List[str]) -> List[str]:
+        """xpaths sorted by decayed success rate, best first; ties keep their given order."""
+        if len(xpaths) < 2:
+            return list(xpaths)
+        rows = self._rows(config, field)
+        now = self.clock()
+
+        def rate(xpath):
+            row = rows.get(xpath)
+            if row is None:
+                return 0.5
+            return self.success_rate(*self._decayed(row[5], row[6], row[8], now))
+
+        return sorted(xpaths, key=rate, reverse=True)
+
+    def record(self, config: str, field: str, results: Dict[str, bool], latency_ms: Optional[float] = None):
+        """Record which candidates matched (xpath -> hit); latency_ms is the matching lookup's duration."""
+        if not results:
+            return
+        rows = self._rows(config, field)
+        now = self.clock()
+        updates = []
+        for xpath, hit in results.items():
+            _, _, _, hits, misses, score, weight, latency, updated = rows.get(
+                xpath, (config, field, xpath, 0, 0, 0.0, 0.0, None, None))
+            score, weight = self._decayed(score, weight, updated, now)
+            if hit:
+                hits += 1
+                score += 1
+                if latency_ms is not None:
+                    latency = latency_ms if latency is None else latency + (latency_ms - latency) * LATENCY_SMOOTHING
+            else:
+                misses += 1
+            updates.append((config, field, xpath, hits, misses, score, weight + 1, latency, now))
+        self.db.save_selector_stats(updates)
+
+    def record_race(self, config: str, field: str, candidates: List[str], index: Optional[int],
+                    latency_ms: Optional[float] = None):
+        """Record a race: the winner hit; only a timed-out race (index None) counts misses.
+
+        Candidates listed before the winner are not counted as misses: the race returns the
+        first match on a poll, and an earlier candidate may simply not have rendered yet.
+        """
+        if index is None:
+            self.record(config, field, {xpath: False for xpath in candidates})
+        else:
+            self.record(config, field, {candidates[index]: True}, latency_ms)
+
+    def report(self, config: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per-candidate statistics for dashboards, grouped by config and field, best candidate first."""
+        now = self.clock()
+        report = []
+        for cfg, field, xpath, hits, misses, score, weight, latency, updated in self.db.fetch_selector_stats(config):
+            report.append({
+                'config': cfg,
+                'field': field,
+                'xpath': xpath,
+                'hits': hits,
+                'misses': misses,
+                'successRate': round(self.success_rate(*self._decayed(score, weight, updated, now)), 3),
+                'latencyMs': None if latency is None else round(latency, 1),
+                'lastUsed': updated,
+            })
+        report.sort(key=lambda r: (r['config'], r['field'], -r['successRate']))
+        return report
@@ -0,0 +1,109 @@
+import random
+import unittest
+from newAgent.src.data.algorithms import Queue
+
+
+class FakeAction:
+    def __init__(self, createdAt, scheduled):
+        self.createdAt = createdAt
+        self.scheduledDate = "2025-01-01T00:00:00Z" if scheduled else None
+        self.nextPeriod = None
+
+    def __repr__(self):
+        return f"A{self.createdAt}{'' if self.scheduledDate else '*'}"
+
+
+class CountingAction(FakeAction):
+    """Counts every read of an action's id or scheduling fields, as a proxy for the merge's work."""
+    reads = 0
+
+    def __getattribute__(self, name):
+        if name in ("createdAt", "scheduledDate", "nextPeriod"):
+            CountingAction.reads += 1
+        return super().__getattribute__(name)
+
+
+def reference_merge(prev_queue_actions, scheduled_actions,
+                    condition=lambda action: not action.scheduledDate and not action.nextPeriod):
+    """The original quadratic merge, kept to check the rewrite against."""
+    if not prev_queue_actions:
+        return scheduled_actions
+    if not scheduled_actions:
+        return prev_queue_actions
+    head_nodes = []
+    tail_nodes = []
+    while prev_queue_actions and condition(prev_queue_actions[0]):
+        head_nodes.append(prev_queue_actions.pop(0))
+    if not prev_queue_actions:
+        return head_nodes + scheduled_actions
+    while prev_queue_actions and condition(prev_queue_actions[-1]):
+        tail_nodes.insert(0, prev_queue_actions.pop())
+    if len(prev_queue_actions) < 3:
+        return head_nodes + scheduled_actions + tail_nodes
+    scheduled_actions_ids = [val.createdAt for val in scheduled_actions]
+    for i in range(1, len(prev_queue_actions) - 1):
+        if not condition(prev_queue_actions[i]):
+            continue
+        for j in range(i + 1, len(prev_queue_actions)):
+            if prev_queue_actions[j].createdAt in scheduled_actions_ids:
+                index = scheduled_actions_ids.index(prev_queue_actions[j].createdAt)
+                scheduled_actions_ids.insert(index, prev_queue_actions[i].createdAt)
+                scheduled_actions.insert(index, prev_queue_actions[i])
+                break
+        else:
+            tail_nodes.insert(0, prev_queue_actions[i])
+    return head_nodes + scheduled_actions + tail_nodes
+
+
+def random_queues(rng, size):
+    """A previous queue of scheduled and user-added actions, and a refreshed schedule sharing some of them."""
+    pool = [FakeAction(i, rng.random() < 0.6) for i in range(size)]
+    prev = rng.sample(pool, rng.randint(0, size))
+    scheduled = [a for a in pool if a.scheduledDate and rng.random() < 0.7]
+    if rng.random() < 0.2:
+        # Occasionally the API also returns an action the user queued by hand
+        scheduled += [a for a in prev if not a.scheduledDate][:2]
+    rng.shuffle(scheduled)
+    return prev, scheduled
+
+
+class TestQueueMerge(unittest.TestCase):
+    def test_docstring_example(self):
+        a1, a2, a3, a5 = (FakeAction(i, True) for i in (1, 2, 3, 5))
+        a4 = FakeAction(4, False)
+        result = Queue.merge_prev_current_queue([a1, a4, a2, a3], [a2, a3, a5])
+        self.assertEqual(result, [a4, a2, a3, a5])
+
+    def test_matches_reference_on_random_queues(self):
+        for seed in range(3000):
+            rng = random.Random(seed)
+            prev, scheduled = random_queues(rng, rng.randint(0, 14))
+            expected = reference_merge(list(prev), list(scheduled))
+            result = Queue.merge_prev_current_queue(list(prev), list(scheduled))
+            self.assertEqual(result, expected, f"seed {seed}: prev={prev} scheduled={scheduled}")
+
+    def test_does_not_mutate_inputs(self):
+        prev, scheduled = random_queues(random.Random(7), 30)
+        prev_copy, scheduled_copy = list(prev), list(scheduled)
+        Queue.merge_prev_current_queue(prev, scheduled)
+        self.assertEqual((prev, scheduled), (prev_copy, scheduled_copy))
+
+    def test_work_grows_linearly(self):
+        # A big account refresh: most of the schedule reordered, 30% of the queue added by hand.
+        # The previous nested-loop merge read ~25M action ids at 10k actions.
+        def merge_steps(size):
+            rng = random.Random(3)
+            prev = [CountingAction(i, rng.random() < 0.7) for i in range(size)]
+            scheduled = [a for a in prev if a.scheduledDate][::-1][:size * 6 // 10]
+            CountingAction.reads = 0
+            result = Queue.merge_prev_current_queue(prev, scheduled)
+            self.assertEqual(len(result), len(scheduled) + sum(1 for a in prev if not a.scheduledDate))
+            return CountingAction.reads
+
+        small, large = merge_steps(5000), merge_steps(10000)
+        self.assertLess(large, 10 * 10000)
+        # Doubling the input doubles the work for a linear merge and quadruples it for a quadratic one
+        self.assertLess(large / small, 2.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -31,6 +31,17 @@ class TestAuthManager(unittest.TestCase):
         self.assertEqual(self.mock_bot.username, 'testuser')
         self.assertEqual(self.mock_bot.profile_pic, 'pic.jpg')
 
+    def test_load_cookies_for_account(self):
+        mock_cookies = [{'name': 'li_at', 'value': '456'}]
+        self.mock_store_instance.fetch_crawler_session.return_value = mock_cookies
+
+        self.assertTrue(self.auth.load_cookies(self.mock_bot, 'work'))
+
+        self.mock_store_instance.fetch_crawler_session.assert_called_once_with('work', 'LINKEDIN')
+        self.mock_store_instance.latest_cookies.assert_not_called()
+        self.assertEqual(self.mock_bot.cookies, mock_cookies)
+        self.assertEqual(self.mock_bot.session_account, 'work')
+
     def test_load_cookies_none(self):
         self.mock_store_instance.latest_cookies.return_value = None
         
@@ -0,0 +1,174 @@
+import shutil
+import tempfile
+import threading
+import unittest
+
+from selenium.common.exceptions import WebDriverException
+
+from newAgent.core.browser_pool import BrowserPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+
+class FakeDriver:
+    def __init__(self):
+        self.dead = False
+        self.heap = 10 * 1024 * 1024
+        self.window_handles = ["main"]
+        self.current = "main"
+        self.switch_to = FakeSwitchTo(self)
+
+    @property
+    def current_url(self):
+        if self.dead:
+            raise WebDriverException("chrome not reachable")
+        return "https://www.instagram.com/"
+
+    def execute_script(self, script):
+        if self.dead:
+            raise WebDriverException("chrome not reachable")
+        return self.heap
+
+    def close(self):
+        self.window_handles.remove(self.current)
+
+
+class FakeBot:
+    def __init__(self, profile_dir):
+        self.profile_path = profile_dir
+        self.driver = FakeDriver()
+        self.quits = 0
+
+    def quit(self):
+        self.quits += 1
+        self.driver = None
+
+
+class Starter:
+    def __init__(self):
+        self.started = []
+
+    def __call__(self, platform, profile_dir, account=None):
+        bot = FakeBot(profile_dir)
+        bot.account = account
+        self.started.append(bot)
+        return bot
+
+
+class BrowserPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.starter = Starter()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def pool(self, **kwargs):
+        return BrowserPool(profile_root=self.root, starter=self.starter, **kwargs)
+
+    def test_reuses_warm_bot(self):
+        pool = self.pool()
+        with pool.lease("instagram") as first:
+            first.driver.window_handles.append("popup")
+            first.driver.current = "popup"
+        with pool.lease("INSTAGRAM") as second:
+            self.assertIs(first, second)
+            self.assertEqual(second.driver.window_handles, ["main"])
+            self.assertEqual(second.driver.current, "main")
+        self.assertEqual(len(self.starter.started), 1)
+
+    def test_profiles_per_platform_and_slot(self):
+        pool = self.pool(size=2)
+        a = pool.acquire("instagram")
+        b = pool.acquire("instagram")
+        c = pool.acquire("linkedin", account="work")
+        dirs = {a.profile_dir, b.profile_dir, c.profile_dir}
+        self.assertEqual(len(dirs), 3)
+        self.assertTrue(c.profile_dir.endswith("linkedin-work-0"))
+        self.assertEqual(a.bot.profile_path, a.profile_dir)
+
+    def test_accounts_never_share_a_browser(self):
+        pool = self.pool()
+        with pool.lease("instagram", account="alice") as alice:
+            pass
+        with pool.lease("instagram", account="bob") as bob:
+            self.assertIsNot(bob, alice)
+        with pool.lease("instagram", account="alice") as again:
+            self.assertIs(again, alice)
+        self.assertEqual([bot.account for bot in self.starter.started], ["alice", "bob"])
+        self.assertNotEqual(alice.profile_path, bob.profile_path)
+
+    def test_recycles_after_max_uses(self):
+        pool = self.pool(max_uses=2)
+        for _ in range(3):
+            with pool.lease("instagram"):
+                pass
+        first, second = self.starter.started
+        self.assertEqual(first.quits, 1)
+        self.assertEqual(second.quits, 0)
+
+    def test_recycles_on_heap_growth(self):
+        pool = self.pool(max_heap_growth_mb=100)
+        with pool.lease("instagram") as bot:
+            bot.driver.heap += 200 * 1024 * 1024
+        with pool.lease("instagram") as bot:
+            self.assertIsNot(bot, self.starter.started[0])
+        self.assertEqual(self.starter.started[0].quits, 1)
+
+    def test_replaces_bot_that_died_while_idle(self):
+        pool = self.pool()
+        with pool.lease("instagram") as bot:
+            pass
+        bot.driver.dead = True
+        with pool.lease("instagram") as replacement:
+            self.assertIsNot(replacement, bot)
+        self.assertEqual(bot.quits, 1)
+
+    def test_bot_quit_during_lease_is_discarded(self):
+        pool = self.pool()
+        with pool.lease("instagram") as bot:
+            bot.quit()
+        self.assertEqual(pool.stats()["INSTAGRAM/default"], {"live": 0, "idle": 0})
+
+    def test_size_limit_blocks_until_release(self):
+        pool = self.pool(size=1)
+        leased = pool.acquire("instagram")
+        with self.assertRaises(TimeoutError):
+            pool.acquire("instagram", timeout=0.05)
+        threading.Timer(0.05, pool.release, args=(leased,)).start()
+        again = pool.acquire("instagram", timeout=5)
+        self.assertIs(again, leased)
+
+    def test_failed_start_frees_slot(self):
+        def broken(platform, profile_dir, account=None):
+            raise RuntimeError("no chrome")
+
+        pool = self.pool()
+        pool.starter = broken
+        with self.assertRaises(RuntimeError):
+            pool.acquire("instagram")
+        pool.starter = self.starter
+        self.assertIsNotNone(pool.acquire("instagram", timeout=0))
+
+    def test_warm_and_close(self):
+        pool = self.pool(size=3)
+        self.assertEqual(pool.warm("instagram", count=2), 2)
+        self.assertEqual(pool.stats()["INSTAGRAM/default"], {"live": 2, "idle": 2})
+        with pool.lease("instagram"):
+            pass
+        self.assertEqual(len(self.starter.started), 2)
+        self.assertTrue(all(p.uses <= 1 for bots in pool._idle.values() for p in bots))
+        pool.close()
+        self.assertTrue(all(bot.quits == 1 for bot in self.starter.started))
+        with self.assertRaises(RuntimeError):
+            pool.acquire("instagram")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import json
+import threading
+import unittest
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from newAgent.src.services.browser_session import RATE_LIMITED, BrowserSession
+
+
+class FakeDriver:
+    def __init__(self, cookies):
+        self.cookies = cookies
+        self.set_cookies = []
+
+    def execute_script(self, script):
+        return 'Mozilla/5.0 Test'
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == 'Network.getAllCookies':
+            return {'cookies': [dict(c) for c in self.cookies]}
+        if cmd == 'Network.setCookie':
+            self.set_cookies.append(params)
+            return {}
+        raise AssertionError(cmd)
+
+
+class Handler(BaseHTTPRequestHandler):
+    valid_session = 'abc'
+    rate_limit_next = False
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=None, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        payload = json.dumps(body).encode() if body is not None else b''
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        cookies = SimpleCookie(self.headers.get('Cookie', ''))
+        Handler.requests.append((self.path, self.headers.get('User-Agent'), {k: v.value for k, v in cookies.items()}))
+        if Handler.rate_limit_next:
+            Handler.rate_limit_next = False
+            return self._send(429, {'message': 'Please wait a few minutes', 'status': 'fail'})
+        if cookies.get('sessionid') is None or cookies['sessionid'].value != Handler.valid_session:
+            return self._send(302, headers=[('Location', '/accounts/login/')])
+        if self.path.startswith('/rotate'):
+            return self._send(200, {'ok': True}, headers=[('Set-Cookie', 'csrftoken=new; Path=/')])
+        return self._send(200, {'data': {'user': {'id': '1'}}})
+
+
+class TestBrowserSession(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), Handler)
+        cls.base = f'http://127.0.0.1:{cls.server.server_port}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.valid_session = 'abc'
+        Handler.rate_limit_next = False
+        Handler.requests = []
+        self.driver = FakeDriver([{'name': 'sessionid', 'value': 'abc', 'domain': '127.0.0.1', 'path': '/'},
+                                  {'name': 'csrftoken', 'value': 'tok', 'domain': '127.0.0.1', 'path': '/'}])
+
+    def test_uses_browser_cookies_and_user_agent(self):
+        http = BrowserSession(self.driver, user_agent='Instagram 155.0.0.37.107')
+        self.assertEqual(http.get_json(f'{self.base}/api'), {'data': {'user': {'id': '1'}}})
+        path, agent, cookies = Handler.requests[0]
+        self.assertEqual(agent, 'Instagram 155.0.0.37.107')
+        self.assertEqual(cookies, {'sessionid': 'abc', 'csrftoken': 'tok'})
+        self.assertEqual(http.session.headers['X-CSRFToken'], 'tok')
+
+    def test_rate_limit_maps_to_message(self):
+        http = BrowserSession(self.driver)
+        Handler.rate_limit_next = True
+        self.assertEqual(http.get_json(f'{self.base}/api'), RATE_LIMITED)
+        self.assertIn('data', http.get_json(f'{self.base}/api'))
+
+    def test_reloads_cookies_from_browser_on_login_redirect(self):
+        http = BrowserSession(self.driver)
+        # The browser was logged in again after the session copied its cookies
+        Handler.valid_session = 'fresh'
+        self.driver.cookies[0]['value'] = 'fresh'
+        self.assertIn('data', http.get_json(f'{self.base}/api'))
+        self.assertEqual(http.refreshes, 1)
+
+    def test_still_logged_out_raises(self):
+        http = BrowserSession(self.driver)
+        Handler.valid_session = 'other'
+        with self.assertRaises(Exception):
+            http.get_json(f'{self.base}/api')
+
+    def test_rotated_cookies_written_back_to_browser(self):
+        http = BrowserSession(self.driver)
+        http.get_json(f'{self.base}/rotate')
+        self.assertEqual([(c['name'], c['value']) for c in self.driver.set_cookies], [('csrftoken', 'new')])
+        self.assertEqual(http.session.headers['X-CSRFToken'], 'new')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import random
+import unittest
+from unittest import mock
+
+from newAgent.src.data.attributes import Attrs
+from newAgent.src.services.action_schema import validate_action
+from newAgent.src.services.delay_policy import DelayPolicy, profile_for
+
+ACTION = {'actionType': 'TEST', 'platform': 'INSTAGRAM', 'version': '1.0.0', 'steps': [{'id': 'go', 'type': 'navigate', 'url': 'https://example.com'}]}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class Settings:
+    def __init__(self, values):
+        self.values = values
+
+    def fetch_setting(self, key, default=None):
+        return self.values.get(key, default)
+
+
+class TestDelayPolicy(unittest.TestCase):
+    def policy(self, profile='normal', **kwargs):
+        self.clock = Clock()
+        return DelayPolicy(profile, rng=random.Random(7), sleep=self.clock.sleep, clock=self.clock, **kwargs)
+
+    def test_normal_follows_sleep_config(self):
+        with mock.patch.dict(Attrs.sleep_config, {'typing_min': 0.1, 'typing_max': 0.2, 'page_load': 4.0}):
+            policy = self.policy()
+        for _ in range(20):
+            self.assertTrue(0.1 <= policy.delay('lookup') <= 0.2)
+        self.assertEqual(policy.delay('page_load'), 4.0)
+
+    def test_profiles_order_by_pace(self):
+        totals = {}
+        for profile in ('stealth', 'normal', 'batch'):
+            policy = self.policy(profile)
+            for _ in range(200):
+                policy.delay('keystroke')
+            totals[profile] = policy.report()['deliberateSeconds']
+        self.assertGreater(totals['stealth'], totals['batch'])
+        self.assertGreater(totals['normal'], totals['batch'])
+
+    def test_stealth_is_capped(self):
+        policy = self.policy('stealth')
+        self.assertLessEqual(max(policy.delay('after_click') for _ in range(500)), 5.0)
+
+    def test_report_splits_deliberate_and_waiting(self):
+        policy = self.policy('batch', overrides={'after_click': 2, 'keystroke': [0.5, 0.5]})
+        policy.delay('after_click')
+        policy.delay('keystroke')
+        policy.delay('keystroke')
+        with policy.waiting('element'):
+            self.clock.now += 3
+        policy.pause('wait_step', 1)
+
+        report = policy.report()
+        self.assertEqual(report['profile'], 'batch')
+        self.assertEqual(report['deliberateSeconds'], 4)
+        self.assertEqual(report['waitingSeconds'], 3)
+        self.assertEqual(report['elapsedSeconds'], 7)
+        self.assertEqual(report['deliberate']['keystroke'], {'count': 2, 'seconds': 1.0})
+        self.assertEqual(report['waiting']['element'], {'count': 1, 'seconds': 3.0})
+
+        policy.reset()
+        self.assertEqual(policy.report()['deliberateSeconds'], 0)
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            DelayPolicy('reckless')
+
+    def test_invalid_overrides_rejected(self):
+        for overrides in ({'after_click': [1]}, {'after_clik': 1}, {'keystroke': 'fast'}, {'keystroke': [0.5, 0.1]},
+                          {'page_load': -1}, {'page_load': True}, ['page_load']):
+            with self.assertRaises(ValueError, msg=overrides):
+                DelayPolicy('batch', overrides)
+        valid, _ = validate_action(dict(ACTION, metadata={'delayProfile': {'overrides': {'keystroke': [0.1, 0.3]}}}))
+        self.assertTrue(valid)
+        for overrides in ({'after_click': [1]}, {'after_clik': 1}, {'keystroke': 'fast'}):
+            valid, _ = validate_action(dict(ACTION, metadata={'delayProfile': {'overrides': overrides}}))
+            self.assertFalse(valid, overrides)
+
+    def test_selection_action_then_account_then_platform(self):
+        settings = Settings({'delay_profile.INSTAGRAM.me': 'stealth', 'delay_profile.INSTAGRAM': 'batch'})
+        self.assertEqual(profile_for({'delayProfile': 'normal'}, 'instagram', 'me', settings), 'normal')
+        self.assertEqual(profile_for({}, 'instagram', 'me', settings), 'stealth')
+        self.assertEqual(profile_for(None, 'instagram', 'other', settings), 'batch')
+        self.assertEqual(profile_for(None, 'linkedin', 'me', settings), 'normal')
+        policy = DelayPolicy.from_spec({'profile': 'batch', 'overrides': {'page_load': 0}})
+        self.assertEqual((policy.profile, policy.delays['page_load'].sample(None)), ('batch', 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
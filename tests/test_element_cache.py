@@ -0,0 +1,106 @@
+import unittest
+from unittest import mock
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+from newAgent.src.services.action_executor import ActionExecutor
+from newAgent.src.services.element_cache import ElementCache, EPOCH_JS, VALIDATE_JS
+
+
+class Element:
+    def __init__(self, name):
+        self.name = name
+        self.connected = True
+        self.stale = False
+
+
+class FakeDriver:
+    def __init__(self):
+        self.time_origin = 1.0
+        self.href = 'https://example.com/a'
+        self.calls = 0
+
+    def load(self, href=None):
+        self.time_origin += 1
+        self.href = href or self.href
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        if script == EPOCH_JS:
+            return [self.time_origin, self.href]
+        assert script == VALIDATE_JS
+        if args[0].stale:
+            raise StaleElementReferenceException('stale element reference')
+        return [self.time_origin, self.href, args[0].connected]
+
+
+class TestElementCache(unittest.TestCase):
+    def setUp(self):
+        self.driver = FakeDriver()
+        self.cache = ElementCache(lambda: self.driver)
+
+    def test_reuses_handle_on_same_document(self):
+        button = Element('button')
+        self.cache['find_button'] = button
+        self.assertIs(self.cache.get('find_button'), button)
+        self.assertIs(self.cache['find_button'], button)
+        self.assertIn('find_button', self.cache)
+        self.assertEqual(self.cache.stats['hits'], 3)
+
+    def test_new_document_drops_every_handle(self):
+        self.cache['a'] = Element('a')
+        self.cache['b'] = Element('b')
+        self.driver.load()
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.stats['invalidations'], 1)
+
+    def test_route_change_drops_handles(self):
+        self.cache['a'] = Element('a')
+        self.driver.href = 'https://example.com/b'  # pushState navigation keeps timeOrigin
+        self.assertNotIn('a', self.cache)
+
+    def test_detached_or_stale_handle_is_dropped(self):
+        detached, stale, kept = Element('detached'), Element('stale'), Element('kept')
+        for key, element in (('detached', detached), ('stale', stale), ('kept', kept)):
+            self.cache[key] = element
+        detached.connected = False
+        self.assertIsNone(self.cache.get('detached'))
+        stale.stale = True
+        self.assertIsNone(self.cache.get('stale'))
+        with self.assertRaises(KeyError):
+            self.cache['missing']
+        self.assertEqual(self.cache.stats['stale'], 2)
+        self.assertEqual(self.cache.stats['misses'], 1)
+
+    def test_storing_after_navigation_starts_new_epoch(self):
+        self.cache['old'] = Element('old')
+        self.driver.load('https://example.com/c')
+        self.cache['new'] = new = Element('new')
+        self.assertIsNone(self.cache.get('old'))
+        self.assertIs(self.cache.get('new'), new)
+
+    def test_executor_refinds_stale_handle_once(self):
+        executor = ActionExecutor.__new__(ActionExecutor)
+        executor.bot = mock.Mock(driver=self.driver)
+        executor.context = {'elements': self.cache}
+        executor.action_def = {'steps': [{'id': 'find_input', 'type': 'find_element', 'xpath': '//input'}]}
+        old, fresh = Element('old'), Element('fresh')
+        self.cache['find_input'] = old
+        typed = []
+
+        def type_text(target):
+            if target is old:
+                raise StaleElementReferenceException('re-rendered')
+            typed.append(target)
+
+        with mock.patch.object(ActionExecutor, '_step_find_element',
+                               return_value={'success': True, 'element': fresh}) as find:
+            executor._use_element('find_input', old, type_text)
+            self.assertEqual(typed, [fresh])
+            self.assertIs(executor._get_element('find_input'), fresh)
+        find.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+import urllib.parse
+from unittest import mock
+
+from newAgent.src.data.attributes import Attrs
+from newAgent.src.database.database import DataBase
+from newAgent.src.services.rate_limiter import RateLimiter
+from newAgent.src.robot.instagram import Instagram
+
+
+class FakeInstagram(Instagram):
+    """Serves a follower list of `total` users from memory instead of Instagram's API."""
+
+    def __init__(self, total, per_page_fail=None):
+        self.logger = logging.getLogger(__name__)
+        self.platform = 'MAC'
+        self.total = total
+        self.per_page_fail = per_page_fail or {}
+        self.requests = []
+
+    def _fetch_json(self, url):
+        if 'web_profile_info' in url:
+            return {'data': {'user': {'id': '42'}}}
+        variables = json.loads(urllib.parse.parse_qs(urllib.parse.urlparse(url).query)['variables'][0])
+        start = int(variables.get('after', 0))
+        self.requests.append(start)
+        if self.per_page_fail.get(start):
+            self.per_page_fail[start] -= 1
+            return {'message': 'Rate limit exceeded', 'status': 'fail'}
+        end = min(start + variables['first'], self.total)
+        edges = [{'node': {'username': f'user{i}', 'full_name': f'User {i}', 'profile_pic_url': ''}}
+                 for i in range(start, end)]
+        return {'data': {'user': {'edge_followed_by': {
+            'edges': edges, 'page_info': {'has_next_page': end < self.total, 'end_cursor': str(end)}}}}}
+
+
+class TestConnectionCrawl(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = DataBase('MAC', path=os.path.join(self.tmp, 'test.db'))
+        patcher = mock.patch.dict(Attrs.sleep_config, {'scroll_min': 0, 'scroll_max': 0})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.limiter = RateLimiter(os.path.join(self.tmp, 'limits.db'), sleep=lambda s: None)
+        patcher = mock.patch('newAgent.src.robot.scraper.get_rate_limiter', return_value=self.limiter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_returns_every_page(self):
+        bot = FakeInstagram(120)
+        followers = bot.get_user_followers('someone')
+        self.assertEqual([f['platform_username'] for f in followers], [f'user{i}' for i in range(120)])
+        self.assertEqual(bot.requests, [0, 50, 100])
+
+    def test_list_wrapper_restarts_after_failed_crawl(self):
+        bot = FakeInstagram(120, per_page_fail={50: 5})
+        with mock.patch('newAgent.src.database.database.DataBase', return_value=self.store), \
+                mock.patch('newAgent.src.robot.instagram.time.sleep'):
+            partial = bot.get_user_followers('someone')
+            self.assertEqual(len(partial), 50)  # the second page kept failing
+            followers = bot.get_user_followers('someone')
+        # The rerun returns the whole list, not only what the failed run had not reached
+        self.assertEqual([f['platform_username'] for f in followers], [f'user{i}' for i in range(120)])
+        self.assertIsNone(self.store.fetch_crawl_cursor('instagram:followers:someone'))
+
+    def test_resumes_from_checkpoint_after_crash(self):
+        bot = FakeInstagram(500)
+        pages = bot.iter_user_connections('someone', store=self.store)
+        next(pages)
+        next(pages)
+        pages.close()  # crawl dies while the second page is being processed
+        self.assertEqual(self.store.fetch_crawl_cursor('instagram:followers:someone'), ('50', 50))
+
+        resumed = FakeInstagram(500)
+        rest = [p for page in resumed.iter_user_connections('someone', store=self.store) for p in page]
+        self.assertEqual(rest[0]['platform_username'], 'user50')
+        self.assertEqual(len(rest), 450)
+        self.assertIsNone(self.store.fetch_crawl_cursor('instagram:followers:someone'))
+
+    def test_rate_limit_backs_off_and_retries(self):
+        bot = FakeInstagram(80, per_page_fail={50: 2})
+        with mock.patch('newAgent.src.robot.instagram.time.sleep'):
+            rows = [p for page in bot.iter_user_connections('someone', store=self.store) for p in page]
+        self.assertEqual(len(rows), 80)
+        self.assertEqual(bot.requests, [0, 50, 50, 50])
+        # The 429s slowed the account's API budget for every worker
+        configured = self.limiter.limit('INSTAGRAM', 'api_page')[1] * 3600
+        self.assertLess(self.limiter.state('INSTAGRAM', None, 'api_page')['perHour'], configured)
+
+    def test_save_streams_batches_and_stops_on_failure(self):
+        class Client:
+            def __init__(self):
+                self.batches = []
+
+            def create_people(self, batch):
+                if len(self.batches) == 3:
+                    return mock.Mock(status_code=500)
+                self.batches.append(len(batch))
+                return mock.Mock(status_code=201)
+
+        client = Client()
+        with self.assertRaises(RuntimeError):
+            FakeInstagram(300).save_user_connections('someone', api_client=client, batch_size=25, store=self.store)
+        self.assertEqual(client.batches, [25, 25, 25])
+        # The second page was not fully saved, so the crawl resumes at it
+        self.assertEqual(self.store.fetch_crawl_cursor('instagram:followers:someone'), ('50', 50))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import logging
+import unittest
+from newAgent.src.services.log_buffer import LogBuffer
+from newAgent.src.robot.scraper import LogWrapper
+
+
+class TestLogBuffer(unittest.TestCase):
+    def test_keeps_only_most_recent_lines(self):
+        buf = LogBuffer(capacity=3)
+        for i in range(10):
+            buf.append(f"line {i}\n")
+        self.assertEqual(buf.lines(), ["line 7", "line 8", "line 9"])
+        self.assertEqual(buf.dropped, 7)
+        self.assertEqual(buf.text(), "line 7\nline 8\nline 9\n")
+
+    def test_partial_lines_are_joined(self):
+        buf = LogBuffer()
+        buf.append("Entering ")
+        buf.append("username...\nnext")
+        self.assertEqual(buf.lines(), ["Entering username..."])
+        self.assertEqual(buf.text(), "Entering username...\nnext")
+        buf.clear()
+        self.assertEqual(buf.text(), "")
+
+    def test_overlong_partial_line_is_committed(self):
+        buf = LogBuffer(max_line=5)
+        buf.append("x" * 8)
+        self.assertEqual(buf.lines(), ["x" * 8])
+
+
+class TestLogWrapper(unittest.TestCase):
+    def test_iadd_accumulates_into_bounded_buffer(self):
+        wrapper = LogWrapper(logging.getLogger("test-log-wrapper"), capacity=2)
+        received = []
+        wrapper.set_callback(received.append)
+        wrapper += "first\n"
+        wrapper += "second\n"
+        wrapper += "third\n"
+        self.assertEqual(str(wrapper), "second\nthird\n")
+        self.assertEqual(received, ["first", "second", "third"])
+        wrapper.clear()
+        self.assertEqual(wrapper.get_buffer(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
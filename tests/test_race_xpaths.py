@@ -0,0 +1,77 @@
+import unittest
+from unittest import mock
+
+from selenium.common.exceptions import JavascriptException
+
+from newAgent.src.robot.scraper import Bot, RACE_XPATHS_JS
+
+
+class FakeDriver:
+    """Answers the race script from a map of XPath -> poll tick on which it starts matching."""
+
+    def __init__(self, appears, invalid=()):
+        self.appears = appears
+        self.invalid = invalid
+        self.calls = 0
+
+    def execute_script(self, script, xpaths, visible):
+        assert script == RACE_XPATHS_JS
+        tick = self.calls
+        self.calls += 1
+        if tick == 0 and 'reload' in self.appears:
+            raise JavascriptException('document unloaded')
+        for i, xpath in enumerate(xpaths):
+            if xpath not in self.invalid and self.appears.get(xpath, float('inf')) <= tick:
+                return {'index': i, 'element': f'<{xpath}>', 'invalid': []}
+        return {'index': -1, 'element': None, 'invalid': [xpaths.index(x) for x in self.invalid if x in xpaths]}
+
+
+class TestRaceXpaths(unittest.TestCase):
+    def bot(self, driver):
+        bot = Bot.__new__(Bot)
+        bot.driver = driver
+        return bot
+
+    def race(self, driver, xpaths, timeout=20):
+        clock = {'now': 0.0}
+
+        def sleep(seconds):
+            clock['now'] += seconds
+
+        with mock.patch('newAgent.src.robot.scraper.sleep', side_effect=sleep), \
+                mock.patch('newAgent.src.robot.scraper.monotonic', side_effect=lambda: clock['now']):
+            result = self.bot(driver).race_xpaths(xpaths, timeout=timeout, poll_frequency=0.25)
+        return result, clock['now']
+
+    def test_stale_primary_does_not_cost_its_timeout(self):
+        driver = FakeDriver({'//b': 2})
+        (element, index), elapsed = self.race(driver, ['//stale', '//b'])
+        self.assertEqual((element, index), ('<//b>', 1))
+        self.assertEqual(driver.calls, 3)  # one script call per tick for all candidates
+        self.assertEqual(elapsed, 0.5)
+
+    def test_earliest_listed_wins_on_same_tick(self):
+        (element, index), _ = self.race(FakeDriver({'//a': 0, '//b': 0}), ['//a', '//b'])
+        self.assertEqual(index, 0)
+
+    def test_overall_timeout(self):
+        driver = FakeDriver({}, invalid=('//[',))
+        (element, index), elapsed = self.race(driver, ['//[', '//gone'], timeout=2)
+        self.assertEqual((element, index), (None, None))
+        self.assertEqual(elapsed, 2)
+        self.assertEqual(driver.calls, 9)
+
+    def test_keeps_polling_through_navigation(self):
+        (element, index), _ = self.race(FakeDriver({'reload': 0, '//a': 0}), ['//a'])
+        self.assertEqual(element, '<//a>')
+
+    def test_try_xpath_single_reads_winner(self):
+        element = mock.Mock(text=' hello ')
+        bot = self.bot(mock.Mock())
+        with mock.patch.object(Bot, 'race_xpaths', return_value=(element, 1)) as race:
+            self.assertEqual(bot.try_xpath_single(['/a', '/b'], base_xpath='//main'), 'hello')
+        race.assert_called_once_with(['//main/a', '//main/b'], timeout=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
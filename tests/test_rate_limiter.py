@@ -0,0 +1,145 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from newAgent.src.robot.scraper import Bot
+from newAgent.src.services.rate_limiter import RateLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'limits.db')
+        self.clock = Clock()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def limiter(self, **kwargs):
+        # 'message': burst of 2, one per minute
+        return RateLimiter(self.path, limits={'message': (2, 60), 'navigate': (10, 3600)}, platform_limits={},
+                           clock=self.clock, sleep=self.clock.sleep, **kwargs)
+
+    def test_burst_then_refill_rate(self):
+        limiter = self.limiter()
+        self.assertEqual(limiter.reserve('instagram', 'me', 'message'), 0)
+        self.assertEqual(limiter.reserve('instagram', 'me', 'message'), 0)
+        self.assertAlmostEqual(limiter.reserve('instagram', 'me', 'message'), 60)
+        self.assertAlmostEqual(limiter.acquire('instagram', 'me', 'message'), 60)
+        self.assertEqual(self.clock.slept, [60])
+
+    def test_buckets_are_per_account_and_operation(self):
+        limiter = self.limiter()
+        for _ in range(2):
+            limiter.reserve('instagram', 'me', 'message')
+        self.assertEqual(limiter.reserve('instagram', 'other', 'message'), 0)
+        self.assertEqual(limiter.reserve('instagram', 'me', 'navigate'), 0)
+        self.assertGreater(limiter.reserve('INSTAGRAM', 'me', 'message'), 0)
+        with self.assertRaises(ValueError):
+            limiter.reserve('instagram', 'me', 'teleport')
+
+    def test_budget_is_shared_between_limiters(self):
+        # Separate instances stand in for separate worker processes
+        limiters = [self.limiter() for _ in range(4)]
+        granted = []
+
+        def worker(limiter):
+            for _ in range(5):
+                if limiter.reserve('x', 'me', 'navigate') == 0:
+                    granted.append(1)
+
+        threads = [threading.Thread(target=worker, args=(limiter,)) for limiter in limiters]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(granted), 10)
+
+    def test_penalty_blocks_then_recovers(self):
+        limiter = self.limiter(recovery=600)
+        limiter.penalize('instagram', 'me', 'message', retry_after=30)
+        self.assertAlmostEqual(limiter.reserve('instagram', 'me', 'message'), 30)
+        self.assertAlmostEqual(limiter.state('instagram', 'me', 'message')['perHour'], 30)
+
+        self.clock.now += 300
+        self.assertAlmostEqual(limiter.state('instagram', 'me', 'message')['perHour'], 45)
+        limiter.penalize('instagram', 'me', 'message')
+        self.assertAlmostEqual(limiter.state('instagram', 'me', 'message')['perHour'], 22.5)
+
+        self.clock.now += 600
+        self.assertAlmostEqual(limiter.state('instagram', 'me', 'message')['perHour'], 60)
+
+    def test_penalty_rate_has_floor(self):
+        limiter = self.limiter(min_rate_factor=0.25)
+        for _ in range(5):
+            limiter.penalize('instagram', 'me', 'message')
+        self.assertAlmostEqual(limiter.state('instagram', 'me', 'message')['perHour'], 15)
+
+    def test_acquire_timeout(self):
+        limiter = self.limiter()
+        limiter.penalize('instagram', 'me', 'message', retry_after=120)
+        with self.assertRaises(TimeoutError):
+            limiter.acquire('instagram', 'me', 'message', timeout=10)
+
+    def test_bot_bucket_is_the_logged_in_session(self):
+        limiter = self.limiter()
+        bot = Bot.__new__(Bot)
+        bot.name = 'instagram'
+        bot.session_account = 'me'
+        with mock.patch('newAgent.src.robot.scraper.get_rate_limiter', return_value=limiter):
+            bot.throttle('message')
+            bot.username = 'scraped_profile'  # get_user_info points username at the profile it reads
+            bot.throttle('message')
+        self.assertGreater(limiter.reserve('INSTAGRAM', 'me', 'message'), 0)
+        self.assertEqual(limiter.reserve('INSTAGRAM', 'scraped_profile', 'message'), 0)
+
+    def test_acquire_async(self):
+        limiter = RateLimiter(self.path, limits={'message': (1, 36000)}, platform_limits={})
+        asyncio.run(limiter.acquire_async('telegram', 'me', 'message'))
+        waited = asyncio.run(limiter.acquire_async('telegram', 'me', 'message'))
+        self.assertGreater(waited, 0)
+
+    def test_acquire_async_keeps_event_loop_running(self):
+        limiter = self.limiter()
+
+        def locked_reserve(*args):
+            time.sleep(0.3)  # another process holds the database lock
+            return 0.0
+
+        async def main():
+            ticks = []
+
+            async def ticker():
+                while True:
+                    ticks.append(None)
+                    await asyncio.sleep(0.01)
+
+            task = asyncio.create_task(ticker())
+            await limiter.acquire_async('telegram', 'me', 'message')
+            task.cancel()
+            return len(ticks)
+
+        with mock.patch.object(limiter, 'reserve', side_effect=locked_reserve):
+            self.assertGreater(asyncio.run(main()), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
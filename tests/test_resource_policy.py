@@ -0,0 +1,91 @@
+import json
+import os
+import re
+import unittest
+
+from newAgent.src.services.resource_policy import CATEGORY_PATTERNS, ResourcePolicy, ResourceStats
+
+ACTIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src', 'data', 'actions')
+
+
+class FakeDriver:
+    def __init__(self, page=None):
+        self.commands = []
+        self.page = page
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append((cmd, params))
+        return {}
+
+    def execute_script(self, script):
+        return self.page
+
+
+class TestResourcePolicy(unittest.TestCase):
+    def test_no_policy_blocks_nothing(self):
+        policy = ResourcePolicy.from_metadata({'requiresAuth': True})
+        driver = FakeDriver()
+        self.assertFalse(policy)
+        self.assertFalse(policy.apply(driver))
+        self.assertFalse(policy.clear(driver))
+        self.assertEqual(driver.commands, [])
+
+    def test_profile_with_overrides(self):
+        policy = ResourcePolicy.from_metadata({'resourcePolicy': {
+            'profile': 'extraction', 'allow': ['images'], 'urls': ['*.example.com/pixel*']}})
+        self.assertEqual(policy.categories, ('media', 'fonts', 'analytics'))
+        self.assertIn('*.example.com/pixel*', policy.patterns)
+        self.assertNotIn('*.jpg', policy.patterns)
+
+    def test_extension_patterns_match_the_path_end_only(self):
+        policy = ResourcePolicy.from_metadata({'resourcePolicy': 'extraction'})
+        # Network.setBlockedURLs patterns: '*' matches anything, every other character is literal
+        matchers = [re.compile('.*'.join(map(re.escape, p.split('*')))) for p in policy.patterns]
+
+        def blocked(url):
+            return any(m.fullmatch(url) for m in matchers)
+
+        self.assertTrue(blocked('https://scontent.cdninstagram.com/v/t51.2885-15/1_n.jpg?stp=dst-jpg&_nc_ht=x'))
+        self.assertTrue(blocked('https://static.example.com/hero.webp'))
+        self.assertTrue(blocked('https://fonts.gstatic.com/s/inter/v1/a.woff2'))
+        self.assertFalse(blocked('https://static.cdninstagram.com/rsrc.php/v3/y4/r/ico.pngloader.js'))
+        self.assertFalse(blocked('https://www.instagram.com/api/graphql?doc=x.svg.query'))
+        self.assertFalse(blocked('https://abs.twimg.com/responsive-web/client-web/icons.svg'))
+        self.assertFalse(blocked('https://www.tiktok.com/favicon.ico'))
+
+    def test_unknown_names_rejected(self):
+        with self.assertRaises(ValueError):
+            ResourcePolicy.from_metadata({'resourcePolicy': 'everything'})
+        with self.assertRaises(ValueError):
+            ResourcePolicy.from_metadata({'resourcePolicy': {'block': ['scripts']}})
+
+    def test_apply_and_clear(self):
+        policy = ResourcePolicy.from_metadata({'resourcePolicy': 'extraction'})
+        driver = FakeDriver()
+        self.assertTrue(policy.apply(driver))
+        self.assertTrue(policy.clear(driver))
+        blocked = [params['urls'] for cmd, params in driver.commands if cmd == 'Network.setBlockedURLs']
+        self.assertEqual(len(blocked[0]), sum(len(p) for p in CATEGORY_PATTERNS.values()))
+        self.assertEqual(blocked[1], [])
+
+    def test_stats_accumulate(self):
+        stats = ResourceStats()
+        driver = FakeDriver({'loadMs': 1200, 'bytes': 300000, 'requests': 40, 'blockedImages': 12})
+        stats.record(driver)
+        stats.record(driver)
+        stats.record(FakeDriver(None))
+        self.assertEqual(stats.as_dict(), {'pages': 2, 'loadMs': 2400, 'avgLoadMs': 1200, 'bytes': 600000,
+                                           'requests': 80, 'blockedImages': 24})
+
+    def test_action_definitions_use_known_policies(self):
+        for platform in os.listdir(ACTIONS_DIR):
+            folder = os.path.join(ACTIONS_DIR, platform)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                with open(os.path.join(folder, name)) as f:
+                    ResourcePolicy.from_metadata(json.load(f).get('metadata'))
+
+
+if __name__ == '__main__':
+    unittest.main()
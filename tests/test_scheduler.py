@@ -0,0 +1,140 @@
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from newAgent.core.scheduler import ActionScheduler, due_time
+from newAgent.src.data.attributes import Attrs
+
+
+class FakeAction:
+    def __init__(self, created_at, source, scheduled=None, poll_interval=None, start=None, end=None, state='PENDING'):
+        self.createdAt = created_at
+        self.id = str(created_at)
+        self.title = f"action {created_at}"
+        self.source = source
+        self.state = state
+        self.disabled = False
+        self.scheduledDateCurrentZone = scheduled
+        self.pollInterval = poll_interval
+        self.startDateCurrentZone = start
+        self.endDateCurrentZone = end
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class BlockingRunner:
+    """Records runs and holds each one until released, so concurrency can be observed."""
+
+    def __init__(self):
+        self.started = []
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, action):
+        with self._lock:
+            self.started.append(action.createdAt)
+        self.release.wait(5)
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestActionScheduler(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2025, 6, 1, 12, 0)
+        self.clock = Clock(self.now.timestamp())
+        self.runner = BlockingRunner()
+        self.scheduler = ActionScheduler(self.runner, clock=self.clock, can_dispatch=lambda: True)
+
+    def tearDown(self):
+        self.runner.release.set()
+        self.scheduler.wait_idle(5)
+
+    def test_due_actions_dispatch_in_time_order(self):
+        late = FakeAction(1, 'INSTAGRAM', scheduled=self.now - timedelta(minutes=1))
+        early = FakeAction(2, 'LINKEDIN', scheduled=self.now - timedelta(minutes=5))
+        future = FakeAction(3, 'X', scheduled=self.now + timedelta(hours=1))
+        self.scheduler.refresh([late, future, early])
+        self.assertEqual([a.createdAt for a in self.scheduler.run_pending()], [2, 1])
+        self.assertEqual(self.scheduler.next_wakeup(), (self.now + timedelta(hours=1)).timestamp())
+
+    def test_platforms_run_concurrently_but_each_platform_serially(self):
+        due = self.now - timedelta(minutes=1)
+        actions = [FakeAction(1, 'INSTAGRAM', due), FakeAction(2, 'INSTAGRAM', due),
+                   FakeAction(3, 'LINKEDIN', due), FakeAction(4, 'X', due)]
+        self.scheduler.refresh(actions)
+        self.assertEqual({a.createdAt for a in self.scheduler.run_pending()}, {1, 3, 4})
+        self.assertTrue(wait_for(lambda: len(self.runner.started) == 3))
+        self.assertEqual(self.scheduler.running(), {'INSTAGRAM': 1, 'LINKEDIN': 1, 'X': 1})
+        # The second Instagram action waits for the slot
+        self.assertEqual(self.scheduler.run_pending(), [])
+        self.runner.release.set()
+        self.assertTrue(self.scheduler.wait_idle(2))
+        self.assertEqual([a.createdAt for a in self.scheduler.run_pending()], [2])
+
+    def test_one_shot_actions_do_not_rerun_after_refresh(self):
+        action = FakeAction(1, 'X', scheduled=self.now - timedelta(minutes=1))
+        self.runner.release.set()
+        self.scheduler.refresh([action])
+        self.scheduler.run_pending()
+        self.assertTrue(self.scheduler.wait_idle(2))
+        self.scheduler.refresh([action])
+        self.assertEqual(self.scheduler.pending(), [])
+
+    def test_recurring_action_is_rescheduled_within_window(self):
+        action = FakeAction(1, 'INSTAGRAM', poll_interval=30,
+                            start=self.now - timedelta(hours=1), end=self.now + timedelta(hours=1))
+        self.assertEqual(due_time(action, self.clock()), (self.now + timedelta(minutes=30)).timestamp())
+        self.scheduler.refresh([action])
+        self.clock.now = (self.now + timedelta(minutes=30)).timestamp()
+        self.runner.release.set()
+        self.assertEqual(len(self.scheduler.run_pending()), 1)
+        self.assertTrue(self.scheduler.wait_idle(2))
+        self.assertEqual(self.scheduler.next_wakeup(), (self.now + timedelta(minutes=60)).timestamp())
+        # Past the end of the window the action is no longer scheduled
+        self.assertIsNone(due_time(action, (self.now + timedelta(hours=2)).timestamp()))
+
+    def test_removed_and_done_actions_are_dropped(self):
+        keep = FakeAction(1, 'X', scheduled=self.now)
+        gone = FakeAction(2, 'X', scheduled=self.now)
+        done = FakeAction(3, 'X', scheduled=self.now, state='DONE')
+        self.scheduler.refresh([keep, gone, done])
+        self.scheduler.refresh([keep, done])
+        self.assertEqual([a.createdAt for _, a in self.scheduler.pending()], [1])
+
+    def test_respects_not_allowed_run_action(self):
+        scheduler = ActionScheduler(self.runner, clock=self.clock)
+        scheduler.schedule(FakeAction(1, 'X', scheduled=self.now))
+        Attrs.not_allowed_run_action = True
+        try:
+            self.assertEqual(scheduler.run_pending(), [])
+        finally:
+            Attrs.not_allowed_run_action = False
+        self.runner.release.set()
+        self.assertEqual(len(scheduler.run_pending()), 1)
+        scheduler.wait_idle(2)
+
+    def test_daemon_thread_dispatches_newly_scheduled_actions(self):
+        self.runner.release.set()
+        self.scheduler.start(idle_wait=0.05)
+        try:
+            self.scheduler.schedule(FakeAction(1, 'X', scheduled=self.now))
+            self.assertTrue(wait_for(lambda: self.runner.started == [1]))
+        finally:
+            self.scheduler.stop(2)
+
+
+if __name__ == '__main__':
+    unittest.main()
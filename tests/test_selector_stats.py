@@ -0,0 +1,68 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from newAgent.src.database.database import DataBase
+from newAgent.src.services.config_helper import ConfigHelper
+from newAgent.src.services.selector_stats import SelectorStats
+
+CONFIGS = os.path.join(os.path.dirname(__file__), '..', 'src', 'data', 'configs')
+
+
+class TestSelectorStats(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = DataBase('MAC', path=os.path.join(self.tmp, 'test.db'))
+        self.now = 1000.0
+        self.stats = SelectorStats(self.db, half_life=3600, clock=lambda: self.now)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_unseen_candidates_keep_file_order(self):
+        self.assertEqual(self.stats.order('IG_POST', 'username', ['//a', '//b', '//c']), ['//a', '//b', '//c'])
+
+    def test_dead_primary_is_demoted(self):
+        for _ in range(3):
+            self.stats.record_race('IG_POST', 'username', ['//a', '//b'], 1, latency_ms=40)
+        self.assertEqual(self.stats.order('IG_POST', 'username', ['//a', '//b', '//c']), ['//b', '//a', '//c'])
+        self.stats.record_race('IG_POST', 'username', ['//b', '//a'], None)
+        self.assertEqual(self.stats.order('IG_POST', 'username', ['//a', '//b', '//c']), ['//b', '//c', '//a'])
+        # Other fields are scored separately
+        self.assertEqual(self.stats.order('IG_POST', 'caption', ['//a', '//b']), ['//a', '//b'])
+
+    def test_race_loser_listed_first_is_not_a_miss(self):
+        self.stats.record_race('IG_POST', 'username', ['//slow', '//fast'], 1, latency_ms=40)
+        self.assertEqual([(r['xpath'], r['hits'], r['misses']) for r in self.stats.report('IG_POST')], [('//fast', 1, 0)])
+
+    def test_recent_results_outweigh_old_ones(self):
+        for _ in range(5):
+            self.stats.record('IG_POST', 'username', {'//a': True})
+        self.now += 5 * 3600  # five half-lives later the markup changed
+        for _ in range(2):
+            self.stats.record('IG_POST', 'username', {'//a': False, '//b': True})
+        self.assertEqual(self.stats.order('IG_POST', 'username', ['//a', '//b']), ['//b', '//a'])
+
+    def test_report(self):
+        self.stats.record_race('IG_POST', 'username', ['//a', '//b'], 1, latency_ms=100)
+        self.stats.record_race('IG_POST', 'username', ['//b', '//a'], 0, latency_ms=50)
+        self.stats.record_race('IG_POST', 'username', ['//b', '//a'], None)
+        rows = self.stats.report('IG_POST')
+        self.assertEqual([(r['xpath'], r['hits'], r['misses']) for r in rows], [('//b', 2, 1), ('//a', 0, 1)])
+        self.assertEqual(rows[0]['latencyMs'], 90)
+        self.assertEqual(rows[0]['successRate'], 0.6)
+        self.assertEqual(self.stats.report('OTHER'), [])
+
+    def test_config_alternatives(self):
+        with open(os.path.join(CONFIGS, 'INSTAGRAM_POST_PAGE_ROBUST.json')) as f:
+            config = json.load(f)
+        alternatives = ConfigHelper.get_alternatives(config, 'username')
+        self.assertEqual(len(alternatives), 2)
+        self.assertTrue(alternatives[1].startswith('//header'))
+        self.assertEqual(ConfigHelper.get_alternatives(config, 'missing'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+
+import requests
+
+from newAgent.core.worker import TargetUpdateBuffer, TargetWorker
+
+
+class FakeLeaseClient:
+    worker_id = 'test-worker'
+
+    def __init__(self, targets):
+        self.pending = list(targets)
+        self.completed = []
+        self.failed = []
+        self.batches = []
+
+    def claim(self, action_id, limit=5, lease_seconds=None):
+        batch, self.pending = self.pending[:limit], self.pending[limit:]
+        return batch
+
+    def heartbeat(self, ids, lease_seconds=None):
+        return {'renewed': list(ids), 'lost': []}
+
+    def complete(self, target_id, metadata=None):
+        self.completed.append(target_id)
+
+    def fail(self, target_id, error=None, retry=True):
+        self.failed.append((target_id, error))
+
+    def batch_update(self, updates):
+        self.batches.append(updates)
+        self.completed.extend(u['id'] for u in updates)
+        return [{'id': u['id'], 'result': 'updated'} for u in updates]
+
+
+class UnreachableBatchClient(FakeLeaseClient):
+    def batch_update(self, updates):
+        self.batches.append(updates)
+        raise requests.ConnectionError('server unreachable')
+
+
+class UnreachableFailClient(FakeLeaseClient):
+    def fail(self, target_id, error=None, retry=True):
+        raise requests.Timeout('fail call timed out')
+
+
+class ScriptedWorker(TargetWorker):
+    def _run_target(self, target):
+        if target['link'].endswith('boom'):
+            raise RuntimeError('boom')
+        return {'success': not target['link'].endswith('bad')}
+
+
+class TestTargetWorker(unittest.TestCase):
+    def test_run_completes_and_fails_targets(self):
+        targets = [{'id': str(i), 'link': link} for i, link in enumerate(['a', 'b-bad', 'c', 'd-boom', 'e'])]
+        client = FakeLeaseClient(targets)
+        worker = ScriptedWorker(bot=None, action=None, action_id='act', client=client, batch_size=2)
+
+        stats = worker.run()
+
+        self.assertEqual(client.completed, ['0', '2', '4'])
+        self.assertEqual([tid for tid, _ in client.failed], ['1', '3'])
+        self.assertEqual(client.failed[1][1], 'boom')
+        self.assertEqual(stats, {'completed': 3, 'failed': 2, 'lost': 0})
+        # All completions were coalesced into a single batch request.
+        self.assertEqual(len(client.batches), 1)
+        self.assertTrue(all(u['workerId'] == 'test-worker' and u['status'] == 'DONE' for u in client.batches[0]))
+
+    def test_buffer_flushes_at_max_size(self):
+        client = FakeLeaseClient([])
+        buffer = TargetUpdateBuffer(client, max_size=3, max_age=3600)
+        self.assertEqual(buffer.add({'id': '1'}), [])
+        self.assertEqual(buffer.add({'id': '2'}), [])
+        self.assertEqual(len(buffer.add({'id': '3'})), 3)
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(buffer.flush(), [])
+        self.assertEqual(len(client.batches), 1)
+
+    def test_failed_flush_does_not_stop_the_worker(self):
+        targets = [{'id': str(i), 'link': 'a'} for i in range(4)]
+        client = UnreachableBatchClient(targets)
+        worker = ScriptedWorker(bot=None, action=None, action_id='act', client=client, batch_size=2, flush_size=2)
+
+        stats = worker.run()
+
+        self.assertEqual(client.pending, [])  # every batch was claimed and worked
+        self.assertEqual(stats, {'completed': 0, 'failed': 0, 'lost': 0})
+        self.assertEqual(len(worker.updates), 4)  # kept for a later flush
+
+    def test_unreachable_fail_call_moves_on(self):
+        targets = [{'id': '1', 'link': 'a-bad'}, {'id': '2', 'link': 'b'}]
+        client = UnreachableFailClient(targets)
+        worker = ScriptedWorker(bot=None, action=None, action_id='act', client=client)
+
+        stats = worker.run()
+
+        self.assertEqual(client.completed, ['2'])
+        self.assertEqual(stats, {'completed': 1, 'failed': 0, 'lost': 0})
+        self.assertEqual(worker._held, set())
+
+    def test_lost_lease_is_skipped(self):
+        client = FakeLeaseClient([{'id': '1', 'link': 'a'}])
+        worker = ScriptedWorker(bot=None, action=None, action_id='act', client=client)
+        worker._lost.add('1')
+        worker._process({'id': '1', 'link': 'a'})
+        self.assertEqual(client.completed, [])
+        self.assertEqual(worker.stats['lost'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
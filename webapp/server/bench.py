@@ -0,0 +1,119 @@
+"""Repeatable benchmark: run the load test and compare it against a saved baseline.
+
+Usage:
+    python -m webapp.server.seed --people 1000000 --actions 2000 --targets 3000000 --threads 200000
+    python -m webapp.server.bench --serve --save-baseline bench-baseline.json
+    python -m webapp.server.bench --serve --baseline bench-baseline.json
+
+With --serve a uvicorn server is started on --port against the configured database and
+stopped afterwards; otherwise --base-url must point at a running server. Each run starts
+with a short warmup so caches and connection pools are hot before latencies are recorded.
+Exits with status 1 when any endpoint regressed beyond --tolerance.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+import requests
+
+from . import loadtest
+
+METRICS = ("p50Ms", "p95Ms", "p99Ms")
+
+@contextmanager
+def serve(port: int = 8765, workers: int = 1, db_url: str | None = None, timeout: float = 30.0):
+    """Run uvicorn in a subprocess for the duration of the block; yields its base URL."""
+    env = dict(os.environ)
+    if db_url:
+        env["WEBAPP_DB_URL"] = db_url
+    cmd = [sys.executable, "-m", "uvicorn", "webapp.server.main:app", "--port", str(port),
+           "--workers", str(workers), "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if requests.get(f"{base_url}/api/health", timeout=1).ok:
+                    break
+            except requests.RequestException:
+                pass
+            if proc.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"server on port {port} did not become healthy")
+            time.sleep(0.2)
+        yield base_url
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+def compare(baseline: dict, current: dict, tolerance: float = 0.2) -> list[dict]:
+    """List the endpoints whose latency or throughput got worse than baseline by more than tolerance."""
+    regressions = []
+    rows = [(name, r, current["endpoints"].get(name)) for name, r in baseline["endpoints"].items()]
+    rows.append(("TOTAL", baseline["total"], current["total"]))
+    for name, base, cur in rows:
+        if cur is None:
+            regressions.append({"endpoint": name, "metric": "missing", "baseline": None, "current": None})
+            continue
+        for metric in METRICS:
+            if base.get(metric) and cur[metric] > base[metric] * (1 + tolerance):
+                regressions.append({"endpoint": name, "metric": metric, "baseline": base[metric], "current": cur[metric]})
+        if base.get("rps") and cur["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append({"endpoint": name, "metric": "rps", "baseline": base["rps"], "current": cur["rps"]})
+        if cur["errors"] > base["errors"]:
+            regressions.append({"endpoint": name, "metric": "errors", "baseline": base["errors"], "current": cur["errors"]})
+    return regressions
+
+def bench(base_url: str, clients: int, duration: float, write_ratio: float, seed: int, warmup: float) -> dict:
+    if warmup > 0:
+        loadtest.run(base_url, clients, warmup, write_ratio, seed)
+    return loadtest.run(base_url, clients, duration, write_ratio, seed)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the webapp server against a saved baseline.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--serve", action="store_true", help="Start a uvicorn server for the run")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--db-url", help="Database URL for the --serve server (defaults to WEBAPP_DB_URL)")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", help="Compare against this baseline report")
+    parser.add_argument("--save-baseline", help="Write this run's report as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown, 0.2 = 20%%")
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        with serve(args.port, args.workers, args.db_url) as base_url:
+            report = bench(base_url, args.clients, args.duration, args.write_ratio, args.seed, args.warmup)
+    else:
+        report = bench(args.base_url, args.clients, args.duration, args.write_ratio, args.seed, args.warmup)
+    loadtest._print_report(report)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline written to {args.save_baseline}")
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(baseline, report, args.tolerance)
+    for r in regressions:
+        print(f"REGRESSION {r['endpoint']} {r['metric']}: {r['baseline']} -> {r['current']}")
+    if not regressions:
+        print(f"no regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
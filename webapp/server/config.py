@@ -6,6 +6,16 @@ class Settings:
     JWT_SECRET = os.environ.get("WEBAPP_JWT_SECRET", "dev-secret")
     JWT_ALGORITHM = "HS256"
     DB_URL = os.environ.get("WEBAPP_DB_URL", "sqlite:///./webapp.db")
+    DB_POOL_SIZE = int(os.environ.get("WEBAPP_DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW = int(os.environ.get("WEBAPP_DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT = int(os.environ.get("WEBAPP_DB_POOL_TIMEOUT", "30"))
+    DB_BUSY_TIMEOUT_MS = int(os.environ.get("WEBAPP_DB_BUSY_TIMEOUT_MS", "5000"))
+    # Same default as concurrent.futures: a few threads beyond the CPUs keep the GIL from thrashing under load.
+    THREADPOOL_SIZE = int(os.environ.get("WEBAPP_THREADPOOL_SIZE", str(min(32, (os.cpu_count() or 1) + 4))))
+    TARGET_LEASE_SECONDS = int(os.environ.get("WEBAPP_TARGET_LEASE_SECONDS", "300"))
+    TARGET_MAX_ATTEMPTS = int(os.environ.get("WEBAPP_TARGET_MAX_ATTEMPTS", "3"))
+    EVENT_POLL_SECONDS = float(os.environ.get("WEBAPP_EVENT_POLL_SECONDS", "1.0"))
+    EVENT_RETENTION_SECONDS = int(os.environ.get("WEBAPP_EVENT_RETENTION_SECONDS", "86400"))
     CORS_ORIGINS = os.environ.get("WEBAPP_CORS_ORIGINS", "*")
 
 settings = Settings()
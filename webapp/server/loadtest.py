@@ -0,0 +1,142 @@
+"""Concurrent-client load test for a running webapp server.
+
+Usage:
+    python -m webapp.server.loadtest --base-url http://127.0.0.1:8000 --clients 200 --duration 30
+
+Each client is a thread with its own keep-alive session that loops over a mix of the
+read and write calls agents make (action lists, target pages, summaries, people search,
+target status updates) and records per-request latency.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+
+import requests
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile.
+    k = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+def _discover(base_url: str) -> dict:
+    s = requests.Session()
+    actions = s.get(f"{base_url}/api/actions", params={"perPage": 50}).json()["data"]["actions"]
+    targets = s.get(f"{base_url}/api/action-targets", params={"first": 500}).json()["data"]["actionTargets"]
+    people = s.get(f"{base_url}/api/people", params={"perPage": 200}).json()["data"]["people"]
+    return {
+        "action_ids": [a["id"] for a in actions] or ["missing"],
+        "target_ids": [t["id"] for t in targets],
+        "person_ids": [p["id"] for p in people] or ["missing"],
+    }
+
+def _scenario(base_url: str, ids: dict, write_ratio: float):
+    action_ids = ids["action_ids"]
+    target_ids = ids["target_ids"]
+    person_ids = ids["person_ids"]
+    reads = [
+        ("GET /actions", lambda s, rng: s.get(f"{base_url}/api/actions")),
+        ("GET /actions/summary", lambda s, rng: s.get(f"{base_url}/api/actions/summary")),
+        ("GET /action-targets", lambda s, rng: s.get(f"{base_url}/api/action-targets", params={"actionId": rng.choice(action_ids), "first": 100})),
+        ("GET /actions/{id}/collected", lambda s, rng: s.get(f"{base_url}/api/actions/{rng.choice(action_ids)}/collected", params={"first": 50})),
+        ("GET /people", lambda s, rng: s.get(f"{base_url}/api/people", params={"q": rng.choice("abcdefghijklmnoprstw")})),
+        ("GET /people/{id}", lambda s, rng: s.get(f"{base_url}/api/people/{rng.choice(person_ids)}")),
+        ("GET /threads", lambda s, rng: s.get(f"{base_url}/api/threads", params={"first": 50})),
+    ]
+    write = ("PATCH /action-targets/{id}", lambda s, rng: s.patch(f"{base_url}/api/action-targets/{rng.choice(target_ids)}", json={"status": rng.choice(["PENDING", "DONE"])}))
+
+    def pick(rng: random.Random):
+        if target_ids and rng.random() < write_ratio:
+            return write
+        return rng.choice(reads)
+    return pick
+
+def run(base_url: str = "http://127.0.0.1:8000", clients: int = 200, duration: float = 30.0, write_ratio: float = 0.1, seed: int | None = None) -> dict:
+    """Drive the server with concurrent clients; with a seed, each client's request mix is repeatable."""
+    ids = _discover(base_url)
+    pick = _scenario(base_url, ids, write_ratio)
+    samples: dict[str, list] = {}
+    errors: dict[str, int] = {}
+    lock = threading.Lock()
+    start = threading.Event()
+    deadline = [0.0]
+
+    def client(index: int):
+        session = requests.Session()
+        rng = random.Random(None if seed is None else seed + index)
+        local: list = []
+        start.wait()
+        while time.perf_counter() < deadline[0]:
+            name, call = pick(rng)
+            t0 = time.perf_counter()
+            try:
+                ok = call(session, rng).status_code < 500
+            except requests.RequestException:
+                ok = False
+            local.append((name, (time.perf_counter() - t0) * 1000.0, ok))
+        with lock:
+            for name, ms, ok in local:
+                samples.setdefault(name, []).append(ms)
+                if not ok:
+                    errors[name] = errors.get(name, 0) + 1
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(clients)]
+    for t in threads:
+        t.start()
+    began = time.perf_counter()
+    deadline[0] = began + duration
+    start.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - began
+
+    report = {"clients": clients, "durationSec": round(elapsed, 2), "endpoints": {}}
+    everything = []
+    for name, values in sorted(samples.items()):
+        values.sort()
+        everything.extend(values)
+        report["endpoints"][name] = {
+            "requests": len(values),
+            "errors": errors.get(name, 0),
+            "rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+            "p50Ms": round(percentile(values, 50), 2),
+            "p95Ms": round(percentile(values, 95), 2),
+            "p99Ms": round(percentile(values, 99), 2),
+        }
+    everything.sort()
+    report["total"] = {
+        "requests": len(everything),
+        "errors": sum(errors.values()),
+        "rps": round(len(everything) / elapsed, 1) if elapsed else 0.0,
+        "p50Ms": round(percentile(everything, 50), 2),
+        "p95Ms": round(percentile(everything, 95), 2),
+        "p99Ms": round(percentile(everything, 99), 2),
+    }
+    return report
+
+def _print_report(report: dict):
+    print(f"{report['clients']} clients for {report['durationSec']}s")
+    print(f"{'endpoint':<32}{'requests':>10}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(report["endpoints"].items()) + [("TOTAL", report["total"])]
+    for name, r in rows:
+        print(f"{name:<32}{r['requests']:>10}{r['errors']:>8}{r['rps']:>9}{r['p50Ms']:>10}{r['p95Ms']:>10}{r['p99Ms']:>10}")
+    print(f"throughput: {report['total']['rps']} req/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test a running webapp server.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=None, help="Make each client's request mix repeatable")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args()
+    result = run(args.base_url, args.clients, args.duration, args.write_ratio, args.seed)
+    _print_report(result)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f, indent=2)
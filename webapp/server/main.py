@@ -1,7 +1,11 @@
+from contextlib import asynccontextmanager
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from .config import settings
+from .db import engine, init_db
+from .services import people_search
 from .routers.health import router as health_router
 from .routers.auth import router as auth_router
 from .routers.actions import router as actions_router
@@ -11,11 +15,22 @@ from .routers.templates import router as templates_router
 from .routers.social_lists import router as social_lists_router
 from .routers.threads import router as threads_router
 from .routers.configs import router as configs_router
+from .routers.events import router as events_router
 from .errors import http_exception_handler, validation_exception_handler, generic_exception_handler
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-app = FastAPI(title=settings.APP_NAME)
+init_db()
+people_search.ensure_people_fts(engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync routes and streaming bodies run in anyio's threadpool (40 threads by default); more threads than
+    # CPUs only queue on the GIL, and the longest waits grow with the thread count.
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    yield
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -34,6 +49,7 @@ app.include_router(templates_router, prefix=settings.API_PREFIX)
 app.include_router(social_lists_router, prefix=settings.API_PREFIX)
 app.include_router(threads_router, prefix=settings.API_PREFIX)
 app.include_router(configs_router, prefix=settings.API_PREFIX)
+app.include_router(events_router, prefix=settings.API_PREFIX)
 app.mount("/ui", StaticFiles(directory="webapp/ui", html=True), name="ui")
 
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)
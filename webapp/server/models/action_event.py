@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, Integer, Float, Index
+from sqlalchemy.dialects.sqlite import JSON
+from ..db import Base
+
+class ActionEvent(Base):
+    """Append-only log of action progress, read by the SSE stream. ids double as SSE event ids."""
+    __tablename__ = "action_events"
+    __table_args__ = (
+        Index("ix_action_events_actionId_id", "actionId", "id"),
+    )
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    actionId = Column(String)
+    type = Column(String)
+    payload = Column(JSON)
+    createdAt = Column(Float, index=True)
@@ -1,9 +1,14 @@
-from sqlalchemy import Column, String, Integer
+from sqlalchemy import Column, String, Integer, Float, Index
 from sqlalchemy.dialects.sqlite import JSON
 from ..db import Base
 
 class ActionTarget(Base):
     __tablename__ = "action_targets"
+    __table_args__ = (
+        Index("ix_action_targets_actionId_id", "actionId", "id"),
+        Index("ix_action_targets_actionId_status_id", "actionId", "status", "id"),
+        Index("ix_action_targets_platform_id", "platform", "id"),
+    )
     id = Column(String, primary_key=True, index=True)
     actionId = Column(String, index=True)
     personId = Column(String, index=True)
@@ -14,3 +19,7 @@ class ActionTarget(Base):
     lastInteractedAt = Column(String)
     commentText = Column(String)
     meta = Column("metadata", JSON)
+    # Lease held by an agent worker while status is LEASED; leaseExpiresAt is epoch seconds.
+    leaseOwner = Column(String)
+    leaseExpiresAt = Column(Float)
+    attempts = Column(Integer, default=0)
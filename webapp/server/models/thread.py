@@ -1,10 +1,17 @@
-from sqlalchemy import Column, String, Integer
+from sqlalchemy import Column, String, Integer, Boolean, Index
 from sqlalchemy.dialects.sqlite import JSON
 from ..db import Base
 
 class Thread(Base):
     __tablename__ = "threads"
+    __table_args__ = (
+        Index("ix_threads_actionId_isConfirmed_id", "actionId", "isConfirmed", "id"),
+    )
     id = Column(String, primary_key=True, index=True)
     socialUserId = Column(String, index=True)
+    # Action.createdAt of the BULK_REPLYING action the thread was synced for.
+    actionId = Column(Integer)
+    isConfirmed = Column(Boolean, default=False)
+    updatedAt = Column(Integer)
     meta = Column("metadata", JSON)
     messages = Column(JSON)
@@ -1,72 +1,86 @@
+import time
 import uuid
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy import and_, or_, bindparam, func, select, update
 from sqlalchemy.orm import Session
-from ..db import SessionLocal, engine, Base
+from ..config import settings
+from ..db import get_db
 from ..models.action_target import ActionTarget
-
-Base.metadata.create_all(bind=engine)
+from ..models.person import Person
+from ..services import events
+from ..schemas.action_target import ClaimTargetsDTO, HeartbeatDTO, CompleteTargetDTO, FailTargetDTO, BatchTargetUpdateDTO
+from ..services.ndjson import ndjson_response, stream_query
+from ..services.pagination import encode_cursor, decode_cursor
+from ..services.serialization import RawJSONResponse, RowSerializer
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def _target_node(t: ActionTarget) -> dict:
+    return {
+        "id": t.id,
+        "actionId": t.actionId,
+        "personId": t.personId,
+        "platform": t.platform,
+        "link": t.link,
+        "sourceType": t.sourceType,
+        "status": t.status,
+        "lastInteractedAt": t.lastInteractedAt,
+        "commentText": t.commentText,
+        "metadata": t.meta or {},
+        "leaseOwner": t.leaseOwner,
+        "leaseExpiresAt": t.leaseExpiresAt,
+        "attempts": t.attempts or 0
+    }
 
-@router.get("/action-targets")
-def list_action_targets(actionId: str | None = None, status: str | None = None, platform: str | None = None, first: int = 100, after: str | None = None, db: Session = Depends(get_db)):
-    query = db.query(ActionTarget)
+_TARGET_ROW = RowSerializer({
+    "id": ActionTarget.id,
+    "actionId": ActionTarget.actionId,
+    "personId": ActionTarget.personId,
+    "platform": ActionTarget.platform,
+    "link": ActionTarget.link,
+    "sourceType": ActionTarget.sourceType,
+    "status": ActionTarget.status,
+    "lastInteractedAt": ActionTarget.lastInteractedAt,
+    "commentText": ActionTarget.commentText,
+    "metadata": ActionTarget.meta,
+    "leaseOwner": ActionTarget.leaseOwner,
+    "leaseExpiresAt": ActionTarget.leaseExpiresAt,
+    "attempts": ActionTarget.attempts,
+}, defaults={"metadata": dict, "attempts": int})
+
+def _filtered(query, actionId: str | None = None, status: str | None = None, platform: str | None = None):
     if actionId:
         query = query.filter(ActionTarget.actionId == actionId)
     if status:
         query = query.filter(ActionTarget.status == status)
     if platform:
         query = query.filter(ActionTarget.platform == platform)
+    return query
+
+@router.get("/action-targets")
+def list_action_targets(actionId: str | None = None, status: str | None = None, platform: str | None = None, first: int = Query(100, ge=1, le=1000), after: str | None = None, db: Session = Depends(get_db)):
+    query = _filtered(db.query(*_TARGET_ROW.columns), actionId=actionId, status=status, platform=platform)
     if after:
-        # Simple cursor: skip items until id > after (lexicographic for UUID)
-        query = query.filter(ActionTarget.id > after)
-    items = query.order_by(ActionTarget.id).limit(first).all()
-    nodes = []
-    for t in items:
-        nodes.append({
-            "id": t.id,
-            "actionId": t.actionId,
-            "personId": t.personId,
-            "platform": t.platform,
-            "link": t.link,
-            "sourceType": t.sourceType,
-            "status": t.status,
-            "lastInteractedAt": t.lastInteractedAt,
-            "commentText": t.commentText,
-            "metadata": t.meta or {}
-        })
-    end_cursor = nodes[-1]["id"] if nodes else None
-    # Check if more after end_cursor
-    has_next = False
-    if end_cursor:
-        has_next = db.query(ActionTarget).filter(ActionTarget.id > end_cursor).count() > 0
-    return {"data": {"actionTargets": nodes, "pageInfo": {"hasNextPage": has_next, "endCursor": end_cursor}}}
+        after_id = decode_cursor(after)[0]
+        query = query.filter(ActionTarget.id > after_id)
+    # Fetch one extra row to learn whether another page exists under the same filters.
+    rows = query.order_by(ActionTarget.id).limit(first + 1).all()
+    has_next = len(rows) > first
+    rows = rows[:first]
+    end_cursor = encode_cursor(rows[-1].id) if rows else None
+    return RawJSONResponse({"data": {"actionTargets": _TARGET_ROW.many(rows), "pageInfo": {"hasNextPage": has_next, "endCursor": end_cursor}}})
 
 @router.get("/actions/{id}/targets")
 def get_action_targets(id: str, db: Session = Depends(get_db)):
-    items = db.query(ActionTarget).filter(ActionTarget.actionId == id).all()
-    nodes = []
-    for t in items:
-        nodes.append({
-            "id": t.id,
-            "actionId": t.actionId,
-            "personId": t.personId,
-            "platform": t.platform,
-            "link": t.link,
-            "sourceType": t.sourceType,
-            "status": t.status,
-            "lastInteractedAt": t.lastInteractedAt,
-            "commentText": t.commentText,
-            "metadata": t.metadata or {}
-        })
-    return {"data": {"actionTargets": nodes}}
+    rows = db.query(*_TARGET_ROW.columns).filter(ActionTarget.actionId == id).order_by(ActionTarget.id).all()
+    return RawJSONResponse({"data": {"actionTargets": _TARGET_ROW.many(rows)}})
+
+@router.get("/actions/{id}/targets:export")
+def export_action_targets(id: str, status: str | None = None, platform: str | None = None, gzip: bool = False):
+    def build(db: Session):
+        return _filtered(db.query(*_TARGET_ROW.columns), actionId=id, status=status, platform=platform).order_by(ActionTarget.id)
+    return ndjson_response(stream_query(build, _TARGET_ROW), gzip=gzip, filename=f"action-{id}-targets.ndjson")
 
 @router.post("/actions/{id}/targets")
 def add_targets(id: str, payload: dict, db: Session = Depends(get_db)):
@@ -88,15 +102,214 @@ def add_targets(id: str, payload: dict, db: Session = Depends(get_db)):
         )
         db.add(at)
         created.append(tid)
+    if created:
+        events.record_targets(db, id, [{"id": tid, "status": "PENDING"} for tid in created])
     db.commit()
+    events.notify()
     return {"data": {"created": created}}
 
+_BATCH_COLUMNS = {"status": "status", "lastInteractedAt": "lastInteractedAt", "commentText": "commentText", "metadata": "metadata"}
+
+def _batch_statement(fields: tuple, leased: bool):
+    table = ActionTarget.__table__
+    values = {_BATCH_COLUMNS[f]: bindparam(f"b_{f}") for f in fields}
+    stmt = update(table).where(table.c.id == bindparam("b_id"))
+    if leased:
+        stmt = stmt.where(table.c.status == "LEASED", table.c.leaseOwner == bindparam("b_workerId"))
+        if "status" in fields:
+            # Moving the row out of LEASED ends the lease; other field updates keep it.
+            values.update(leaseOwner=None, leaseExpiresAt=None)
+    return stmt.values(values)
+
+@router.patch("/action-targets:batch")
+def batch_update_targets(payload: BatchTargetUpdateDTO, db: Session = Depends(get_db)):
+    # Later updates of the same id within a batch win, field by field.
+    merged: dict[str, dict] = {}
+    for u in payload.updates:
+        merged.setdefault(u.id, {}).update(u.dict(exclude_unset=True, exclude={"id"}))
+    current = {
+        row.id: row
+        for row in db.query(ActionTarget.id, ActionTarget.actionId, ActionTarget.status, ActionTarget.leaseOwner).filter(ActionTarget.id.in_(list(merged)))
+    }
+    results = []
+    groups: dict[tuple, list] = {}
+    changes = []
+    transitions: dict[str, list] = {}
+    for tid, fields in merged.items():
+        row = current.get(tid)
+        worker_id = fields.pop("workerId", None)
+        if row is None:
+            results.append({"id": tid, "result": "not_found"})
+            continue
+        if worker_id is not None and (row.status != "LEASED" or row.leaseOwner != worker_id):
+            results.append({"id": tid, "result": "conflict"})
+            continue
+        if not fields:
+            # Nothing to write (e.g. only workerId was sent)
+            results.append({"id": tid, "result": "unchanged"})
+            continue
+        params = {f"b_{k}": v for k, v in fields.items()}
+        params["b_id"] = tid
+        if worker_id is not None:
+            params["b_workerId"] = worker_id
+        result = {"id": tid, "result": "updated"}
+        results.append(result)
+        # executemany needs one statement shape per group of rows updating the same fields.
+        groups.setdefault((tuple(sorted(fields)), worker_id is not None), []).append((params, result))
+        if "status" in fields and fields["status"] != row.status:
+            changes.append((result, row.actionId, {"id": tid, "status": fields["status"]}))
+    for (fields, leased), rows in groups.items():
+        stmt = _batch_statement(fields, leased)
+        if leased:
+            # Another worker may have reclaimed an expired lease since the read above; one
+            # statement per row tells which updates still matched the lease.
+            for params, result in rows:
+                if db.execute(stmt, params).rowcount == 0:
+                    result["result"] = "conflict"
+        else:
+            db.execute(stmt, [params for params, _ in rows])
+    for result, action_id, transition in changes:
+        if result["result"] == "updated":
+            transitions.setdefault(action_id, []).append(transition)
+    for action_id, changed in transitions.items():
+        events.record_targets(db, action_id, changed)
+    db.commit()
+    if transitions:
+        events.notify()
+    return {"data": {"results": results, "updated": sum(r["result"] == "updated" for r in results)}}
+
 @router.patch("/action-targets/{id}")
 def patch_target(id: str, payload: dict, db: Session = Depends(get_db)):
     t = db.query(ActionTarget).get(id)
     if not t:
         raise HTTPException(status_code=404, detail="Not found")
+    previous = t.status
     for k, v in payload.items():
         setattr(t, k, v)
+    changed = t.status != previous
+    if changed:
+        events.record_targets(db, t.actionId, [{"id": t.id, "status": t.status}])
     db.commit()
+    if changed:
+        events.notify()
     return {"message": "updated"}
+
+def _claimable(action_id: str, now: float):
+    # PENDING rows, or LEASED rows whose worker stopped heartbeating, while retries remain.
+    return and_(
+        ActionTarget.actionId == action_id,
+        func.coalesce(ActionTarget.attempts, 0) < settings.TARGET_MAX_ATTEMPTS,
+        or_(
+            ActionTarget.status == "PENDING",
+            and_(ActionTarget.status == "LEASED", ActionTarget.leaseExpiresAt < now),
+        ),
+    )
+
+def _held_by(worker_id: str):
+    return and_(ActionTarget.status == "LEASED", ActionTarget.leaseOwner == worker_id)
+
+def _person_item(p: Person | None) -> dict | None:
+    if p is None:
+        return None
+    return {
+        "platform_username": p.platform_username,
+        "full_name": p.full_name,
+        "image_url": p.image_url,
+        "introduction": p.introduction,
+        "category": p.category,
+        "job_title": p.job_title,
+        "follower_count": p.follower_count,
+        "is_verified": p.is_verified,
+    }
+
+def _release_or_409(db: Session, id: str, worker_id: str, values: dict):
+    result = db.execute(
+        update(ActionTarget)
+        .where(ActionTarget.id == id, _held_by(worker_id))
+        .values(leaseOwner=None, leaseExpiresAt=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    action_id = db.query(ActionTarget.actionId).filter(ActionTarget.id == id).scalar()
+    if result.rowcount == 0:
+        db.rollback()
+        if action_id is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        raise HTTPException(status_code=409, detail="Lease not held by this worker")
+    events.record_targets(db, action_id, [{"id": id, "status": values["status"]}])
+    db.commit()
+    events.notify()
+
+@router.post("/actions/{id}/targets:claim")
+def claim_targets(id: str, payload: ClaimTargetsDTO, db: Session = Depends(get_db)):
+    now = time.time()
+    expires = now + (payload.leaseSeconds or settings.TARGET_LEASE_SECONDS)
+    candidates = select(ActionTarget.id).where(_claimable(id, now)).order_by(ActionTarget.id).limit(payload.limit)
+    # A single UPDATE is atomic; repeating the claimable condition keeps a row another worker
+    # took between the subquery and the write from being stolen.
+    db.execute(
+        update(ActionTarget)
+        .where(ActionTarget.id.in_(candidates), _claimable(id, now))
+        .values(
+            status="LEASED",
+            leaseOwner=payload.workerId,
+            leaseExpiresAt=expires,
+            attempts=func.coalesce(ActionTarget.attempts, 0) + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = (
+        db.query(ActionTarget, Person)
+        .outerjoin(Person, Person.id == ActionTarget.personId)
+        .filter(ActionTarget.actionId == id, _held_by(payload.workerId), ActionTarget.leaseExpiresAt == expires)
+        .order_by(ActionTarget.id)
+        .all()
+    )
+    # Serialize before commit, which would expire the loaded rows.
+    nodes = [dict(_target_node(t), person=_person_item(p)) for t, p in rows]
+    if rows:
+        events.record_targets(db, id, [{"id": t.id, "status": "LEASED"} for t, _ in rows])
+    db.commit()
+    if rows:
+        events.notify()
+    return {"data": {"actionTargets": nodes, "leaseExpiresAt": expires}}
+
+@router.post("/action-targets:heartbeat")
+def heartbeat_targets(payload: HeartbeatDTO, db: Session = Depends(get_db)):
+    expires = time.time() + (payload.leaseSeconds or settings.TARGET_LEASE_SECONDS)
+    if payload.ids:
+        db.execute(
+            update(ActionTarget)
+            .where(ActionTarget.id.in_(payload.ids), _held_by(payload.workerId))
+            .values(leaseExpiresAt=expires)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    renewed = {
+        tid for (tid,) in db.query(ActionTarget.id).filter(ActionTarget.id.in_(payload.ids), _held_by(payload.workerId))
+    } if payload.ids else set()
+    lost = [tid for tid in payload.ids if tid not in renewed]
+    return {"data": {"renewed": sorted(renewed), "lost": lost, "leaseExpiresAt": expires}}
+
+@router.post("/action-targets/{id}:complete")
+def complete_target(id: str, payload: CompleteTargetDTO, db: Session = Depends(get_db)):
+    values = {"status": payload.status, "lastInteractedAt": datetime.now(timezone.utc).isoformat()}
+    if payload.commentText is not None:
+        values["commentText"] = payload.commentText
+    if payload.metadata is not None:
+        values["meta"] = payload.metadata
+    _release_or_409(db, id, payload.workerId, values)
+    return {"message": "completed"}
+
+@router.post("/action-targets/{id}:fail")
+def fail_target(id: str, payload: FailTargetDTO, db: Session = Depends(get_db)):
+    t = db.query(ActionTarget).get(id)
+    if not t:
+        raise HTTPException(status_code=404, detail="Not found")
+    # Retry by returning the row to the pending pool until the attempt budget is spent.
+    retry = payload.retry and (t.attempts or 0) < settings.TARGET_MAX_ATTEMPTS
+    status = "PENDING" if retry else "FAILED"
+    meta = dict(t.meta or {})
+    if payload.error:
+        meta["lastError"] = payload.error
+    _release_or_409(db, id, payload.workerId, {"status": status, "meta": meta})
+    return {"message": "failed", "status": status}
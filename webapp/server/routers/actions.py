@@ -1,26 +1,46 @@
 import uuid
 from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from ..db import SessionLocal, engine, Base
+from ..db import get_db
 from ..models.action import Action
 from ..schemas.action import ActionDTO, CreateActionDTO, PatchActionDTO, PatchStateDTO
 from ..models.action_target import ActionTarget
 from ..models.person import Person
-
-Base.metadata.create_all(bind=engine)
+from ..services import events
+from ..services.cache import CachedValue
+from ..services.ndjson import ndjson_response, stream_query
+from ..services.pagination import encode_cursor, decode_cursor
+from ..services.serialization import RawJSONResponse, RowSerializer
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+_ACTION_ROW = RowSerializer({
+    "id": Action.id,
+    "createdAt": Action.createdAt,
+    "createdBy": Action.createdBy,
+    "ownerId": Action.ownerId,
+    "title": Action.title,
+    "type": Action.type,
+    "state": Action.state,
+    "disabled": Action.disabled,
+    "targetPlatform": Action.targetPlatform,
+    "position": Action.position,
+    "cost": Action.cost,
+    "actionExecutionCount": Action.actionExecutionCount,
+    "contentSubject": Action.contentSubject,
+    "contentMessage": Action.contentMessage,
+    "contentBlobURL": Action.contentBlobURL,
+    "scheduledDate": Action.scheduledDate,
+    "executionInterval": Action.executionInterval,
+    "startDate": Action.startDate,
+    "endDate": Action.endDate,
+    "campaignID": Action.campaignID,
+}, defaults={"contentBlobURL": list}, extra={"actionTarget": None})
 
 @router.get("/actions")
 def list_actions(state: str | None = None, type: str | None = None, targetPlatform: str | None = None, disabled: bool | None = None, ownerId: str | None = None, q: str | None = None, page: int = 1, perPage: int = 20, sort: str | None = None, db: Session = Depends(get_db)):
-    query = db.query(Action)
+    query = db.query(*_ACTION_ROW.columns)
     if state:
         query = query.filter(Action.state == state)
     if type:
@@ -34,33 +54,28 @@ def list_actions(state: str | None = None, type: str | None = None, targetPlatfo
     if q:
         query = query.filter(Action.title.ilike(f"%{q}%"))
     total = query.count()
-    items = query.offset((page - 1) * perPage).limit(perPage).all()
-    data = []
-    for a in items:
-        data.append({
-            "id": a.id,
-            "createdAt": a.createdAt,
-            "createdBy": a.createdBy,
-            "ownerId": a.ownerId,
-            "title": a.title,
-            "type": a.type,
-            "state": a.state,
-            "disabled": a.disabled,
-            "targetPlatform": a.targetPlatform,
-            "position": a.position,
-            "cost": a.cost,
-            "actionExecutionCount": a.actionExecutionCount,
-            "contentSubject": a.contentSubject,
-            "contentMessage": a.contentMessage,
-            "contentBlobURL": a.contentBlobURL or [],
-            "scheduledDate": a.scheduledDate,
-            "executionInterval": a.executionInterval,
-            "startDate": a.startDate,
-            "endDate": a.endDate,
-            "campaignID": a.campaignID,
-            "actionTarget": None
-        })
-    return {"data": {"actions": data, "totalCount": total}}
+    rows = query.offset((page - 1) * perPage).limit(perPage).all()
+    return RawJSONResponse({"data": {"actions": _ACTION_ROW.many(rows), "totalCount": total}})
+
+_summary_cache = CachedValue(ttl=30.0)
+
+def _compute_summary(db: Session) -> dict:
+    counts = {"ALL": 0, "PENDING": 0, "IN_PROGRESS": 0, "DONE": 0}
+    rows = db.query(Action.state, func.count(Action.id)).group_by(Action.state).all()
+    for state, n in rows:
+        counts["ALL"] += n
+        if state == "PENDING":
+            counts["PENDING"] = n
+        elif state == "INPROGRESS":
+            counts["IN_PROGRESS"] = n
+        elif state == "DONE":
+            counts["DONE"] = n
+    return counts
+
+# Registered before /actions/{id} so "summary" is not captured as an action id.
+@router.get("/actions/summary")
+def actions_summary(db: Session = Depends(get_db)):
+    return dict(_summary_cache.get(lambda: _compute_summary(db)))
 
 @router.get("/actions/{id}")
 def get_action(id: str, db: Session = Depends(get_db)):
@@ -116,7 +131,10 @@ def create_action(payload: CreateActionDTO, db: Session = Depends(get_db)):
         campaignID=payload.campaignID
     )
     db.add(a)
+    events.record_action(db, a)
     db.commit()
+    _summary_cache.invalidate()
+    events.notify()
     return {"data": {"id": action_id}}
 
 @router.patch("/actions/{id}")
@@ -126,7 +144,10 @@ def patch_action(id: str, payload: PatchActionDTO, db: Session = Depends(get_db)
         raise HTTPException(status_code=404, detail="Not found")
     for k, v in payload.dict(exclude_unset=True).items():
         setattr(a, k, v)
+    events.record_action(db, a)
     db.commit()
+    _summary_cache.invalidate()
+    events.notify()
     return {"message": "updated"}
 
 @router.patch("/actions/{id}/state")
@@ -137,45 +158,57 @@ def patch_action_state(id: str, payload: PatchStateDTO, db: Session = Depends(ge
     a.state = payload.state
     if payload.state == "DONE":
         a.disabled = False
+    events.record_action(db, a)
     db.commit()
+    _summary_cache.invalidate()
+    events.notify()
     return {"message": "state updated"}
 
-@router.get("/actions/summary")
-def actions_summary(db: Session = Depends(get_db)):
-    counts = {"ALL": 0, "PENDING": 0, "IN_PROGRESS": 0, "DONE": 0}
-    counts["ALL"] = db.query(Action).count()
-    counts["PENDING"] = db.query(Action).filter(Action.state == "PENDING").count()
-    counts["IN_PROGRESS"] = db.query(Action).filter(Action.state == "INPROGRESS").count()
-    counts["DONE"] = db.query(Action).filter(Action.state == "DONE").count()
-    return counts
+def _collected_query(db: Session, action_id: str, after_id: str | None = None):
+    # One LEFT JOIN instead of a Person lookup per target; ordered by target id for keyset paging.
+    query = db.query(ActionTarget, Person).outerjoin(Person, Person.id == ActionTarget.personId).filter(ActionTarget.actionId == action_id)
+    if after_id:
+        query = query.filter(ActionTarget.id > after_id)
+    return query.order_by(ActionTarget.id)
+
+def _collected_item(t: ActionTarget, p: Person | None) -> dict:
+    return {
+        "id": t.personId,
+        "platform_username": p.platform_username if p else "",
+        "full_name": p.full_name if p else "",
+        "image_url": p.image_url if p else "",
+        "contact_details": p.contact_details if p and p.contact_details else [],
+        "website": p.website if p else "",
+        "content_count": p.content_count if p else 0,
+        "follower_count": p.follower_count if p else 0,
+        "following_count": p.following_count if p else 0,
+        "introduction": p.introduction if p else "",
+        "is_verified": p.is_verified if p else False,
+        "category": p.category if p else "",
+        "job_title": p.job_title if p else "",
+        "platform": (t.platform or "").lower(),
+        "link": t.link,
+        "status": t.status
+    }
 
 @router.get("/actions/{id}/collected")
-def get_action_collected(id: str, db: Session = Depends(get_db)):
-    targets = db.query(ActionTarget).filter(ActionTarget.actionId == id).all()
-    people_map = {}
-    items = []
-    for t in targets:
-        if t.personId and t.personId not in people_map:
-            p = db.query(Person).get(t.personId)
-            people_map[t.personId] = p
-        p = people_map.get(t.personId)
-        item = {
-            "id": t.personId,
-            "platform_username": p.platform_username if p else "",
-            "full_name": p.full_name if p else "",
-            "image_url": p.image_url if p else "",
-            "contact_details": p.contact_details if p and p.contact_details else [],
-            "website": p.website if p else "",
-            "content_count": p.content_count if p else 0,
-            "follower_count": p.follower_count if p else 0,
-            "following_count": p.following_count if p else 0,
-            "introduction": p.introduction if p else "",
-            "is_verified": p.is_verified if p else False,
-            "category": p.category if p else "",
-            "job_title": p.job_title if p else "",
-            "platform": t.platform.lower(),
-            "link": t.link,
-            "status": t.status
-        }
-        items.append(item)
-    return {"data": {"collected": items, "totalCount": len(items)}}
+def get_action_collected(id: str, first: int | None = Query(None, ge=1), after: str | None = None, format: str | None = None, db: Session = Depends(get_db)):
+    after_id = decode_cursor(after)[0] if after else None
+    if format == "ndjson":
+        def build(stream_db):
+            query = _collected_query(stream_db, id, after_id)
+            return query.limit(first) if first else query
+        return ndjson_response(stream_query(build, lambda row: _collected_item(*row), batch_size=500))
+
+    query = _collected_query(db, id, after_id)
+    if first is None:
+        items = [_collected_item(t, p) for t, p in query.all()]
+        return {"data": {"collected": items, "totalCount": len(items)}}
+
+    rows = query.limit(first + 1).all()
+    has_next = len(rows) > first
+    rows = rows[:first]
+    items = [_collected_item(t, p) for t, p in rows]
+    total = db.query(func.count(ActionTarget.id)).filter(ActionTarget.actionId == id).scalar()
+    end_cursor = encode_cursor(rows[-1][0].id) if rows else None
+    return {"data": {"collected": items, "totalCount": total, "pageInfo": {"hasNextPage": has_next, "endCursor": end_cursor}}}
@@ -1,26 +1,23 @@
 import json
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
-from ..db import SessionLocal, engine, Base
+from ..db import get_db
 from ..models.config import ConfigEntry
-
-Base.metadata.create_all(bind=engine)
+from ..services.cache import LRUCache, cached_json_response
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+_config_cache = LRUCache(maxsize=512)
+CRAWLER_XPATH = "crawler_xpath"
 
 @router.get("/configs/{full_config_name}")
-def get_config(full_config_name: str, db: Session = Depends(get_db)):
-    c = db.query(ConfigEntry).get(full_config_name)
-    if not c:
-        return {"message": "NotFound", "data": None}
-    return {"message": "Successful", "data": c.data}
+def get_config(full_config_name: str, request: Request, db: Session = Depends(get_db)):
+    def build():
+        c = db.query(ConfigEntry).get(full_config_name)
+        if not c:
+            return {"message": "NotFound", "data": None}
+        return {"message": "Successful", "data": c.data}
+    return cached_json_response(request, _config_cache, f"config:{full_config_name}", build)
 
 @router.post("/configs/extracttest")
 def extract_test(payload: dict):
@@ -39,11 +36,16 @@ def generate_config(payload: dict, db: Session = Depends(get_db)):
     entry = ConfigEntry(name=name, data=data)
     db.merge(entry)
     db.commit()
+    _config_cache.invalidate(f"config:{name}")
+    if name == CRAWLER_XPATH:
+        _config_cache.invalidate(CRAWLER_XPATH)
     return {"message": "Successful", "data": data}
 
 @router.get("/crawler/xpath")
-def crawler_xpath(db: Session = Depends(get_db)):
-    c = db.query(ConfigEntry).get("crawler_xpath")
-    if c:
-        return {"data": c.data}
-    return {"data": {"xpath": {}, "settings": {}}}
+def crawler_xpath(request: Request, db: Session = Depends(get_db)):
+    def build():
+        c = db.query(ConfigEntry).get(CRAWLER_XPATH)
+        if c:
+            return {"data": c.data}
+        return {"data": {"xpath": {}, "settings": {}}}
+    return cached_json_response(request, _config_cache, CRAWLER_XPATH, build)
@@ -0,0 +1,57 @@
+import asyncio
+import time
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from ..config import settings
+from ..services.events import SSE_MEDIA_TYPE, KEEPALIVE_SECONDS, notifier, fetch_events, format_event, latest_event_id
+
+router = APIRouter()
+
+BATCH = 500
+
+async def _event_stream(request: Request, action_id: str | None, after_id: int, follow: bool):
+    waiter = notifier.subscribe() if follow else None
+    try:
+        yield "retry: 3000\n\n"
+        last_sent = time.monotonic()
+        while True:
+            if waiter:
+                waiter[1].clear()
+            events, counts = await run_in_threadpool(fetch_events, after_id, action_id, BATCH)
+            if events:
+                after_id = events[-1].id
+                last_sent = time.monotonic()
+                yield "".join(format_event(e, counts) for e in events)
+                if len(events) == BATCH:
+                    continue
+            if not follow or await request.is_disconnected():
+                return
+            try:
+                await asyncio.wait_for(waiter[1].wait(), timeout=settings.EVENT_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                # No local write; the next fetch still picks up events committed by other workers.
+                pass
+            if time.monotonic() - last_sent >= KEEPALIVE_SECONDS:
+                last_sent = time.monotonic()
+                yield ": keepalive\n\n"
+    finally:
+        if waiter:
+            notifier.unsubscribe(waiter)
+
+@router.get("/events")
+async def stream_events(request: Request, actionId: str | None = None, after: int | None = None, follow: bool = True, last_event_id: str | None = Header(None)):
+    """Server-sent events for action state changes ("action") and target progress ("targets").
+
+    Resumes after Last-Event-ID (or ?after=) on reconnect; otherwise starts with new events only.
+    With follow=false, returns the retained events after the start point and closes.
+    """
+    if after is None and last_event_id:
+        try:
+            after = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+    if after is None:
+        after = await run_in_threadpool(latest_event_id) if follow else 0
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(_event_stream(request, actionId, after, follow), media_type=SSE_MEDIA_TYPE, headers=headers)
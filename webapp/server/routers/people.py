@@ -1,27 +1,19 @@
+import json
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from ..db import SessionLocal, engine, Base
+from ..db import get_db
 from ..models.person import Person
 from ..schemas.person import PersonDTO, BatchCreatePeopleDTO
-
-Base.metadata.create_all(bind=engine)
+from ..services import people_search
+from ..services.cache import LRUCache, cached_json_response
+from ..services.ndjson import ndjson_response, stream_query
+from ..services.serialization import RowSerializer, dumps
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-@router.get("/people/{id}")
-def get_person(id: str, db: Session = Depends(get_db)):
-    p = db.query(Person).get(id)
-    if not p:
-        raise HTTPException(status_code=404, detail="Not found")
-    return {"data": {"person": {
+def _person_node(p: Person) -> dict:
+    return {
         "id": p.id,
         "platform_username": p.platform_username,
         "full_name": p.full_name,
@@ -35,35 +27,64 @@ def get_person(id: str, db: Session = Depends(get_db)):
         "is_verified": p.is_verified,
         "category": p.category,
         "job_title": p.job_title
-    }}}
+    }
 
-@router.get("/people")
-def list_people(q: str | None = None, platform: str | None = None, username: str | None = None, page: int = 1, perPage: int = 20, db: Session = Depends(get_db)):
-    query = db.query(Person)
+_PERSON_ROW = RowSerializer({
+    "id": Person.id,
+    "platform_username": Person.platform_username,
+    "full_name": Person.full_name,
+    "image_url": Person.image_url,
+    "contact_details": Person.contact_details,
+    "website": Person.website,
+    "content_count": Person.content_count,
+    "follower_count": Person.follower_count,
+    "following_count": Person.following_count,
+    "introduction": Person.introduction,
+    "is_verified": Person.is_verified,
+    "category": Person.category,
+    "job_title": Person.job_title,
+}, defaults={"contact_details": list})
+
+def _filtered(query, q: str | None = None, username: str | None = None):
+    if people_search.fts_enabled:
+        return people_search.apply_search(query, Person, q=q, username=username)
     if username:
         query = query.filter(Person.platform_username.ilike(f"%{username}%"))
     if q:
         query = query.filter(Person.full_name.ilike(f"%{q}%"))
-    total = query.count()
-    items = query.offset((page - 1) * perPage).limit(perPage).all()
-    data = []
-    for p in items:
-        data.append({
-            "id": p.id,
-            "platform_username": p.platform_username,
-            "full_name": p.full_name,
-            "image_url": p.image_url,
-            "contact_details": p.contact_details or [],
-            "website": p.website,
-            "content_count": p.content_count,
-            "follower_count": p.follower_count,
-            "following_count": p.following_count,
-            "introduction": p.introduction,
-            "is_verified": p.is_verified,
-            "category": p.category,
-            "job_title": p.job_title
-        })
-    return {"data": {"people": data, "totalCount": total}}
+    return query
+
+@router.get("/people:export")
+def export_people(q: str | None = None, platform: str | None = None, username: str | None = None, gzip: bool = False):
+    def build(db: Session):
+        query = _filtered(db.query(*_PERSON_ROW.columns), q=q, username=username)
+        # Search results keep their rank order; a plain dump is ordered by primary key.
+        return query if (q or username) else query.order_by(Person.id)
+    return ndjson_response(stream_query(build, _PERSON_ROW), gzip=gzip, filename="people.ndjson")
+
+_person_cache = LRUCache(maxsize=4096)
+
+@router.get("/people/{id}")
+def get_person(id: str, request: Request, db: Session = Depends(get_db)):
+    def build():
+        p = db.query(Person).get(id)
+        if not p:
+            raise HTTPException(status_code=404, detail="Not found")
+        return {"data": {"person": _person_node(p)}}
+    return cached_json_response(request, _person_cache, id, build)
+
+# Prefix searches rank every match with bm25, so short, popular queries are the most expensive reads.
+_search_cache = LRUCache(maxsize=1024)
+
+@router.get("/people")
+def list_people(q: str | None = None, platform: str | None = None, username: str | None = None, page: int = 1, perPage: int = 20, db: Session = Depends(get_db)):
+    def build():
+        query = _filtered(db.query(*_PERSON_ROW.columns), q=q, username=username)
+        total = query.count()
+        rows = query.offset((page - 1) * perPage).limit(perPage).all()
+        return dumps({"data": {"people": _PERSON_ROW.many(rows), "totalCount": total}})
+    key = json.dumps([q, username, page, perPage])
+    return Response(content=_search_cache.get(key, build), media_type="application/json")
 
 @router.post("/people:batch")
 def batch_create(payload: BatchCreatePeopleDTO, db: Session = Depends(get_db)):
@@ -88,4 +109,7 @@ def batch_create(payload: BatchCreatePeopleDTO, db: Session = Depends(get_db)):
         db.add(p)
         created.append(pid)
     db.commit()
+    for pid in created:
+        _person_cache.invalidate(pid)
+    _search_cache.clear()
     return {"data": {"created": created}}
@@ -1,21 +1,12 @@
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from ..db import SessionLocal, engine, Base
+from ..db import get_db
 from ..models.social_list import SocialList
 from ..models.social_list_item import SocialListItem
 
-Base.metadata.create_all(bind=engine)
-
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/social-lists")
 def list_social_lists(db: Session = Depends(get_db)):
     items = db.query(SocialList).all()
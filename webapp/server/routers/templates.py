@@ -1,28 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from ..db import SessionLocal, engine, Base
+from ..db import get_db
 from ..models.template import Template
-
-Base.metadata.create_all(bind=engine)
+from ..services.cache import LRUCache, cached_json_response
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+_template_cache = LRUCache(maxsize=512)
 
 @router.get("/templates/{template_id}")
-def get_template(template_id: int, db: Session = Depends(get_db)):
-    t = db.query(Template).get(template_id)
-    if not t:
-        raise HTTPException(status_code=404, detail="Not found")
-    return {"data": {"template": {
-        "id": t.id,
-        "name": t.name,
-        "subject": t.subject,
-        "body": t.body,
-        "metadata": t.meta or {}
-    }}}
+def get_template(template_id: int, request: Request, db: Session = Depends(get_db)):
+    def build():
+        t = db.query(Template).get(template_id)
+        if not t:
+            raise HTTPException(status_code=404, detail="Not found")
+        return {"data": {"template": {
+            "id": t.id,
+            "name": t.name,
+            "subject": t.subject,
+            "body": t.body,
+            "metadata": t.meta or {}
+        }}}
+    return cached_json_response(request, _template_cache, str(template_id), build)
@@ -1,46 +1,82 @@
+import time
 import uuid
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
-from ..db import SessionLocal, engine, Base
+from ..db import get_db
 from ..models.thread import Thread
-
-Base.metadata.create_all(bind=engine)
+from ..services.pagination import encode_cursor, decode_cursor
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Keeps IN (...) lists well under SQLite's bound-parameter limit.
+LOOKUP_CHUNK = 500
+
+def _thread_node(t: Thread) -> dict:
+    return {
+        "id": t.id,
+        "socialUserId": t.socialUserId,
+        "actionId": t.actionId,
+        "isConfirmed": bool(t.isConfirmed),
+        "updatedAt": t.updatedAt,
+        "metadata": t.meta or {},
+        "messages": t.messages or []
+    }
 
 @router.get("/threads")
-def get_threads(action_id: int | None = None, is_confirmed: bool = True, generate_replies: bool = False, db: Session = Depends(get_db)):
-    items = db.query(Thread).all()
-    threads = []
-    for t in items:
-        threads.append({
-            "socialUserId": t.socialUserId,
-            "metadata": t.meta or {},
-            "messages": t.messages or []
-        })
-    return {"threads": threads}
+def get_threads(action_id: int | None = None, is_confirmed: bool | None = None, generate_replies: bool = False, first: int | None = Query(None, ge=1, le=1000), after: str | None = None, db: Session = Depends(get_db)):
+    query = db.query(Thread)
+    if action_id is not None:
+        query = query.filter(Thread.actionId == action_id)
+    if is_confirmed is not None:
+        # Threads stored before confirmation tracking have NULL and count as unconfirmed.
+        query = query.filter(Thread.isConfirmed.is_(True) if is_confirmed else Thread.isConfirmed.isnot(True))
+    if first is None and after is None:
+        # Clients that do not page get every matching thread and no pageInfo, as before pagination.
+        return {"threads": [_thread_node(t) for t in query.order_by(Thread.id)]}
+    first = first or 100
+    if after:
+        query = query.filter(Thread.id > decode_cursor(after)[0])
+    items = query.order_by(Thread.id).limit(first + 1).all()
+    has_next = len(items) > first
+    items = items[:first]
+    end_cursor = encode_cursor(items[-1].id) if items else None
+    return {"threads": [_thread_node(t) for t in items], "pageInfo": {"hasNextPage": has_next, "endCursor": end_cursor}}
 
 @router.put("/threads")
 def upsert_threads(payload: dict, db: Session = Depends(get_db)):
-    threads_payload = payload.get("threads") or []
-    for tp in threads_payload:
-        social_user_id = tp.get("socialUserId")
-        messages = tp.get("messages") or []
-        metadata = tp.get("metadata") or {}
-        # Try to find by socialUserId
-        t = db.query(Thread).filter(Thread.socialUserId == social_user_id).first()
-        if not t:
-            t = Thread(id=str(uuid.uuid4()), socialUserId=social_user_id, meta=metadata, messages=messages)
-            db.add(t)
+    # One row per socialUserId; a later entry in the payload wins.
+    incoming: dict[str, dict] = {}
+    for tp in payload.get("threads") or []:
+        if tp.get("socialUserId"):
+            incoming[tp["socialUserId"]] = tp
+    keys = list(incoming)
+    existing: dict[str, str] = {}
+    for i in range(0, len(keys), LOOKUP_CHUNK):
+        rows = db.query(Thread.socialUserId, Thread.id).filter(Thread.socialUserId.in_(keys[i:i + LOOKUP_CHUNK]))
+        existing.update({social_user_id: tid for social_user_id, tid in rows})
+    now = int(time.time() * 1000)
+    default_action_id = payload.get("actionId")
+    inserts, updates = [], []
+    for social_user_id, tp in incoming.items():
+        row = {
+            "meta": tp.get("metadata") or {},
+            "messages": tp.get("messages") or [],
+            "updatedAt": now,
+        }
+        action_id = tp.get("actionId", default_action_id)
+        if action_id is not None:
+            row["actionId"] = action_id
+        if "isConfirmed" in tp:
+            row["isConfirmed"] = bool(tp["isConfirmed"])
+        if social_user_id in existing:
+            updates.append(dict(row, id=existing[social_user_id]))
         else:
-            t.meta = metadata
-            t.messages = messages
+            inserts.append(dict(row, id=str(uuid.uuid4()), socialUserId=social_user_id, isConfirmed=row.get("isConfirmed", False)))
+    # Bulk INSERT and bulk UPDATE-by-primary-key, each a single executemany per column set.
+    if inserts:
+        db.execute(insert(Thread), inserts)
+    if updates:
+        db.execute(update(Thread), updates)
     db.commit()
-    return {"message": "Successful"}
+    return {"message": "Successful", "data": {"inserted": len(inserts), "updated": len(updates)}}
@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional, Literal
+
+class ClaimTargetsDTO(BaseModel):
+    workerId: str
+    limit: int = Field(10, ge=1, le=500)
+    leaseSeconds: Optional[int] = Field(None, ge=1, le=86400)
+
+class HeartbeatDTO(BaseModel):
+    workerId: str
+    ids: List[str]
+    leaseSeconds: Optional[int] = Field(None, ge=1, le=86400)
+
+class CompleteTargetDTO(BaseModel):
+    workerId: str
+    status: Literal["DONE", "FAILED"] = "DONE"
+    commentText: Optional[str] = None
+    metadata: Optional[dict] = None
+
+class FailTargetDTO(BaseModel):
+    workerId: str
+    error: Optional[str] = None
+    retry: bool = True
+
+class TargetUpdateDTO(BaseModel):
+    id: str
+    # Omit to leave the status unchanged; null is rejected. Leases are only taken through claim.
+    status: Literal["PENDING", "DONE", "FAILED"] = None
+    lastInteractedAt: Optional[str] = None
+    commentText: Optional[str] = None
+    metadata: Optional[dict] = None
+    # When set, the row must be leased by this worker; the lease is released with the update.
+    workerId: Optional[str] = None
+
+class BatchTargetUpdateDTO(BaseModel):
+    updates: List[TargetUpdateDTO] = Field(..., max_length=5000)
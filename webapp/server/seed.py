@@ -1,5 +1,17 @@
+"""Seed the webapp database.
+
+    python -m webapp.server.seed                      # a handful of demo rows
+    python -m webapp.server.seed --people 1000000 --actions 2000 --targets 3000000 --threads 200000
+
+The large mode is deterministic for a given --seed, so benchmark runs against it are comparable.
+"""
+import argparse
+import math
+import random
+import time
 from sqlalchemy.orm import Session
-from .db import SessionLocal, engine, Base
+from .db import SessionLocal, engine, Base, init_db
+from .services import people_search
 from .models.action import Action
 from .models.person import Person
 from .models.action_target import ActionTarget
@@ -92,5 +104,181 @@ def run():
     finally:
         db.close()
 
+ACTION_TYPES = [("BULK_MESSAGING", 0.4), ("KEYWORD_SEARCH", 0.3), ("PROFILE_INTERACTION", 0.2), ("PUBLISH_CONTENT", 0.1)]
+ACTION_STATES = [("DONE", 0.5), ("PENDING", 0.3), ("INPROGRESS", 0.2)]
+PLATFORMS = [("INSTAGRAM", 0.55), ("LINKEDIN", 0.2), ("X", 0.15), ("TIKTOK", 0.1)]
+CATEGORIES = ["Artist", "Creator", "Fitness", "Food", "Travel", "Fashion", "Tech", "Music", "Beauty", "Photography", "Gaming", "Education"]
+JOB_TITLES = ["Founder", "Designer", "Engineer", "Marketing Lead", "Photographer", "Chef", "Coach", "Writer", "Producer", "Student"]
+SYLLABLES = ["ka", "mo", "li", "ra", "ne", "so", "ta", "vi", "da", "lu", "mi", "zo", "pe", "an", "el", "jo", "ri", "sa", "to", "ye"]
+FIRST_NAMES = ["Ava", "Liam", "Sara", "Omid", "Mina", "Noah", "Leila", "Arman", "Emma", "Reza", "Nora", "Kian", "Lina", "Dara", "Yara", "Milo"]
+LAST_NAMES = ["Smith", "Karimi", "Garcia", "Moradi", "Chen", "Rahimi", "Muller", "Novak", "Silva", "Tehrani", "Rossi", "Kowalski"]
+# Final status mix of targets, by the state of their action.
+TARGET_STATUSES = {
+    "DONE": [("DONE", 0.85), ("FAILED", 0.15)],
+    "INPROGRESS": [("DONE", 0.4), ("FAILED", 0.05), ("PENDING", 0.5), ("LEASED", 0.05)],
+    "PENDING": [("PENDING", 1.0)],
+}
+NOW_MS = 1_760_000_000_000
+
+def _pick(rng: random.Random, weighted: list) -> str:
+    r = rng.random()
+    for value, weight in weighted:
+        r -= weight
+        if r < 0:
+            return value
+    return weighted[-1][0]
+
+def _id(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def _follower_count(rng: random.Random) -> str:
+    # Log-normal: most accounts have hundreds of followers, a few have millions.
+    n = int(rng.lognormvariate(6.5, 2.0))
+    if n >= 1_000_000:
+        return f"{n / 1_000_000:.1f}m"
+    if n >= 1000:
+        return f"{n / 1000:.1f}k"
+    return str(n)
+
+def _person(rng: random.Random, pid: str) -> dict:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    handle = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) + (str(rng.randint(1, 9999)) if rng.random() < 0.6 else "")
+    category = rng.choice(CATEGORIES)
+    return {
+        "id": pid,
+        "platform_username": handle,
+        "full_name": f"{first} {last}",
+        "image_url": f"https://cdn.example.com/avatars/{handle}.jpg",
+        "contact_details": [{"type": "email", "value": f"{handle}@example.com"}] if rng.random() < 0.3 else [],
+        "website": f"https://{handle}.example.com" if rng.random() < 0.2 else "",
+        "content_count": int(rng.expovariate(1 / 150)),
+        "follower_count": _follower_count(rng),
+        "following_count": int(rng.expovariate(1 / 400)),
+        "introduction": f"{category} {rng.choice(JOB_TITLES).lower()} sharing {rng.choice(CATEGORIES).lower()} and {rng.choice(CATEGORIES).lower()}",
+        "is_verified": rng.random() < 0.02,
+        "category": category,
+        "job_title": rng.choice(JOB_TITLES),
+    }
+
+def _target_counts(rng: random.Random, actions: int, total: int) -> list[int]:
+    # Heavy-tailed action sizes: a few large campaigns, many small ones.
+    weights = [rng.paretovariate(1.2) for _ in range(actions)]
+    scale = total / sum(weights) if weights else 0
+    counts = [int(w * scale) for w in weights]
+    for i in range(total - sum(counts)):
+        counts[i % actions] += 1
+    return counts
+
+def _messages(rng: random.Random, started_ms: int) -> list:
+    n = min(40, 1 + int(rng.expovariate(1 / 4)))
+    sent = started_ms
+    out = []
+    for i in range(n):
+        sent += int(rng.expovariate(1 / 3_600_000))
+        out.append({"type": "OUTBOUND" if i % 2 == 0 else "INBOUND", "body": " ".join(rng.choice(SYLLABLES) * 2 for _ in range(rng.randint(3, 15))), "sentAt": sent})
+    return out
+
+def _insert_chunks(conn, table, rows, chunk_size: int, label: str, total: int):
+    chunk, done, started = [], 0, time.perf_counter()
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            conn.execute(table.insert(), chunk)
+            conn.commit()
+            done += len(chunk)
+            chunk = []
+            print(f"  {label}: {done}/{total} ({done / (time.perf_counter() - started):.0f} rows/s)", end="\r")
+    if chunk:
+        conn.execute(table.insert(), chunk)
+        conn.commit()
+        done += len(chunk)
+    print(f"  {label}: {done} rows in {time.perf_counter() - started:.1f}s" + " " * 20)
+    return done
+
+def generate(bind=engine, people: int = 10_000, actions: int = 100, targets: int = 50_000, threads: int = 5_000, seed: int = 42, chunk_size: int = 10_000) -> dict:
+    """Insert a large synthetic dataset with realistic distributions; returns row counts."""
+    rng = random.Random(seed)
+    person_ids = [_id(rng) for _ in range(people)]
+    action_rows = []
+    for i in range(actions):
+        created = NOW_MS - int(rng.uniform(0, 180 * 86_400_000))
+        action_rows.append({
+            "id": _id(rng),
+            "createdAt": created,
+            "createdBy": "seed",
+            "ownerId": f"owner-{rng.randint(1, 20)}",
+            "title": f"Campaign {i + 1}",
+            "type": _pick(rng, ACTION_TYPES),
+            "state": _pick(rng, ACTION_STATES),
+            "disabled": rng.random() < 0.05,
+            "targetPlatform": _pick(rng, PLATFORMS),
+            "position": i,
+            "cost": 0,
+            "actionExecutionCount": rng.randint(0, 20),
+            "contentMessage": "Hi {{item.first_name}}!",
+            "contentBlobURL": [],
+            "executionInterval": 0,
+        })
+
+    def target_rows():
+        counts = _target_counts(rng, len(action_rows), targets) if action_rows and person_ids else []
+        for action, n in zip(action_rows, counts):
+            statuses = TARGET_STATUSES[action["state"]]
+            for pid in rng.sample(person_ids, min(n, len(person_ids))):
+                status = _pick(rng, statuses)
+                yield {
+                    "id": _id(rng),
+                    "actionId": action["id"],
+                    "personId": pid,
+                    "platform": action["targetPlatform"],
+                    "link": f"https://www.{action['targetPlatform'].lower()}.com/{pid[:8]}/",
+                    "sourceType": "PROFILE",
+                    "status": status,
+                    "lastInteractedAt": None if status == "PENDING" else f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00Z",
+                    "attempts": 0 if status == "PENDING" else 1,
+                    # Seeded leases are already expired, so the rows stay claimable.
+                    "leaseOwner": "seed-worker" if status == "LEASED" else None,
+                    "leaseExpiresAt": NOW_MS / 1000 if status == "LEASED" else None,
+                    "metadata": {},
+                }
+
+    def thread_rows():
+        messaging = [a for a in action_rows if a["type"] == "BULK_MESSAGING"] or action_rows
+        for pid in rng.sample(person_ids, min(threads, len(person_ids))):
+            action = rng.choice(messaging) if messaging else None
+            yield {
+                "id": _id(rng),
+                "socialUserId": pid,
+                "actionId": action["createdAt"] if action else None,
+                "isConfirmed": rng.random() < 0.3,
+                "updatedAt": NOW_MS,
+                "metadata": {"key": "seed"},
+                "messages": _messages(rng, action["createdAt"] if action else NOW_MS),
+            }
+
+    counts = {}
+    with bind.connect() as conn:
+        counts["actions"] = _insert_chunks(conn, Action.__table__, action_rows, chunk_size, "actions", len(action_rows))
+        with people_search.bulk_load(conn):
+            counts["people"] = _insert_chunks(conn, Person.__table__, (_person(rng, pid) for pid in person_ids), chunk_size, "people", people)
+        conn.commit()
+        counts["targets"] = _insert_chunks(conn, ActionTarget.__table__, target_rows(), chunk_size, "action targets", targets)
+        counts["threads"] = _insert_chunks(conn, Thread.__table__, thread_rows(), chunk_size, "threads", min(threads, people))
+    return counts
+
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser(description="Seed the webapp database.")
+    parser.add_argument("--people", type=int, default=0)
+    parser.add_argument("--actions", type=int, default=0)
+    parser.add_argument("--targets", type=int, default=0)
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed generates the same data")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+    if not (args.people or args.actions or args.targets or args.threads):
+        run()
+    else:
+        init_db()
+        people_search.ensure_people_fts(engine)
+        counts = generate(engine, args.people, args.actions, args.targets, args.threads, args.seed, args.chunk_size)
+        print(f"Seed completed: {counts}")
@@ -0,0 +1,108 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+from fastapi import Request, Response
+from .serialization import dumps
+
+class CachedValue:
+    """A single in-process value, recomputed after invalidate() or once ttl seconds pass.
+
+    The ttl only bounds staleness for writes this process never sees (other workers);
+    local writers are expected to call invalidate().
+    """
+
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._expires_at = 0.0
+        self._generation = 0
+
+    def get(self, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if time.monotonic() < self._expires_at:
+                return self._value
+            generation = self._generation
+        value = compute()
+        with self._lock:
+            # Drop the result if a write invalidated the cache while we were computing it.
+            if generation == self._generation:
+                self._value = value
+                self._expires_at = time.monotonic() + self.ttl
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._expires_at = 0.0
+            self._value = None
+
+class LRUCache:
+    """Bounded in-process cache keyed by string, evicting the least recently used entry.
+
+    Entries expire after ttl seconds as a backstop for writes made by other workers;
+    local writers call invalidate(key).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._generation = 0
+
+    def get(self, key: str, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                self._entries.move_to_end(key)
+                return entry[1]
+            generation = self._generation
+        value = compute()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+class CachedResponse:
+    __slots__ = ("body", "etag")
+
+    def __init__(self, content: Any):
+        # Encoded once per cache fill instead of per request.
+        self.body = dumps(content)
+        self.etag = 'W/"%s"' % hashlib.sha1(self.body).hexdigest()[:20]
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" name the same representation.
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+def cached_json_response(request: Request, cache: LRUCache, key: str, build: Callable[[], Any]) -> Response:
+    """Serve build()'s JSON through cache with a content-hash ETag, answering If-None-Match with 304.
+
+    Exceptions raised by build() (e.g. a 404) propagate and are not cached.
+    """
+    entry = cache.get(key, lambda: CachedResponse(build()))
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -0,0 +1,121 @@
+"""Action progress events: recorded with the write that caused them, pushed to SSE subscribers.
+
+Events are rows in action_events written in the same transaction as the change, so every
+worker process (and a reconnecting client, via Last-Event-ID) sees the same ordered log.
+An in-process notifier wakes local streams right after a commit; streams also re-check
+the log every poll interval to pick up events committed by other workers.
+"""
+import asyncio
+import json
+import threading
+import time
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..db import SessionLocal
+from ..models.action_event import ActionEvent
+from ..models.action_target import ActionTarget
+
+SSE_MEDIA_TYPE = "text/event-stream"
+KEEPALIVE_SECONDS = 15.0
+
+def target_counts(db: Session, action_ids) -> dict[str, dict]:
+    """Current per-status target counts for each action, e.g. {"total": 3, "DONE": 1, "PENDING": 2}."""
+    counts = {action_id: {"total": 0} for action_id in action_ids}
+    if not counts:
+        return counts
+    rows = (
+        db.query(ActionTarget.actionId, ActionTarget.status, func.count(ActionTarget.id))
+        .filter(ActionTarget.actionId.in_(list(counts)))
+        .group_by(ActionTarget.actionId, ActionTarget.status)
+        .all()
+    )
+    for action_id, status, n in rows:
+        counts[action_id][status or "UNKNOWN"] = n
+        counts[action_id]["total"] += n
+    return counts
+
+def record_action(db: Session, action) -> None:
+    db.add(ActionEvent(actionId=action.id, type="action", createdAt=time.time(), payload={
+        "id": action.id,
+        "title": action.title,
+        "type": action.type,
+        "state": action.state,
+        "disabled": action.disabled,
+        "targetPlatform": action.targetPlatform,
+    }))
+
+def record_targets(db: Session, action_id: str, transitions: list[dict]) -> None:
+    """Record status transitions ([{id, status}]) of one action's targets; call before commit.
+
+    Per-status counts are not stored: streams add them on delivery (see fetch_events), so a
+    write never pays for counting every target of the action.
+    """
+    db.add(ActionEvent(actionId=action_id, type="targets", createdAt=time.time(), payload={
+        "actionId": action_id,
+        "transitions": transitions,
+    }))
+
+class _Notifier:
+    """Wakes async SSE streams in this process from the threadpool threads that commit writes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self._published = 0
+
+    def subscribe(self) -> tuple:
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.add(waiter)
+        return waiter
+
+    def unsubscribe(self, waiter: tuple) -> None:
+        with self._lock:
+            self._waiters.discard(waiter)
+
+    def notify(self) -> None:
+        with self._lock:
+            waiters = list(self._waiters)
+            self._published += 1
+            prune = self._published % 500 == 0
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+        if prune:
+            prune_events()
+
+notifier = _Notifier()
+
+def notify() -> None:
+    """Call after committing a transaction that recorded events."""
+    notifier.notify()
+
+def prune_events() -> None:
+    cutoff = time.time() - settings.EVENT_RETENTION_SECONDS
+    with SessionLocal() as db:
+        db.query(ActionEvent).filter(ActionEvent.createdAt < cutoff).delete(synchronize_session=False)
+        db.commit()
+
+def latest_event_id() -> int:
+    with SessionLocal() as db:
+        return db.query(func.max(ActionEvent.id)).scalar() or 0
+
+def fetch_events(after_id: int, action_id: str | None = None, limit: int = 500) -> tuple[list[ActionEvent], dict[str, dict]]:
+    """The next events after after_id, plus current target counts for the actions of any "targets" events.
+
+    Counts are computed once per batch, with one grouped query, so a burst of writes costs a
+    stream a single count however many events it delivers.
+    """
+    with SessionLocal() as db:
+        query = db.query(ActionEvent).filter(ActionEvent.id > after_id)
+        if action_id:
+            query = query.filter(ActionEvent.actionId == action_id)
+        events = query.order_by(ActionEvent.id).limit(limit).all()
+        counts = target_counts(db, {e.actionId for e in events if e.type == "targets"})
+        return events, counts
+
+def format_event(event: ActionEvent, counts: dict[str, dict] | None = None) -> str:
+    payload = event.payload
+    if event.type == "targets" and counts is not None:
+        payload = dict(payload, counts=counts.get(event.actionId, {"total": 0}))
+    return f"id: {event.id}\nevent: {event.type}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
@@ -0,0 +1,58 @@
+import json
+import zlib
+from typing import Callable, Iterable, Iterator
+
+from fastapi.responses import StreamingResponse
+
+from ..db import SessionLocal
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CHUNK_SIZE = 64 * 1024
+
+def ndjson_lines(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, default=str) + "\n"
+
+def _chunked(lines: Iterable[str]) -> Iterator[bytes]:
+    # Coalesce lines so the socket sees ~64KB writes rather than one write per row.
+    buf = []
+    size = 0
+    for line in lines:
+        data = line.encode()
+        buf.append(data)
+        size += len(data)
+        if size >= CHUNK_SIZE:
+            yield b"".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield b"".join(buf)
+
+def _gzipped(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+def ndjson_response(rows: Iterable[dict], gzip: bool = False, filename: str | None = None) -> StreamingResponse:
+    body = _chunked(ndjson_lines(rows))
+    headers = {}
+    if gzip:
+        body = _gzipped(body)
+        headers["Content-Encoding"] = "gzip"
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return StreamingResponse(body, media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+def stream_query(build_query: Callable, serialize: Callable, batch_size: int = 1000) -> Iterator[dict]:
+    """Yield serialized rows from a server-side cursor, fetching batch_size rows at a time.
+
+    The response body outlives the request-scoped session, so the stream owns its own.
+    """
+    db = SessionLocal()
+    try:
+        for row in build_query(db).yield_per(batch_size):
+            yield serialize(row)
+    finally:
+        db.close()
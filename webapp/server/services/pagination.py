@@ -0,0 +1,19 @@
+import base64
+import json
+
+from fastapi import HTTPException
+
+def encode_cursor(*key) -> str:
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Keys are row ids; anything else would only fail later inside the query
+    if not isinstance(key, list) or not key or not all(isinstance(k, str) for k in key):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
@@ -0,0 +1,86 @@
+import re
+from contextlib import contextmanager
+from sqlalchemy import Table, Column, Integer, Float, String, MetaData, text, literal_column
+from sqlalchemy.exc import OperationalError
+
+FTS_COLUMNS = ("full_name", "platform_username", "introduction", "category", "job_title")
+
+# Kept out of Base.metadata: the virtual table and its triggers are created by ensure_people_fts().
+people_fts = Table(
+    "people_fts", MetaData(),
+    Column("rowid", Integer),
+    Column("people_fts", String),
+    Column("rank", Float),
+    *[Column(name, String) for name in FTS_COLUMNS],
+)
+
+_cols = ", ".join(FTS_COLUMNS)
+_new_cols = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+_old_cols = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+
+_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS people_fts USING fts5({_cols}, content='people', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS people_fts_ai AFTER INSERT ON people BEGIN "
+    f"INSERT INTO people_fts(rowid, {_cols}) VALUES (new.rowid, {_new_cols}); END",
+    f"CREATE TRIGGER IF NOT EXISTS people_fts_ad AFTER DELETE ON people BEGIN "
+    f"INSERT INTO people_fts(people_fts, rowid, {_cols}) VALUES ('delete', old.rowid, {_old_cols}); END",
+    f"CREATE TRIGGER IF NOT EXISTS people_fts_au AFTER UPDATE ON people BEGIN "
+    f"INSERT INTO people_fts(people_fts, rowid, {_cols}) VALUES ('delete', old.rowid, {_old_cols}); "
+    f"INSERT INTO people_fts(rowid, {_cols}) VALUES (new.rowid, {_new_cols}); END",
+    # Index rows that existed before the FTS table did.
+    "INSERT INTO people_fts(people_fts) VALUES ('rebuild')",
+]
+# Every statement is idempotent, so worker processes starting together may all run them safely.
+
+fts_enabled = False
+
+def ensure_people_fts(engine) -> bool:
+    """Create the people_fts index and its sync triggers once; returns whether FTS search is usable."""
+    global fts_enabled
+    if engine.dialect.name != "sqlite":
+        return False
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'people_fts'")).first()
+            if not exists:
+                for stmt in _FTS_DDL:
+                    conn.execute(text(stmt))
+        fts_enabled = True
+    except OperationalError:
+        # SQLite built without FTS5: list_people falls back to LIKE filtering.
+        fts_enabled = False
+    return fts_enabled
+
+@contextmanager
+def bulk_load(conn):
+    """Suspend per-row FTS maintenance while bulk-inserting people, then rebuild the index once."""
+    exists = conn.dialect.name == "sqlite" and conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'people_fts_ai'")).first()
+    if exists:
+        conn.execute(text("DROP TRIGGER people_fts_ai"))
+    try:
+        yield
+    finally:
+        if exists:
+            conn.execute(text(_FTS_DDL[1]))
+            conn.execute(text(_FTS_DDL[-1]))
+
+def match_expression(q: str, column: str | None = None) -> str | None:
+    """Turn free text into an FTS5 prefix query: every word must match the start of a token."""
+    words = re.findall(r"\w+", q or "")
+    if not words:
+        return None
+    terms = " ".join(f'"{w}"*' for w in words)
+    return f"{column} : ({terms})" if column else terms
+
+def apply_search(query, person_model, q: str | None = None, username: str | None = None):
+    """Filter a Person query through people_fts and order it by bm25 rank."""
+    clauses = [e for e in (match_expression(q), match_expression(username, "platform_username")) if e]
+    if not clauses:
+        return query
+    expr = " AND ".join(f"({c})" for c in clauses)
+    return (
+        query.join(people_fts, people_fts.c.rowid == literal_column(f"{person_model.__tablename__}.rowid"))
+        .filter(people_fts.c.people_fts.op("MATCH")(expr))
+        .order_by(people_fts.c.rank)
+    )
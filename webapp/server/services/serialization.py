@@ -0,0 +1,54 @@
+"""Column-level serialization for list endpoints.
+
+List routes select just the columns they return and turn row tuples straight into dicts,
+skipping ORM instance construction and identity-map bookkeeping. The page is then encoded
+once into a raw JSON response, so FastAPI's jsonable_encoder walk over every value is
+skipped as well.
+"""
+import json
+from typing import Any, Callable
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(content: Any) -> bytes:
+    """Encode to compact UTF-8 JSON, the same bytes JSONResponse would produce for plain data."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+class RawJSONResponse(Response):
+    """A JSON response whose content is encoded directly, without jsonable_encoder."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+class RowSerializer:
+    """Builds response dicts from row tuples of a column-only select.
+
+    fields maps output keys to columns; pass serializer.columns to db.query(). Keys in
+    defaults get default() when the column is NULL, and extra holds constant keys.
+    """
+
+    def __init__(self, fields: dict, defaults: dict[str, Callable[[], Any]] | None = None, extra: dict | None = None):
+        self.keys = tuple(fields)
+        self.columns = tuple(fields.values())
+        self.defaults = tuple((defaults or {}).items())
+        self.extra = extra or {}
+
+    def __call__(self, row) -> dict:
+        node = dict(zip(self.keys, row))
+        for key, default in self.defaults:
+            if node[key] is None:
+                node[key] = default()
+        if self.extra:
+            node.update(self.extra)
+        return node
+
+    def many(self, rows) -> list[dict]:
+        return [self(row) for row in rows]
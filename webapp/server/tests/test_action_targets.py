@@ -0,0 +1,201 @@
+import base64
+import json
+import time
+import uuid
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from webapp.server.db import engine
+from webapp.server.main import app
+
+client = TestClient(app)
+
+def _add_targets(action_id, n, platform="INSTAGRAM"):
+    targets = [{"personId": str(uuid.uuid4()), "platform": platform, "link": f"https://example.com/{i}"} for i in range(n)]
+    return client.post(f"/api/actions/{action_id}/targets", json={"targets": targets}).json()["data"]["created"]
+
+def test_action_targets_pagination_respects_filters():
+    action_id = str(uuid.uuid4())
+    created = _add_targets(action_id, 5)
+    # Rows of other actions sort after this action's ids too and must not leak into hasNextPage.
+    _add_targets(str(uuid.uuid4()), 5)
+    seen = []
+    after = None
+    while True:
+        params = {"actionId": action_id, "status": "PENDING", "first": 2}
+        if after:
+            params["after"] = after
+        r = client.get("/api/action-targets", params=params)
+        assert r.status_code == 200
+        data = r.json()["data"]
+        seen.extend(t["id"] for t in data["actionTargets"])
+        if not data["pageInfo"]["hasNextPage"]:
+            break
+        after = data["pageInfo"]["endCursor"]
+    assert sorted(seen) == sorted(created)
+
+def test_action_targets_exact_page_has_no_next():
+    action_id = str(uuid.uuid4())
+    _add_targets(action_id, 2)
+    data = client.get("/api/action-targets", params={"actionId": action_id, "first": 2}).json()["data"]
+    assert len(data["actionTargets"]) == 2
+    assert data["pageInfo"]["hasNextPage"] is False
+
+def test_action_targets_invalid_cursor():
+    r = client.get("/api/action-targets", params={"after": "not a cursor!"})
+    assert r.status_code == 400
+    assert r.json()["error"]["message"] == "Invalid cursor"
+
+def test_action_targets_cursor_with_non_id_key():
+    for key in ([{"a": 1}], [1], [None]):
+        cursor = base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+        r = client.get("/api/action-targets", params={"after": cursor})
+        assert r.status_code == 400
+        assert r.json()["error"]["message"] == "Invalid cursor"
+
+def test_action_targets_export_streams_ndjson():
+    action_id = str(uuid.uuid4())
+    created = _add_targets(action_id, 3)
+    _add_targets(action_id, 2, platform="X")
+    r = client.get(f"/api/actions/{action_id}/targets:export", params={"platform": "INSTAGRAM"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert sorted(row["id"] for row in rows) == sorted(created)
+    assert all(row["metadata"] == {} for row in rows)
+
+def test_action_targets_export_gzip():
+    action_id = str(uuid.uuid4())
+    _add_targets(action_id, 4)
+    r = client.get(f"/api/actions/{action_id}/targets:export", params={"gzip": True})
+    assert r.headers["content-encoding"] == "gzip"
+    assert len(r.text.splitlines()) == 4
+
+def _claim(action_id, worker, limit=10, **extra):
+    r = client.post(f"/api/actions/{action_id}/targets:claim", json={"workerId": worker, "limit": limit, **extra})
+    assert r.status_code == 200
+    return r.json()["data"]["actionTargets"]
+
+def test_claim_is_exclusive_between_workers():
+    action_id = str(uuid.uuid4())
+    created = _add_targets(action_id, 5)
+    first = _claim(action_id, "worker-a", limit=3)
+    second = _claim(action_id, "worker-b", limit=10)
+    assert len(first) == 3 and len(second) == 2
+    assert sorted(t["id"] for t in first + second) == sorted(created)
+    assert all(t["status"] == "LEASED" and t["leaseOwner"] == "worker-a" for t in first)
+    assert _claim(action_id, "worker-c") == []
+
+def test_expired_lease_is_reclaimed():
+    action_id = str(uuid.uuid4())
+    _add_targets(action_id, 1)
+    [target] = _claim(action_id, "worker-a", leaseSeconds=1)
+    time.sleep(1.1)
+    [reclaimed] = _claim(action_id, "worker-b")
+    assert reclaimed["id"] == target["id"]
+    assert reclaimed["attempts"] == 2
+    r = client.post(f"/api/action-targets/{target['id']}:complete", json={"workerId": "worker-a"})
+    assert r.status_code == 409
+
+def test_heartbeat_and_complete():
+    action_id = str(uuid.uuid4())
+    _add_targets(action_id, 2)
+    a, b = _claim(action_id, "worker-a")
+    hb = client.post("/api/action-targets:heartbeat", json={"workerId": "worker-a", "ids": [a["id"], "missing"], "leaseSeconds": 600}).json()["data"]
+    assert hb["renewed"] == [a["id"]] and hb["lost"] == ["missing"]
+    r = client.post(f"/api/action-targets/{a['id']}:complete", json={"workerId": "worker-a", "metadata": {"sent": True}})
+    assert r.status_code == 200
+    done = client.get("/api/action-targets", params={"actionId": action_id, "status": "DONE"}).json()["data"]["actionTargets"]
+    assert [t["id"] for t in done] == [a["id"]]
+    assert done[0]["leaseOwner"] is None and done[0]["metadata"] == {"sent": True}
+
+def test_fail_retries_until_attempts_exhausted():
+    action_id = str(uuid.uuid4())
+    _add_targets(action_id, 1)
+    statuses = []
+    while True:
+        claimed = _claim(action_id, "worker-a")
+        if not claimed:
+            break
+        r = client.post(f"/api/action-targets/{claimed[0]['id']}:fail", json={"workerId": "worker-a", "error": "boom"})
+        statuses.append(r.json()["status"])
+    assert statuses == ["PENDING", "PENDING", "FAILED"]
+
+def test_batch_update_reports_per_row_results():
+    action_id = str(uuid.uuid4())
+    a, b, c = _add_targets(action_id, 3)
+    updates = [
+        {"id": a, "status": "DONE", "lastInteractedAt": "2024-01-01T00:00:00Z"},
+        {"id": b, "status": "FAILED", "metadata": {"error": "blocked"}},
+        {"id": a, "commentText": "hi"},
+        {"id": "missing", "status": "DONE"},
+    ]
+    r = client.patch("/api/action-targets:batch", json={"updates": updates})
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert data["results"] == [
+        {"id": a, "result": "updated"},
+        {"id": b, "result": "updated"},
+        {"id": "missing", "result": "not_found"},
+    ]
+    rows = {t["id"]: t for t in client.get("/api/action-targets", params={"actionId": action_id}).json()["data"]["actionTargets"]}
+    assert rows[a]["status"] == "DONE" and rows[a]["commentText"] == "hi" and rows[a]["lastInteractedAt"] == "2024-01-01T00:00:00Z"
+    assert rows[b]["status"] == "FAILED" and rows[b]["metadata"] == {"error": "blocked"}
+    assert rows[c]["status"] == "PENDING"
+
+def test_batch_update_with_worker_requires_lease():
+    action_id = str(uuid.uuid4())
+    _add_targets(action_id, 2)
+    mine, theirs = _claim(action_id, "worker-a", limit=1)[0], _claim(action_id, "worker-b", limit=1)[0]
+    updates = [{"id": mine["id"], "status": "DONE", "workerId": "worker-a"}, {"id": theirs["id"], "status": "DONE", "workerId": "worker-a"}]
+    results = client.patch("/api/action-targets:batch", json={"updates": updates}).json()["data"]["results"]
+    assert [r["result"] for r in results] == ["updated", "conflict"]
+    rows = {t["id"]: t for t in client.get("/api/action-targets", params={"actionId": action_id}).json()["data"]["actionTargets"]}
+    assert rows[mine["id"]]["status"] == "DONE" and rows[mine["id"]]["leaseOwner"] is None
+    assert rows[theirs["id"]]["status"] == "LEASED" and rows[theirs["id"]]["leaseOwner"] == "worker-b"
+
+def test_batch_update_reports_lease_lost_before_the_write():
+    action_id = str(uuid.uuid4())
+    _add_targets(action_id, 1)
+    mine = _claim(action_id, "worker-a", limit=1)[0]
+    reclaimed = []
+
+    def reclaim(conn, cursor, statement, parameters, context, executemany):
+        # Another worker takes over the expired lease between the batch's read and its UPDATE.
+        if statement.startswith("UPDATE action_targets") and not reclaimed:
+            reclaimed.append(True)
+            with engine.begin() as other:
+                other.execute(text("UPDATE action_targets SET leaseOwner = 'worker-b' WHERE id = :id"), {"id": mine["id"]})
+
+    event.listen(engine, "before_cursor_execute", reclaim)
+    try:
+        updates = [{"id": mine["id"], "status": "DONE", "workerId": "worker-a"}]
+        data = client.patch("/api/action-targets:batch", json={"updates": updates}).json()["data"]
+    finally:
+        event.remove(engine, "before_cursor_execute", reclaim)
+    assert data["results"] == [{"id": mine["id"], "result": "conflict"}]
+    assert data["updated"] == 0
+    row = client.get("/api/action-targets", params={"actionId": action_id}).json()["data"]["actionTargets"][0]
+    assert row["status"] == "LEASED" and row["leaseOwner"] == "worker-b"
+
+def test_batch_update_rejects_null_or_lease_status():
+    action_id = str(uuid.uuid4())
+    [tid] = _add_targets(action_id, 1)
+    for status in (None, "LEASED", "done"):
+        r = client.patch("/api/action-targets:batch", json={"updates": [{"id": tid, "status": status}]})
+        assert r.status_code == 422, status
+    row = client.get("/api/action-targets", params={"actionId": action_id}).json()["data"]["actionTargets"][0]
+    assert row["status"] == "PENDING"
+
+def test_batch_update_without_fields_is_a_no_op():
+    action_id = str(uuid.uuid4())
+    _add_targets(action_id, 2)
+    mine = _claim(action_id, "worker-a", limit=1)[0]
+    pending = next(t for t in client.get("/api/action-targets", params={"actionId": action_id}).json()["data"]["actionTargets"] if t["id"] != mine["id"])
+    updates = [{"id": mine["id"], "workerId": "worker-a"}, {"id": pending["id"], "commentText": "hi"}]
+    r = client.patch("/api/action-targets:batch", json={"updates": updates})
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert data["results"] == [{"id": mine["id"], "result": "unchanged"}, {"id": pending["id"], "result": "updated"}]
+    assert data["updated"] == 1
+    rows = {t["id"]: t for t in client.get("/api/action-targets", params={"actionId": action_id}).json()["data"]["actionTargets"]}
+    assert rows[mine["id"]]["status"] == "LEASED" and rows[mine["id"]]["leaseOwner"] == "worker-a"
@@ -1,3 +1,5 @@
+import json
+import uuid
 from fastapi.testclient import TestClient
 from webapp.server.main import app
 
@@ -12,3 +14,58 @@ def test_actions_list_empty():
     r = client.get("/api/actions")
     assert r.status_code == 200
     assert "data" in r.json()
+
+def _create_action_with_targets(n):
+    r = client.post("/api/actions", json={"createdBy": "test", "ownerId": "owner-1", "title": "Collected", "type": "KEYWORD_SEARCH", "targetPlatform": "INSTAGRAM"})
+    action_id = r.json()["data"]["id"]
+    people = [{"id": str(uuid.uuid4()), "platform_username": f"user{i}", "full_name": f"User {i}"} for i in range(n)]
+    client.post("/api/people:batch", json={"people": people})
+    targets = [{"personId": p["id"], "platform": "INSTAGRAM", "link": f"https://www.instagram.com/{p['platform_username']}/"} for p in people]
+    targets.append({"platform": "INSTAGRAM", "link": "https://www.instagram.com/unknown/"})
+    client.post(f"/api/actions/{action_id}/targets", json={"targets": targets})
+    return action_id
+
+def test_action_collected_joins_people():
+    action_id = _create_action_with_targets(3)
+    r = client.get(f"/api/actions/{action_id}/collected")
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert data["totalCount"] == 4
+    usernames = sorted(c["platform_username"] for c in data["collected"])
+    assert usernames == ["", "user0", "user1", "user2"]
+
+def test_action_collected_keyset_pages():
+    action_id = _create_action_with_targets(4)
+    seen = []
+    after = None
+    while True:
+        params = {"first": 2}
+        if after:
+            params["after"] = after
+        data = client.get(f"/api/actions/{action_id}/collected", params=params).json()["data"]
+        assert data["totalCount"] == 5
+        seen.extend(c["link"] for c in data["collected"])
+        if not data["pageInfo"]["hasNextPage"]:
+            break
+        after = data["pageInfo"]["endCursor"]
+    assert len(seen) == 5 and len(set(seen)) == 5
+
+def test_action_collected_ndjson():
+    action_id = _create_action_with_targets(2)
+    r = client.get(f"/api/actions/{action_id}/collected", params={"format": "ndjson"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert len(lines) == 3
+
+def test_actions_summary_tracks_writes():
+    before = client.get("/api/actions/summary").json()
+    r = client.post("/api/actions", json={"createdBy": "test", "ownerId": "owner-1", "title": "Summary", "type": "KEYWORD_SEARCH", "targetPlatform": "X"})
+    action_id = r.json()["data"]["id"]
+    after_create = client.get("/api/actions/summary").json()
+    assert after_create["ALL"] == before["ALL"] + 1
+    assert after_create["PENDING"] == before["PENDING"] + 1
+    client.patch(f"/api/actions/{action_id}/state", json={"state": "DONE"})
+    after_done = client.get("/api/actions/summary").json()
+    assert after_done["PENDING"] == before["PENDING"]
+    assert after_done["DONE"] == before["DONE"] + 1
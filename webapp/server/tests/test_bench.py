@@ -0,0 +1,39 @@
+from sqlalchemy import create_engine, func, select
+from webapp.server.db import Base
+from webapp.server.bench import compare
+from webapp.server.seed import generate
+from webapp.server.models.action_target import ActionTarget
+from webapp.server.models.person import Person
+
+def _report(p50, p99, rps, errors=0):
+    row = {"requests": 100, "errors": errors, "rps": rps, "p50Ms": p50, "p95Ms": p99, "p99Ms": p99}
+    return {"endpoints": {"GET /actions": row}, "total": dict(row)}
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    baseline = _report(10.0, 50.0, 200.0)
+    assert compare(baseline, _report(11.0, 55.0, 190.0), tolerance=0.2) == []
+    regressions = compare(baseline, _report(10.0, 80.0, 100.0, errors=3), tolerance=0.2)
+    metrics = {(r["endpoint"], r["metric"]) for r in regressions}
+    assert ("GET /actions", "p99Ms") in metrics
+    assert ("GET /actions", "rps") in metrics
+    assert ("GET /actions", "errors") in metrics
+    assert ("TOTAL", "p50Ms") not in metrics
+
+def test_compare_reports_missing_endpoint():
+    current = _report(10.0, 50.0, 200.0)
+    current["endpoints"] = {}
+    assert compare(_report(10.0, 50.0, 200.0), current) == [
+        {"endpoint": "GET /actions", "metric": "missing", "baseline": None, "current": None}]
+
+def test_generate_is_deterministic(tmp_path):
+    snapshots = []
+    for name in ("a", "b"):
+        engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+        Base.metadata.create_all(bind=engine)
+        counts = generate(engine, people=300, actions=5, targets=600, threads=50, seed=7, chunk_size=100)
+        assert counts["people"] == 300 and counts["actions"] == 5 and counts["threads"] == 50
+        with engine.connect() as conn:
+            assert conn.execute(select(func.count()).select_from(ActionTarget.__table__)).scalar() == counts["targets"]
+            snapshots.append(conn.execute(select(Person.__table__.c.id, Person.__table__.c.follower_count).order_by(Person.__table__.c.id)).all())
+        engine.dispose()
+    assert snapshots[0] == snapshots[1]
@@ -0,0 +1,68 @@
+import json
+import uuid
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from webapp.server.db import engine
+from webapp.server.main import app
+
+client = TestClient(app)
+
+def _events(**params):
+    r = client.get("/api/events", params={"follow": False, **params})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in r.text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            events.append({"id": int(fields["id"]), "event": fields["event"], "data": json.loads(fields["data"])})
+    return events
+
+def _create_action():
+    payload = {"createdBy": "t", "ownerId": "o", "title": "events", "type": "BULK_MESSAGING", "targetPlatform": "INSTAGRAM"}
+    return client.post("/api/actions", json=payload).json()["data"]["id"]
+
+def test_events_track_action_and_target_progress():
+    action_id = _create_action()
+    targets = [{"personId": str(uuid.uuid4()), "platform": "INSTAGRAM", "link": "https://example.com"} for _ in range(3)]
+    created = client.post(f"/api/actions/{action_id}/targets", json={"targets": targets}).json()["data"]["created"]
+    client.patch(f"/api/actions/{action_id}/state", json={"state": "INPROGRESS"})
+    client.patch("/api/action-targets:batch", json={"updates": [{"id": created[0], "status": "DONE"}, {"id": created[1], "status": "FAILED"}]})
+
+    events = _events(actionId=action_id)
+    assert [e["event"] for e in events] == ["action", "targets", "action", "targets"]
+    assert events[2]["data"]["state"] == "INPROGRESS"
+    last = events[-1]["data"]
+    assert last["transitions"] == [{"id": created[0], "status": "DONE"}, {"id": created[1], "status": "FAILED"}]
+    assert last["counts"] == {"total": 3, "DONE": 1, "FAILED": 1, "PENDING": 1}
+    assert [e["id"] for e in events] == sorted(e["id"] for e in events)
+
+def test_target_writes_do_not_count_targets():
+    action_id = _create_action()
+    targets = [{"personId": str(uuid.uuid4()), "platform": "INSTAGRAM", "link": "https://example.com"} for _ in range(2)]
+    created = client.post(f"/api/actions/{action_id}/targets", json={"targets": targets}).json()["data"]["created"]
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        client.patch(f"/api/action-targets/{created[0]}", json={"status": "DONE"})
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert statements and not any("count(" in s.lower() for s in statements)
+    last = _events(actionId=action_id)[-1]["data"]
+    assert last["counts"] == {"total": 2, "DONE": 1, "PENDING": 1}
+
+def test_events_resume_after_last_event_id():
+    action_id = _create_action()
+    first = _events(actionId=action_id)
+    client.patch(f"/api/actions/{action_id}", json={"title": "renamed"})
+    resumed = client.get("/api/events", params={"actionId": action_id, "follow": False}, headers={"Last-Event-ID": str(first[-1]["id"])})
+    assert resumed.text.count("event: action") == 1
+    assert '"title":"renamed"' in resumed.text
+
+def test_events_reject_invalid_last_event_id():
+    r = client.get("/api/events", params={"follow": False}, headers={"Last-Event-ID": "abc"})
+    assert r.status_code == 400
@@ -0,0 +1,58 @@
+import uuid
+from fastapi.testclient import TestClient
+from webapp.server.main import app
+from webapp.server.services.cache import LRUCache
+
+client = TestClient(app)
+
+def test_person_etag_and_304():
+    pid = str(uuid.uuid4())
+    client.post("/api/people:batch", json={"people": [{"id": pid, "platform_username": "etag", "full_name": "E Tag"}]})
+    r = client.get(f"/api/people/{pid}")
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert etag.startswith('W/"')
+    assert r.json()["data"]["person"]["full_name"] == "E Tag"
+    again = client.get(f"/api/people/{pid}", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert again.content == b""
+    # A strong form of the same tag and a list of tags both match weakly.
+    assert client.get(f"/api/people/{pid}", headers={"If-None-Match": f'"x", {etag[2:]}'}).status_code == 304
+
+def test_missing_person_is_not_cached():
+    pid = str(uuid.uuid4())
+    assert client.get(f"/api/people/{pid}").status_code == 404
+    client.post("/api/people:batch", json={"people": [{"id": pid, "platform_username": "late", "full_name": "Late"}]})
+    assert client.get(f"/api/people/{pid}").status_code == 200
+
+def test_config_write_invalidates_etag():
+    name = f"cfg-{uuid.uuid4().hex[:8]}"
+    missing = client.get(f"/api/configs/{name}")
+    assert missing.json()["message"] == "NotFound"
+    client.post("/api/configs/generate", json={"configName": name, "purpose": "p1"})
+    first = client.get(f"/api/configs/{name}")
+    assert first.json()["data"]["purpose"] == "p1"
+    assert first.headers["etag"] != missing.headers["etag"]
+    client.post("/api/configs/generate", json={"configName": name, "purpose": "p2"})
+    second = client.get(f"/api/configs/{name}", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.json()["data"]["purpose"] == "p2"
+
+def test_crawler_xpath_conditional_get():
+    r = client.get("/api/crawler/xpath")
+    assert r.status_code == 200
+    assert client.get("/api/crawler/xpath", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    calls = []
+    def compute(key):
+        return lambda: calls.append(key) or key
+    cache.get("a", compute("a"))
+    cache.get("b", compute("b"))
+    cache.get("a", compute("a"))
+    cache.get("c", compute("c"))
+    cache.get("a", compute("a"))
+    cache.get("b", compute("b"))
+    assert calls == ["a", "b", "c", "b"]
@@ -0,0 +1,64 @@
+import json
+import uuid
+from fastapi.testclient import TestClient
+from webapp.server.main import app
+
+client = TestClient(app)
+
+def _unique_word():
+    return "zz" + uuid.uuid4().hex[:10]
+
+def test_people_search_prefix_across_fields():
+    word = _unique_word()
+    people = [
+        {"id": str(uuid.uuid4()), "platform_username": f"{word}_one", "full_name": "Ada Lovelace"},
+        {"id": str(uuid.uuid4()), "platform_username": "other", "full_name": f"Grace {word}"},
+        {"id": str(uuid.uuid4()), "platform_username": "third", "full_name": "Alan Turing", "job_title": f"{word} engineer"},
+    ]
+    client.post("/api/people:batch", json={"people": people})
+    r = client.get("/api/people", params={"q": word[:8]})
+    assert r.status_code == 200
+    data = r.json()["data"]
+    assert data["totalCount"] == 3
+    r = client.get("/api/people", params={"q": f"{word} engin"})
+    assert [p["full_name"] for p in r.json()["data"]["people"]] == ["Alan Turing"]
+
+def test_people_search_username_filter():
+    word = _unique_word()
+    people = [
+        {"id": str(uuid.uuid4()), "platform_username": f"{word}.shop", "full_name": "Shop"},
+        {"id": str(uuid.uuid4()), "platform_username": "nomatch", "full_name": f"{word} Person"},
+    ]
+    client.post("/api/people:batch", json={"people": people})
+    data = client.get("/api/people", params={"username": word}).json()["data"]
+    assert [p["platform_username"] for p in data["people"]] == [f"{word}.shop"]
+
+def test_people_search_ignores_punctuation_only_query():
+    r = client.get("/api/people", params={"q": "\"*()"})
+    assert r.status_code == 200
+
+def test_people_export_matches_search_filter():
+    word = _unique_word()
+    people = [{"id": str(uuid.uuid4()), "platform_username": f"u{i}", "full_name": f"{word} {i}"} for i in range(3)]
+    client.post("/api/people:batch", json={"people": people})
+    r = client.get("/api/people:export", params={"q": word})
+    assert r.status_code == 200
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert sorted(row["id"] for row in rows) == sorted(p["id"] for p in people)
+
+def test_people_list_fills_null_columns():
+    word = _unique_word()
+    client.post("/api/people:batch", json={"people": [{"id": str(uuid.uuid4()), "platform_username": word, "full_name": "Null Columns"}]})
+    r = client.get("/api/people", params={"username": word})
+    assert r.headers["content-type"] == "application/json"
+    [person] = r.json()["data"]["people"]
+    assert person["contact_details"] == []
+    assert person["image_url"] is None
+    assert list(person) == ["id", "platform_username", "full_name", "image_url", "contact_details", "website", "content_count",
+                            "follower_count", "following_count", "introduction", "is_verified", "category", "job_title"]
+
+def test_people_search_sees_people_added_after_a_cached_search():
+    word = _unique_word()
+    assert client.get("/api/people", params={"q": word}).json()["data"]["totalCount"] == 0
+    client.post("/api/people:batch", json={"people": [{"id": str(uuid.uuid4()), "platform_username": "late", "full_name": f"{word} Late"}]})
+    assert client.get("/api/people", params={"q": word}).json()["data"]["totalCount"] == 1
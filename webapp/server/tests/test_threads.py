@@ -0,0 +1,61 @@
+import random
+import uuid
+from fastapi.testclient import TestClient
+from webapp.server.main import app
+from webapp.server.db import SessionLocal
+from webapp.server.models.thread import Thread
+
+client = TestClient(app)
+
+def _action_id():
+    return random.randint(10**12, 10**13)
+
+def test_upsert_threads_inserts_then_updates_by_social_user_id():
+    action_id = _action_id()
+    users = [str(uuid.uuid4()) for _ in range(3)]
+    threads = [{"socialUserId": u, "messages": [{"type": "OUTBOUND", "body": "hi"}], "isConfirmed": True} for u in users]
+    r = client.put("/api/threads", json={"actionId": action_id, "threads": threads})
+    assert r.json()["data"] == {"inserted": 3, "updated": 0}
+    update = [{"socialUserId": users[0], "messages": [{"type": "INBOUND", "body": "yo"}]}, {"socialUserId": users[0], "metadata": {"k": 1}}]
+    r = client.put("/api/threads", json={"threads": update})
+    assert r.json()["data"] == {"inserted": 0, "updated": 1}
+    data = client.get("/api/threads", params={"action_id": action_id}).json()
+    by_user = {t["socialUserId"]: t for t in data["threads"]}
+    assert set(by_user) == set(users)
+    # The last entry for a key wins and keeps the thread's action and confirmation.
+    assert by_user[users[0]]["metadata"] == {"k": 1} and by_user[users[0]]["messages"] == []
+    assert by_user[users[0]]["actionId"] == action_id and by_user[users[0]]["isConfirmed"] is True
+
+def test_get_threads_filters_and_paginates():
+    action_id = _action_id()
+    confirmed = [{"socialUserId": str(uuid.uuid4()), "isConfirmed": True} for _ in range(5)]
+    pending = [{"socialUserId": str(uuid.uuid4())} for _ in range(2)]
+    client.put("/api/threads", json={"actionId": action_id, "threads": confirmed + pending})
+    client.put("/api/threads", json={"actionId": _action_id(), "threads": [{"socialUserId": str(uuid.uuid4()), "isConfirmed": True}]})
+    seen, after = [], None
+    while True:
+        params = {"action_id": action_id, "is_confirmed": True, "first": 2}
+        if after:
+            params["after"] = after
+        data = client.get("/api/threads", params=params).json()
+        seen.extend(t["socialUserId"] for t in data["threads"])
+        if not data["pageInfo"]["hasNextPage"]:
+            break
+        after = data["pageInfo"]["endCursor"]
+    assert sorted(seen) == sorted(t["socialUserId"] for t in confirmed)
+    unconfirmed = client.get("/api/threads", params={"action_id": action_id, "is_confirmed": False}).json()["threads"]
+    assert sorted(t["socialUserId"] for t in unconfirmed) == sorted(t["socialUserId"] for t in pending)
+
+def test_get_threads_without_filters_returns_every_thread():
+    action_id = _action_id()
+    users = [str(uuid.uuid4()) for _ in range(3)]
+    client.put("/api/threads", json={"actionId": action_id, "threads": [{"socialUserId": users[0], "isConfirmed": True}, {"socialUserId": users[1]}]})
+    # A row stored before confirmation tracking has NULL isConfirmed
+    with SessionLocal() as db:
+        db.add(Thread(id=str(uuid.uuid4()), socialUserId=users[2], actionId=action_id, isConfirmed=None, meta={}, messages=[]))
+        db.commit()
+    data = client.get("/api/threads", params={"action_id": action_id}).json()
+    assert "pageInfo" not in data
+    assert sorted(t["socialUserId"] for t in data["threads"]) == sorted(users)
+    unconfirmed = client.get("/api/threads", params={"action_id": action_id, "is_confirmed": False}).json()["threads"]
+    assert sorted(t["socialUserId"] for t in unconfirmed) == sorted(users[1:])
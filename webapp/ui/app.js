@@ -16,6 +16,7 @@ const detailPanel = document.querySelector('.detail-panel');
 const detailClose = document.getElementById('detail-close');
 const detailTitle = document.getElementById('detail-title');
 const detailMeta = document.getElementById('detail-meta');
+const detailProgress = document.getElementById('detail-progress');
 const detailTargetsSkeleton = document.getElementById('detail-targets-skeleton');
 const detailTargets = document.getElementById('detail-targets');
 const detailCollectedSkeleton = document.getElementById('detail-collected-skeleton');
@@ -25,6 +26,10 @@ const createClose = document.getElementById('create-close');
 const newActionBtn = document.getElementById('newAction');
 const toast = document.getElementById('toast');
 
+// Actions currently shown in the targets table and the detail panel, kept live by the event stream.
+let targetsActionId = null;
+let detailActionId = null;
+
 function showSkeleton(container, rows = 6) {
   container.innerHTML = '';
   container.classList.remove('hidden');
@@ -52,10 +57,10 @@ async function fetchActions() {
     const platformBadge = `<span class="badge platform">${a.targetPlatform || '-'}</span>`;
     const stateBadge = `<span class="badge state-${a.state}">${a.state}</span>`;
     return `<tr class="action-row" data-action-id="${a.id}">
-      <td>${a.title || '-'}</td>
+      <td class="action-title">${a.title || '-'}</td>
       <td>${a.type || '-'}</td>
       <td>${platformBadge}</td>
-      <td>${stateBadge}</td>
+      <td class="action-state">${stateBadge}</td>
       <td>${a.createdBy || '-'}</td>
     </tr>`;
   }).join('');
@@ -64,17 +69,18 @@ async function fetchActions() {
 }
 
 async function fetchTargets(actionId) {
+  targetsActionId = actionId;
   showSkeleton(targetsSkeleton);
   const res = await fetch(`${API}/actions/${encodeURIComponent(actionId)}/targets`);
   const data = await res.json();
   const items = (data.data && data.data.actionTargets) || [];
   targetsBody.innerHTML = items.map(t => {
     const link = t.link ? `<a href="${t.link}" target="_blank" rel="noopener noreferrer">${t.link}</a>` : '-';
-    return `<tr>
+    return `<tr data-target-id="${t.id}">
       <td>${t.personId || '-'}</td>
       <td>${t.platform || '-'}</td>
       <td>${link}</td>
-      <td>${t.status || '-'}</td>
+      <td class="target-status">${t.status || '-'}</td>
     </tr>`;
   }).join('');
   hideSkeleton(targetsSkeleton);
@@ -87,12 +93,15 @@ function openDetail() {
   });
 }
 function closeDetail() {
+  detailActionId = null;
   detailPanel.classList.remove('in');
   setTimeout(() => overlay.classList.add('hidden'), 200);
 }
 detailClose.addEventListener('click', closeDetail);
 
 async function populateDetail(actionId) {
+  detailActionId = actionId;
+  detailProgress.textContent = '';
   detailTargets.innerHTML = '';
   detailCollected.innerHTML = '';
   showSkeleton(detailTargetsSkeleton, 4);
@@ -113,13 +122,14 @@ async function populateDetail(actionId) {
   const targets = (targetsData.data && targetsData.data.actionTargets) || [];
   detailTargets.innerHTML = targets.map(t => {
     const link = t.link ? `<a href="${t.link}" target="_blank" rel="noopener noreferrer">${t.link}</a>` : '-';
-    return `<div class="target-card reveal">
-      <div class="profile-meta">${t.platform} • ${t.status}</div>
+    return `<div class="target-card reveal" data-target-id="${t.id}">
+      <div class="profile-meta">${t.platform} • <span class="target-status">${t.status}</span></div>
       <div>${link}</div>
       <div>${t.personId}</div>
     </div>`;
   }).join('');
   hideSkeleton(detailTargetsSkeleton);
+  renderProgress(countStatuses(targets));
   const collected = (collectedData.data && collectedData.data.collected) || [];
   detailCollected.innerHTML = collected.map(p => {
     const link = p.link ? `<a href="${p.link}" target="_blank" rel="noopener noreferrer">${p.link}</a>` : '';
@@ -161,6 +171,68 @@ function runReveal() {
   document.querySelectorAll('.reveal').forEach(el => observer.observe(el));
 }
 
+function countStatuses(targets) {
+  const counts = { total: targets.length };
+  targets.forEach(t => { counts[t.status] = (counts[t.status] || 0) + 1; });
+  return counts;
+}
+
+function renderProgress(counts) {
+  const parts = Object.keys(counts).filter(k => k !== 'total').sort().map(k => `${k} ${counts[k]}`);
+  detailProgress.textContent = `${counts.total} targets` + (parts.length ? ' • ' + parts.join(' • ') : '');
+}
+
+function debounce(fn, ms) {
+  let timer = null;
+  return (...args) => {
+    clearTimeout(timer);
+    timer = setTimeout(() => fn(...args), ms);
+  };
+}
+const refetchActions = debounce(fetchActions, 500);
+const refetchTargets = debounce(id => fetchTargets(id), 500);
+const refetchDetail = debounce(id => populateDetail(id), 500);
+
+function applyActionEvent(a) {
+  const row = document.querySelector(`.action-row[data-action-id="${CSS.escape(a.id)}"]`);
+  if (row) {
+    row.querySelector('.action-title').textContent = a.title || '-';
+    row.querySelector('.action-state').innerHTML = `<span class="badge state-${a.state}">${a.state}</span>`;
+  } else {
+    // New (or newly matching) action: let the server apply the list filters.
+    refetchActions();
+  }
+  if (a.id === detailActionId) {
+    detailTitle.textContent = a.title || '';
+    detailMeta.textContent = [a.type, a.state, a.targetPlatform].filter(Boolean).join(' • ');
+  }
+}
+
+function applyTargetsEvent(ev) {
+  const shown = [];
+  if (ev.actionId === targetsActionId) shown.push([targetsBody, () => refetchTargets(ev.actionId)]);
+  if (ev.actionId === detailActionId) {
+    shown.push([detailTargets, () => refetchDetail(ev.actionId)]);
+    renderProgress(ev.counts);
+  }
+  shown.forEach(([container, reload]) => {
+    let missing = false;
+    ev.transitions.forEach(t => {
+      const el = container.querySelector(`[data-target-id="${CSS.escape(t.id)}"] .target-status`);
+      if (el) el.textContent = t.status;
+      else missing = true;
+    });
+    if (missing) reload();
+  });
+}
+
+function subscribeEvents() {
+  // EventSource reconnects on its own and resumes from the last event id it saw.
+  const source = new EventSource(`${API}/events`);
+  source.addEventListener('action', e => applyActionEvent(JSON.parse(e.data)));
+  source.addEventListener('targets', e => applyTargetsEvent(JSON.parse(e.data)));
+}
+
 refreshBtn.addEventListener('click', fetchActions);
 loadTargetsBtn.addEventListener('click', () => {
   const id = actionIdInput.value.trim();
@@ -169,6 +241,7 @@ loadTargetsBtn.addEventListener('click', () => {
 
 window.addEventListener('DOMContentLoaded', () => {
   setTimeout(fetchActions, 150);
+  subscribeEvents();
   runReveal();
 });
 
@@ -232,7 +305,6 @@ document.getElementById('create-form').addEventListener('submit', async (e) => {
   if (res.ok) {
     showToast('Action created successfully.');
     closeCreate();
-    fetchActions();
   } else {
     const text = await res.text();
     showToast('Failed to create action: ' + text);